@@ -1,16 +1,71 @@
-from fastapi import FastAPI
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, PlainTextResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
+import asyncio
 import os
-from pathlib import Path
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 
-from backend.database import engine, Base
-from backend.routes import auth, profile, portfolio, ai, budget
+from backend.database import init_engine, wait_for_database
+from backend.routes import auth, profile, portfolio, ai, budget, dashboard
+from backend.services import metrics, profiler
+from backend.services.admission import admission
+from backend.services.chat_writer import shutdown_chat_writer
+from backend.services.jobs import shutdown_worker_pool
+from backend.services.partitions import create_schema, start_partition_maintenance, stop_partition_maintenance
+from backend.services.recommendations import start_recommendation_refresher, stop_recommendation_refresher
+from backend.services.assets import get_asset_store, IMMUTABLE_CACHE, REVALIDATE_CACHE
 
-Base.metadata.create_all(bind=engine)
+# asyncio.to_thread runs on the loop's default executor, only cpu_count + 4
+# threads; it must not be smaller than the upstream gates it feeds
+BLOCKING_THREADS = int(os.getenv("BLOCKING_THREADS", 32))
 
-app = FastAPI(title="WealthMate API", version="1.0.0")
+@asynccontextmanager
+async def lifespan(app):
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=BLOCKING_THREADS, thread_name_prefix="blocking")
+    )
+    engine = init_engine()
+    metrics.install_db_hooks(engine)
+    wait_for_database(float(os.getenv("DB_STARTUP_TIMEOUT_SECONDS", 30)))
+    if os.getenv("DB_CREATE_ALL", "1") == "1":
+        create_schema(engine)
+    start_partition_maintenance(engine)
+    profiler.init_profiler()
+    admission.reset()
+    get_asset_store()
+    start_recommendation_refresher()
+    yield
+    stop_recommendation_refresher()
+    stop_partition_maintenance()
+    shutdown_worker_pool(wait=True)
+    shutdown_chat_writer()
+
+app = FastAPI(title="WealthMate API", version="1.0.0", lifespan=lifespan)
+
+# Middleware added later wraps the earlier ones: admission rejections still
+# get the cache headers and CORS, and every response is counted in metrics.
+@app.middleware("http")
+async def admission_control(request, call_next):
+    # Sheds with 429/503 before auth, the DB or any upstream is touched.
+    rejection, release = await admission.admit(request)
+    if rejection is not None:
+        return rejection
+    try:
+        return await call_next(request)
+    finally:
+        release()
+
+@app.middleware("http")
+async def add_cache_control_headers(request, call_next):
+    response = await call_next(request)
+    # static assets set their own caching policy
+    if "cache-control" not in response.headers:
+        response.headers["Cache-Control"] = "no-cache, no-store, must-revalidate"
+        response.headers["Pragma"] = "no-cache"
+        response.headers["Expires"] = "0"
+    return response
 
 app.add_middleware(
     CORSMiddleware,
@@ -21,44 +76,73 @@ app.add_middleware(
 )
 
 @app.middleware("http")
-async def add_cache_control_headers(request, call_next):
-    response = await call_next(request)
-    response.headers["Cache-Control"] = "no-cache, no-store, must-revalidate"
-    response.headers["Pragma"] = "no-cache"
-    response.headers["Expires"] = "0"
-    return response
+async def record_request_metrics(request, call_next):
+    stats = metrics.start_request()
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        finished = time.perf_counter()
+        route = request.scope.get("route")
+        route_path = getattr(route, "path", "unmatched")
+        metrics.observe_request(request.method, route_path, status, finished - started, stats)
+        profiler.maybe_dump_slow_request(request.method, route_path, started, finished, stats.threads)
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics_endpoint():
+    return PlainTextResponse(metrics.render_metrics(), media_type="text/plain; version=0.0.4")
 
 app.include_router(auth.router)
 app.include_router(profile.router)
 app.include_router(portfolio.router)
 app.include_router(ai.router)
 app.include_router(budget.router)
+app.include_router(dashboard.router)
+
+def serve_asset(request: Request, name: str) -> Response:
+    assets = get_asset_store()
+    resolved = assets.resolve(name)
+    if resolved is None:
+        return JSONResponse(status_code=404, content={"error": "File not found"})
+    
+    # Only a request for the content-hashed name itself may be cached forever;
+    # the original file names and pages must revalidate to pick up new builds.
+    cache_control = IMMUTABLE_CACHE if resolved == name and assets.is_hashed(name) else REVALIDATE_CACHE
+    body, headers = assets.response_parts(resolved, request.headers.get("accept-encoding", ""), cache_control)
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=304, headers={k: headers[k] for k in ("ETag", "Cache-Control", "Vary")})
+    return Response(content=body, headers=headers)
+
+@app.get("/assets/{filename}", include_in_schema=False)
+async def serve_hashed_asset(request: Request, filename: str):
+    return serve_asset(request, filename)
 
-current_dir = Path(__file__).parent.parent
-app.mount("/static", StaticFiles(directory=str(current_dir)), name="static")
+@app.get("/static/{filename}", include_in_schema=False)
+async def serve_static(request: Request, filename: str):
+    return serve_asset(request, filename)
 
 @app.get("/")
-async def serve_home():
-    return FileResponse(current_dir / "wealthmate.html")
+async def serve_home(request: Request):
+    return serve_asset(request, "wealthmate.html")
 
 @app.get("/login")
-async def serve_login():
-    return FileResponse(current_dir / "login.html")
+async def serve_login(request: Request):
+    return serve_asset(request, "login.html")
 
 @app.get("/profile")
-async def serve_profile():
-    return FileResponse(current_dir / "profile.html")
+async def serve_profile(request: Request):
+    return serve_asset(request, "profile.html")
 
 @app.get("/budget")
-async def serve_budget():
-    return FileResponse(current_dir / "budget.html")
+async def serve_budget(request: Request):
+    return serve_asset(request, "budget.html")
 
 @app.get("/{filename}")
-async def serve_file(filename: str):
-    file_path = current_dir / filename
-    if file_path.exists() and file_path.is_file():
-        return FileResponse(file_path)
-    return {"error": "File not found"}, 404
+async def serve_file(request: Request, filename: str):
+    return serve_asset(request, filename)
 
 if __name__ == "__main__":
     import uvicorn
@@ -1,6 +1,8 @@
 from backend.models.user import User
-from backend.models.portfolio import Portfolio, Stock, Transaction
-from backend.models.chat import ChatHistory
-from backend.models.budget import Budget, FinancialGoal
+from backend.models.portfolio import Portfolio, Stock, Transaction, PortfolioValuation
+from backend.models.chat import ChatHistory, ChatSummary
+from backend.models.budget import Budget, FinancialGoal, SpendingStat
+from backend.models.job import AnalysisJob
+from backend.models.market import PriceBar
 
-__all__ = ['User', 'Portfolio', 'Stock', 'Transaction', 'ChatHistory', 'Budget', 'FinancialGoal']
+__all__ = ['User', 'Portfolio', 'Stock', 'Transaction', 'PortfolioValuation', 'ChatHistory', 'ChatSummary', 'Budget', 'FinancialGoal', 'SpendingStat', 'AnalysisJob', 'PriceBar']
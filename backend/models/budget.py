@@ -1,17 +1,20 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from backend.database import Base
 
 class Budget(Base):
     __tablename__ = "budgets"
+    __table_args__ = (
+        Index("ix_budgets_user_date", "user_id", "date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     category = Column(String, nullable=False)
     amount = Column(Float, nullable=False)
     type = Column(String, nullable=False)
-    date = Column(DateTime, default=datetime.utcnow)
+    date = Column(DateTime, nullable=False, default=datetime.utcnow)
     
     user = relationship("User", back_populates="budgets")
 
@@ -27,3 +30,34 @@ class FinancialGoal(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     
     user = relationship("User", back_populates="financial_goals")
+
+class SpendingStat(Base):
+    # Running statistics per user, category and entry type, updated as each
+    # budget entry is written so alerts never rescan the budgets table.
+    __tablename__ = "spending_stats"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    category = Column(String, primary_key=True)
+    type = Column(String, primary_key=True)
+    # Welford mean / sum of squared deviations of amounts
+    count = Column(Integer, nullable=False, default=0)
+    mean = Column(Float, nullable=False, default=0.0)
+    m2 = Column(Float, nullable=False, default=0.0)
+    # Exponentially weighted mean and variance of amounts
+    ewma = Column(Float, nullable=False, default=0.0)
+    ewm_var = Column(Float, nullable=False, default=0.0)
+    # Days between consecutive entries, for recurring-payment detection
+    interval_count = Column(Integer, nullable=False, default=0)
+    interval_mean = Column(Float, nullable=False, default=0.0)
+    interval_m2 = Column(Float, nullable=False, default=0.0)
+    last_amount = Column(Float, nullable=True)
+    last_date = Column(DateTime, nullable=True)
+    # Most recent entry that looked unusual for this category
+    anomaly_budget_id = Column(Integer, nullable=True)
+    anomaly_amount = Column(Float, nullable=True)
+    anomaly_expected = Column(Float, nullable=True)
+    anomaly_zscore = Column(Float, nullable=True)
+    anomaly_date = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    user = relationship("User", back_populates="spending_stats")
@@ -0,0 +1,10 @@
+from sqlalchemy import Column, String, Float, Date
+from backend.database import Base
+
+class PriceBar(Base):
+    __tablename__ = "price_bars"
+
+    symbol = Column(String(16), primary_key=True)
+    date = Column(Date, primary_key=True)
+    close = Column(Float, nullable=False)
+    volume = Column(Float, nullable=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, Date, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from backend.database import Base
@@ -16,6 +16,9 @@ class Portfolio(Base):
 
 class Stock(Base):
     __tablename__ = "stocks"
+    __table_args__ = (
+        Index("ix_stocks_portfolio_id", "portfolio_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     portfolio_id = Column(Integer, ForeignKey("portfolios.id"), nullable=False)
@@ -38,3 +41,17 @@ class Transaction(Base):
     transaction_date = Column(DateTime, default=datetime.utcnow)
     
     stock = relationship("Stock", back_populates="transactions")
+
+class PortfolioValuation(Base):
+    # One row per portfolio per day, written by the batch valuation job
+    __tablename__ = "portfolio_valuations"
+
+    portfolio_id = Column(Integer, ForeignKey("portfolios.id", ondelete="CASCADE"), primary_key=True)
+    as_of = Column(Date, primary_key=True)
+    total_value = Column(Float, nullable=False)
+    total_cost = Column(Float, nullable=False)
+    profit_loss = Column(Float, nullable=False)
+    profit_loss_percentage = Column(Float, nullable=False)
+    holdings = Column(Integer, nullable=False)
+    unpriced_holdings = Column(Integer, nullable=False, default=0)
+    valued_at = Column(DateTime, nullable=False, default=datetime.utcnow)
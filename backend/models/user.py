@@ -16,5 +16,7 @@ class User(Base):
     
     portfolios = relationship("Portfolio", back_populates="user", cascade="all, delete-orphan")
     chat_history = relationship("ChatHistory", back_populates="user", cascade="all, delete-orphan")
+    chat_summary = relationship("ChatSummary", back_populates="user", uselist=False, cascade="all, delete-orphan")
     budgets = relationship("Budget", back_populates="user", cascade="all, delete-orphan")
     financial_goals = relationship("FinancialGoal", back_populates="user", cascade="all, delete-orphan")
+    spending_stats = relationship("SpendingStat", back_populates="user", cascade="all, delete-orphan")
@@ -1,3 +1,3 @@
-from backend.routes import auth, profile, portfolio, ai, budget
+from backend.routes import auth, profile, portfolio, ai, budget, dashboard
 
-__all__ = ['auth', 'profile', 'portfolio', 'ai', 'budget']
+__all__ = ['auth', 'profile', 'portfolio', 'ai', 'budget', 'dashboard']
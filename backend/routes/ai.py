@@ -1,49 +1,61 @@
-from fastapi import APIRouter, Depends, HTTPException
+import asyncio
+import os
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
+from fastapi.responses import JSONResponse
+from fastapi.encoders import jsonable_encoder
 from sqlalchemy.orm import Session
 from backend.database import get_db
 from backend.models.user import User
-from backend.models.chat import ChatHistory
 from backend.models.portfolio import Portfolio, Stock
-from backend.schemas.ai import ChatRequest, ChatResponse
+from backend.schemas.ai import ChatRequest, ChatResponse, RecommendationsResponse
 from backend.services.auth import get_current_user
-from backend.services.ai_service import get_financial_advice, analyze_portfolio_with_ai, assess_portfolio_risk
+from backend.services.ai_service import ADVICE_UNAVAILABLE, request_financial_advice, assess_portfolio_risk
+from backend.services.chat_memory import build_chat_context, fold_chat_summary
+from backend.services.chat_writer import record_chat_turn
+from backend.services.jobs import submit_portfolio_analysis, get_job, wait_for_job, job_to_dict
+from backend.services.risk import assess_market_risk
+from backend.services.recommendations import get_recommendations
 
 router = APIRouter(prefix="/api", tags=["ai"])
 
+ANALYSIS_SYNC_WAIT_SECONDS = float(os.getenv("ANALYSIS_SYNC_WAIT_SECONDS", 25))
+MAX_JOB_WAIT_SECONDS = 30
+
+async def _advise(request: ChatRequest, background_tasks: BackgroundTasks, user: User, db: Session) -> str:
+    # The context reads and the LLM call block, so they run in threads; on
+    # the event loop they would serialize every in-flight chat.
+    summary, history = await asyncio.to_thread(build_chat_context, db, user.id)
+    try:
+        response_text = await asyncio.to_thread(
+            request_financial_advice, request.message, request.context, history=history, summary=summary
+        )
+    except Exception as e:
+        # The apology is returned but never stored, so it is not replayed
+        # or summarized into later context.
+        print(f"Error getting financial advice for user {user.id}: {e}")
+        return ADVICE_UNAVAILABLE
+    await record_chat_turn(user.id, request.message, response_text)
+    background_tasks.add_task(fold_chat_summary, user.id)
+    return response_text
+
 @router.post("/ai/advice", response_model=ChatResponse)
 async def get_ai_advice(
     request: ChatRequest,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    response_text = get_financial_advice(request.message, request.context)
-    
-    chat_entry = ChatHistory(
-        user_id=current_user.id,
-        message=request.message,
-        response=response_text
-    )
-    db.add(chat_entry)
-    db.commit()
-    
+    response_text = await _advise(request, background_tasks, current_user, db)
     return {"response": response_text}
 
 @router.post("/chat", response_model=ChatResponse)
 async def chat_endpoint(
     request: ChatRequest,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    response_text = get_financial_advice(request.message, request.context)
-    
-    chat_entry = ChatHistory(
-        user_id=current_user.id,
-        message=request.message,
-        response=response_text
-    )
-    db.add(chat_entry)
-    db.commit()
-    
+    response_text = await _advise(request, background_tasks, current_user, db)
     return ChatResponse(response=response_text)
 
 @router.get("/ai/portfolio-analysis")
@@ -59,11 +71,50 @@ async def analyze_portfolio(
     if not stocks:
         return {"message": "No stocks in portfolio to analyze"}
     
-    analysis = analyze_portfolio_with_ai(portfolio, stocks)
-    return analysis
+    job = submit_portfolio_analysis(db, portfolio, stocks)
+    if job.status not in ("done", "failed"):
+        job = await wait_for_job(job.id, ANALYSIS_SYNC_WAIT_SECONDS)
+    
+    if job.status == "done":
+        return job_to_dict(job)["result"]
+    if job.status == "failed":
+        raise HTTPException(status_code=502, detail="Unable to analyze portfolio at this time.")
+    return JSONResponse(status_code=202, content=jsonable_encoder(job_to_dict(job)))
+
+@router.post("/ai/portfolio-analysis/jobs", status_code=202)
+async def submit_portfolio_analysis_job(
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    portfolio = db.query(Portfolio).filter(Portfolio.user_id == current_user.id).first()
+    if not portfolio:
+        raise HTTPException(status_code=404, detail="Portfolio not found")
+    
+    stocks = db.query(Stock).filter(Stock.portfolio_id == portfolio.id).all()
+    if not stocks:
+        raise HTTPException(status_code=400, detail="No stocks in portfolio to analyze")
+    
+    job = submit_portfolio_analysis(db, portfolio, stocks)
+    return job_to_dict(job)
+
+@router.get("/ai/portfolio-analysis/jobs/{job_id}")
+async def get_portfolio_analysis_job(
+    job_id: str,
+    wait: float = 0,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    job = get_job(db, job_id, current_user.id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    if wait > 0 and job.status not in ("done", "failed"):
+        job = await wait_for_job(job.id, min(wait, MAX_JOB_WAIT_SECONDS))
+    return job_to_dict(job)
 
 @router.get("/ai/risk-assessment")
 async def get_risk_assessment(
+    horizon_days: int = Query(1, ge=1, le=30),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -76,4 +127,15 @@ async def get_risk_assessment(
         return {"message": "No stocks in portfolio to assess"}
     
     risk_data = assess_portfolio_risk(stocks)
+    risk_data.update(assess_market_risk(db, stocks, horizon_days))
     return risk_data
+
+@router.get("/ai/recommendations", response_model=RecommendationsResponse)
+def get_investment_recommendations(
+    risk_profile: str = "moderate",
+    budget: float = Query(10000, ge=0),
+    current_user: User = Depends(get_current_user)
+):
+    # Served from the precomputed bucket; a plain def so a cold bucket's
+    # LLM call runs in the threadpool instead of blocking the event loop.
+    return get_recommendations(risk_profile, budget)
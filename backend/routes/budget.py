@@ -1,12 +1,17 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from backend.database import get_db
 from backend.models.user import User
 from backend.services.auth import get_current_user
 from datetime import datetime
+from typing import Optional
 from backend.models.budget import Budget, FinancialGoal
-from backend.schemas.budget import BudgetCreate, FinancialGoalCreate, BudgetListResponse, AnalyticsSummary
-from sqlalchemy import func
+from backend.schemas.budget import (
+    BudgetCreate, FinancialGoalCreate, BudgetListResponse, AnalyticsSummary,
+    GoalProgressUpdate, GoalProjectionsResponse, BudgetAlertsResponse
+)
+from backend.services.goal_projection import project_goals, invalidate_goal_projections
+from backend.services.budget_service import calculate_analytics_summary, get_budget_alerts, update_spending_stats
 
 router = APIRouter(prefix="/api", tags=["budget"])
 
@@ -24,19 +29,38 @@ async def add_budget_entry(
         date=entry.date or datetime.utcnow()
     )
     db.add(new_entry)
+    db.flush()
+    # Statistics are updated in the same transaction as the entry
+    update_spending_stats(db, new_entry)
     db.commit()
     db.refresh(new_entry)
+    invalidate_goal_projections(current_user.id)
     return new_entry
 
 @router.get("/budget/list", response_model=BudgetListResponse)
 async def list_budget_items(
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    budgets = db.query(Budget).filter(Budget.user_id == current_user.id).all()
+    # A date range lets Postgres scan only the matching monthly partitions.
+    query = db.query(Budget).filter(Budget.user_id == current_user.id)
+    if start is not None:
+        query = query.filter(Budget.date >= start)
+    if end is not None:
+        query = query.filter(Budget.date < end)
+    budgets = query.all()
     goals = db.query(FinancialGoal).filter(FinancialGoal.user_id == current_user.id).all()
     return {"budgets": budgets, "goals": goals}
 
+@router.get("/budget/alerts", response_model=BudgetAlertsResponse)
+async def get_budget_alert_list(
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    return {"alerts": get_budget_alerts(db, current_user.id)}
+
 @router.post("/goals/create")
 async def create_goal(
     goal: FinancialGoalCreate,
@@ -52,28 +76,40 @@ async def create_goal(
     db.add(new_goal)
     db.commit()
     db.refresh(new_goal)
+    invalidate_goal_projections(current_user.id)
     return new_goal
 
-@router.get("/analytics/summary", response_model=AnalyticsSummary)
-async def get_analytics_summary(
+@router.post("/goals/{goal_id}/progress")
+async def update_goal_progress(
+    goal_id: int,
+    progress: GoalProgressUpdate,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    # Aggregate values from budgets
-    total_income = db.query(Budget).filter(Budget.user_id == current_user.id, Budget.type == "income").with_entities(func.sum(Budget.amount)).scalar() or 0
-    total_expense = db.query(Budget).filter(Budget.user_id == current_user.id, Budget.type == "expense").with_entities(func.sum(Budget.amount)).scalar() or 0
-    savings = max(total_income - total_expense, 0)
+    goal = db.query(FinancialGoal).filter(FinancialGoal.id == goal_id, FinancialGoal.user_id == current_user.id).first()
+    if not goal:
+        raise HTTPException(status_code=404, detail="Goal not found")
+    
+    goal.current_amount = progress.current_amount
+    db.commit()
+    db.refresh(goal)
+    invalidate_goal_projections(current_user.id)
+    return goal
 
-    # Placeholder: pull real-time investment value later
-    investments = 0.0
-    monthly_expenses = total_expense  # simple
+@router.get("/goals/projections", response_model=GoalProjectionsResponse)
+async def get_goal_projections(
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    # Simulates every goal at once; cached until budgets or goals change.
+    return project_goals(db, current_user.id)
 
-    return {
-        "total_balance": savings + investments,
-        "investments": investments,
-        "savings": savings,
-        "monthly_expenses": monthly_expenses
-    }
+@router.get("/analytics/summary", response_model=AnalyticsSummary)
+async def get_analytics_summary(
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    return calculate_analytics_summary(db, current_user.id)
 
 @router.post("/accounts/link")
 async def link_account(
@@ -0,0 +1,26 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from backend.database import get_db
+from backend.models.user import User
+from backend.services.auth import get_current_user
+from backend.services.dashboard import SECTION_TIMEOUT_MS, build_dashboard, parse_fields, parse_sections
+
+router = APIRouter(prefix="/api", tags=["dashboard"])
+
+@router.get("/dashboard")
+async def get_dashboard(
+    sections: Optional[str] = None,
+    fields: Optional[str] = None,
+    timeout_ms: float = Query(SECTION_TIMEOUT_MS, gt=0, le=10000),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    # sections: comma separated subset of summary, holdings, valuation,
+    # budgets, goals, projections. fields: "section.field" pairs to keep.
+    try:
+        requested = parse_sections(sections)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return await build_dashboard(db, current_user.id, requested, parse_fields(fields), timeout_ms)
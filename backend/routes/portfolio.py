@@ -1,13 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from typing import List
 from backend.database import get_db
 from backend.models.user import User
 from backend.models.portfolio import Portfolio, Stock
-from backend.schemas.portfolio import StockCreate, Stock as StockSchema, StockPrice, StockUpdate
+from backend.schemas.portfolio import StockCreate, Stock as StockSchema, StockPrice, StockUpdate, SymbolMatch
 from backend.services.auth import get_current_user
 from backend.services.stock_service import get_stock_price, get_stock_historical_data, get_stock_info
 from backend.services.portfolio_service import calculate_portfolio_performance, calculate_stock_profit_loss
+from backend.services.symbols import search_symbols, validate_symbol
 
 router = APIRouter(prefix="/api/portfolio", tags=["portfolio"])
 
@@ -17,6 +18,11 @@ async def add_stock(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
+    # Checked against the local listing; unlisted tickers cost one quote lookup
+    symbol = validate_symbol(stock_data.symbol)
+    if not symbol:
+        raise HTTPException(status_code=404, detail="Stock symbol not found")
+
     portfolio = db.query(Portfolio).filter(Portfolio.user_id == current_user.id).first()
     if not portfolio:
         portfolio = Portfolio(user_id=current_user.id)
@@ -24,13 +30,9 @@ async def add_stock(
         db.commit()
         db.refresh(portfolio)
     
-    price_data = get_stock_price(stock_data.symbol)
-    if not price_data:
-        raise HTTPException(status_code=404, detail="Stock symbol not found")
-    
     new_stock = Stock(
         portfolio_id=portfolio.id,
-        symbol=stock_data.symbol.upper(),
+        symbol=symbol,
         shares=stock_data.shares,
         purchase_price=stock_data.purchase_price
     )
@@ -51,6 +53,10 @@ async def get_stocks(
     stocks = db.query(Stock).filter(Stock.portfolio_id == portfolio.id).all()
     return stocks
 
+@router.get("/symbols/search", response_model=List[SymbolMatch])
+def search_symbol_listing(q: str = Query(..., min_length=1, max_length=64), limit: int = Query(10, ge=1, le=50)):
+    return search_symbols(q, limit)
+
 @router.get("/stock/{symbol}/price", response_model=StockPrice)
 async def get_stock_price_endpoint(symbol: str):
     price_data = get_stock_price(symbol)
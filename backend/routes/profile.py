@@ -1,9 +1,12 @@
-from fastapi import APIRouter, Depends
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from backend.database import get_db
 from backend.models.user import User
 from backend.schemas.user import UserUpdate
-from backend.services.auth import get_current_user
+from backend.services.auth import get_current_user, invalidate_cached_user
+from backend.services.export import EXPORT_FORMATS, parquet_available, stream_user_export
 
 router = APIRouter(prefix="/api/profile", tags=["profile"])
 
@@ -21,4 +24,24 @@ async def update_profile(
         current_user.location = profile_data.location
     
     db.commit()
+    invalidate_cached_user(current_user.email)
     return {"message": "Profile updated successfully"}
+
+@router.get("/export")
+def export_user_data(
+    format: str = Query("csv"),
+    current_user: User = Depends(get_current_user)
+):
+    # Streams a zip of budgets, goals, holdings, transactions and chat
+    # history; the export opens its own session for the whole download.
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of: {', '.join(EXPORT_FORMATS)}")
+    if format == "parquet" and not parquet_available():
+        raise HTTPException(status_code=400, detail="Parquet export is not available on this server")
+
+    filename = f"wealthmate-export-{datetime.utcnow():%Y%m%d}.zip"
+    return StreamingResponse(
+        stream_user_export(current_user.id, format),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
@@ -1,5 +1,6 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from datetime import datetime
+from typing import List, Literal, Optional
 
 class ChatRequest(BaseModel):
     message: str
@@ -10,10 +11,18 @@ class ChatResponse(BaseModel):
 
 class InvestmentRecommendation(BaseModel):
     symbol: str
-    action: str
+    action: Literal["Buy", "Hold"]
     reason: str
-    confidence: float
-    risk_level: str
+    confidence: float = Field(ge=0, le=100)
+    risk_level: Literal["Low", "Medium", "High"]
+    current_price: Optional[float] = None
+    change_percent: Optional[float] = None
+
+class RecommendationsResponse(BaseModel):
+    risk_profile: str
+    budget_bucket: str
+    generated_at: Optional[datetime] = None
+    recommendations: List[InvestmentRecommendation]
 
 class PortfolioAnalysis(BaseModel):
     total_value: float
@@ -1,6 +1,6 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, field_validator
 from typing import Optional, List
-from datetime import datetime
+from datetime import datetime, timezone
 
 class BudgetBase(BaseModel):
     category: str
@@ -10,6 +10,14 @@ class BudgetBase(BaseModel):
 class BudgetCreate(BudgetBase):
     date: Optional[datetime] = None
 
+    @field_validator("date")
+    @classmethod
+    def naive_utc(cls, value: Optional[datetime]) -> Optional[datetime]:
+        # Stored dates are naive UTC; an offset such as "...Z" is converted
+        if value is not None and value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+
 class Budget(BudgetBase):
     id: int
     date: datetime
@@ -41,4 +49,49 @@ class AnalyticsSummary(BaseModel):
 
 class BudgetListResponse(BaseModel):
     budgets: List[Budget]
-    goals: List[FinancialGoal]
\ No newline at end of file
+    goals: List[FinancialGoal]
+
+class GoalProgressUpdate(BaseModel):
+    current_amount: float
+
+class GoalProjectionBand(BaseModel):
+    month: int
+    p10: float
+    p25: float
+    p50: float
+    p75: float
+    p90: float
+
+class GoalProjection(BaseModel):
+    goal_id: int
+    name: str
+    target_amount: float
+    current_amount: float
+    deadline: Optional[datetime] = None
+    horizon_months: int
+    probability: float
+    status: str  # "on_track", "at_risk" or "off_track"
+    monthly_allocation: float
+    required_monthly_savings: float
+    bands: List[GoalProjectionBand]
+
+class GoalProjectionsResponse(BaseModel):
+    generated_at: datetime
+    paths: int
+    monthly_savings_mean: float
+    monthly_savings_std: float
+    history_months: int
+    goals: List[GoalProjection]
+
+class BudgetAlert(BaseModel):
+    kind: str  # "anomaly" or "upcoming_expense"
+    category: str
+    type: str
+    message: str
+    amount: float
+    expected_amount: float
+    zscore: Optional[float] = None
+    date: datetime
+
+class BudgetAlertsResponse(BaseModel):
+    alerts: List[BudgetAlert]
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional, List
+from typing import List
 from datetime import datetime
 
 class StockBase(BaseModel):
@@ -47,6 +47,11 @@ class StockPrice(BaseModel):
     day_low: float
     volume: int
 
+class SymbolMatch(BaseModel):
+    symbol: str
+    name: str
+    exchange: str
+
 class StockUpdate(BaseModel):
     shares: float
     purchase_price: float
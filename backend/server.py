@@ -0,0 +1,76 @@
+import argparse
+import os
+
+APP = "backend.main:app"
+
+def default_workers() -> int:
+    return int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1))
+
+def run_gunicorn(args):
+    from gunicorn.app.base import BaseApplication
+
+    class WealthMateApplication(BaseApplication):
+        def load_config(self):
+            # gunicorn drains in-flight requests on SIGTERM for up to
+            # graceful_timeout before killing workers.
+            self.cfg.set("bind", f"{args.host}:{args.port}")
+            self.cfg.set("workers", args.workers)
+            self.cfg.set("worker_class", "uvicorn.workers.UvicornWorker")
+            self.cfg.set("preload_app", args.preload)
+            self.cfg.set("graceful_timeout", args.graceful_timeout)
+            self.cfg.set("timeout", args.timeout)
+            self.cfg.set("keepalive", args.keepalive)
+            if args.max_requests:
+                self.cfg.set("max_requests", args.max_requests)
+                self.cfg.set("max_requests_jitter", max(args.max_requests // 10, 1))
+
+        def load(self):
+            from backend.main import app
+            return app
+
+    WealthMateApplication().run()
+
+def run_uvicorn(args):
+    import uvicorn
+
+    if args.preload:
+        print("--preload needs gunicorn; starting uvicorn workers without it")
+    uvicorn.run(
+        APP,
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        timeout_graceful_shutdown=args.graceful_timeout,
+        timeout_keep_alive=args.keepalive,
+        limit_max_requests=args.max_requests or None,
+        proxy_headers=True,
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the WealthMate API with multiple worker processes")
+    parser.add_argument("--host", default=os.getenv("HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", 5000)))
+    parser.add_argument("--workers", type=int, default=default_workers(),
+                        help="worker processes (WEB_CONCURRENCY, default: CPU count)")
+    parser.add_argument("--preload", action="store_true", default=os.getenv("PRELOAD_APP") == "1",
+                        help="import the app once in the master and fork workers from it")
+    parser.add_argument("--graceful-timeout", type=int, default=int(os.getenv("GRACEFUL_TIMEOUT_SECONDS", 30)),
+                        help="seconds to drain in-flight requests after SIGTERM")
+    parser.add_argument("--timeout", type=int, default=int(os.getenv("WORKER_TIMEOUT_SECONDS", 60)))
+    parser.add_argument("--keepalive", type=int, default=int(os.getenv("KEEPALIVE_SECONDS", 5)))
+    parser.add_argument("--max-requests", type=int, default=int(os.getenv("MAX_REQUESTS", 0)),
+                        help="recycle a worker after this many requests (0 disables)")
+    args = parser.parse_args()
+    if args.workers == 1:
+        # a memory cache is only safe to invalidate when one process holds it
+        os.environ.setdefault("USER_CACHE_LOCAL", "1")
+
+    try:
+        import gunicorn  # noqa: F401
+    except ImportError:
+        run_uvicorn(args)
+    else:
+        run_gunicorn(args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+import asyncio
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional, Tuple
+from fastapi.responses import JSONResponse
+from backend.services.auth import decode_token
+from backend.services.metrics import Counter, REGISTRY
+
+ADMISSION_REJECTIONS = Counter(
+    "wealthmate_admission_rejections_total", "Requests shed before reaching a handler",
+    ("route_class", "reason")
+)
+REGISTRY.append(ADMISSION_REJECTIONS)
+
+# First matching prefix wins; paths outside /api (assets, /metrics) are exempt.
+ROUTE_CLASSES = (
+    ("/api/chat", "chat"),
+    ("/api/ai/advice", "chat"),
+    ("/api/ai/portfolio-analysis/jobs/", "default"),
+    ("/api/ai/risk-assessment", "market"),
+    ("/api/ai/", "ai"),
+    ("/api/portfolio/symbols/", "default"),
+    ("/api/portfolio/", "market"),
+    ("/api/dashboard", "market"),
+    ("/api/login", "auth"),
+    ("/api/register", "auth"),
+    ("/api/refresh", "auth"),
+    ("/api/", "default"),
+)
+# requests per window, as "N/seconds"; the bucket holds N tokens
+DEFAULT_RATE_LIMITS = {
+    "chat": "20/60",
+    "ai": "30/60",
+    "market": "120/60",
+    "auth": "10/60",
+    "default": "300/60",
+}
+# Route classes that fan out to a paid or slow upstream share its gate
+UPSTREAM_GATES = {"chat": "openai", "ai": "openai", "market": "market_data"}
+DEFAULT_UPSTREAM_CONCURRENCY = {"openai": 8, "market_data": 16}
+
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "1") == "1"
+MAX_INFLIGHT_REQUESTS = int(os.getenv("MAX_INFLIGHT_REQUESTS", 256))
+QUEUE_LIMIT = int(os.getenv("ADMISSION_QUEUE_LIMIT", 64))
+QUEUE_TIMEOUT = float(os.getenv("ADMISSION_QUEUE_TIMEOUT_SECONDS", 2.0))
+
+def classify(path: str) -> Optional[str]:
+    for prefix, route_class in ROUTE_CLASSES:
+        if path.startswith(prefix):
+            return route_class
+    return None
+
+def parse_rate(spec: str) -> Tuple[float, float]:
+    # "20/60" -> capacity 20 tokens refilled at 20/60 tokens per second
+    count, seconds = spec.split("/")
+    return float(count), float(count) / float(seconds)
+
+def rate_limit(route_class: str) -> Tuple[float, float]:
+    return parse_rate(os.getenv(f"RATE_LIMIT_{route_class.upper()}", DEFAULT_RATE_LIMITS[route_class]))
+
+class MemoryTokenBuckets:
+    # Per-process buckets; each worker enforces its own share of the limit.
+    name = "memory"
+    blocking = False
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, list]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key: str, capacity: float, rate: float, cost: float = 1.0) -> Tuple[bool, float]:
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = [capacity, now]
+                if len(self._buckets) > self.max_keys:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+                bucket[0] = min(capacity, bucket[0] + (now - bucket[1]) * rate)
+                bucket[1] = now
+            if bucket[0] >= cost:
+                bucket[0] -= cost
+                return True, 0.0
+            return False, (cost - bucket[0]) / rate
+
+class RedisTokenBuckets:
+    # One bucket per key in a Redis-compatible server, refilled and debited
+    # atomically in a script so every worker shares the same limit.
+    name = "redis"
+    # take() is a network round trip, so it runs off the event loop
+    blocking = True
+
+    SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local cost = tonumber(ARGV[4])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000))
+return {allowed, tostring(tokens)}
+"""
+
+    def __init__(self, url: str, prefix: str = "wealthmate:ratelimit:"):
+        import redis
+
+        self.client = redis.Redis.from_url(url, socket_timeout=0.25, socket_connect_timeout=0.25)
+        self.prefix = prefix
+        self._script = self.client.register_script(self.SCRIPT)
+
+    def take(self, key: str, capacity: float, rate: float, cost: float = 1.0) -> Tuple[bool, float]:
+        allowed, tokens = self._script(keys=[self.prefix + key], args=[capacity, rate, time.time(), cost])
+        if int(allowed):
+            return True, 0.0
+        return False, (cost - float(tokens)) / rate
+
+def build_buckets(url: str):
+    if url.startswith("memory://"):
+        return MemoryTokenBuckets()
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisTokenBuckets(url, prefix=os.getenv("CACHE_KEY_PREFIX", "wealthmate:") + "ratelimit:")
+    raise ValueError(f"Unsupported RATE_LIMIT_URL: {url}")
+
+class ConcurrencyGate:
+    # Caps concurrent requests to one upstream. Excess requests wait in a
+    # bounded queue for at most `timeout`; beyond that they are shed.
+    def __init__(self, name: str, limit: int, queue_limit: int = QUEUE_LIMIT, timeout: float = QUEUE_TIMEOUT):
+        self.name = name
+        self.limit = limit
+        self.queue_limit = queue_limit
+        self.timeout = timeout
+        self.waiting = 0
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.limit)
+        return self._semaphore
+
+    async def acquire(self) -> Optional[str]:
+        # Returns None once admitted, otherwise the reason for shedding.
+        if not self.semaphore.locked():
+            await self.semaphore.acquire()
+            return None
+        if self.waiting >= self.queue_limit:
+            return "queue_full"
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self.semaphore.acquire(), self.timeout)
+            return None
+        except asyncio.TimeoutError:
+            return "queue_timeout"
+        finally:
+            self.waiting -= 1
+
+    def release(self):
+        self.semaphore.release()
+
+def _rejection(status_code: int, detail: str, retry_after: float) -> JSONResponse:
+    return JSONResponse(
+        status_code=status_code,
+        content={"detail": detail},
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))}
+    )
+
+def _identity(request) -> str:
+    authorization = request.headers.get("authorization", "")
+    if authorization.lower().startswith("bearer "):
+        payload = decode_token(authorization[7:])
+        if payload and payload.get("email"):
+            return f"user:{payload['email']}"
+    return f"ip:{request.client.host if request.client else 'unknown'}"
+
+class AdmissionController:
+    def __init__(self):
+        self.inflight = 0
+        self.gates = {
+            upstream: ConcurrencyGate(
+                upstream, int(os.getenv(f"ADMISSION_{upstream.upper()}_CONCURRENCY", limit))
+            )
+            for upstream, limit in DEFAULT_UPSTREAM_CONCURRENCY.items()
+        }
+        self.limits = {route_class: rate_limit(route_class) for route_class in DEFAULT_RATE_LIMITS}
+        self._buckets = None
+
+    def reset(self):
+        # Gates bind to the running event loop, so each app startup gets
+        # fresh ones.
+        self.inflight = 0
+        for gate in self.gates.values():
+            gate._semaphore = None
+
+    @property
+    def buckets(self):
+        if self._buckets is None:
+            self._buckets = build_buckets(os.getenv("RATE_LIMIT_URL", os.getenv("CACHE_URL", "memory://")))
+        return self._buckets
+
+    async def _check_rate(self, request, route_class: str) -> Tuple[bool, float]:
+        capacity, rate = self.limits[route_class]
+        try:
+            buckets = self.buckets
+            key = f"{route_class}:{_identity(request)}"
+            if buckets.blocking:
+                return await asyncio.to_thread(buckets.take, key, capacity, rate)
+            return buckets.take(key, capacity, rate)
+        except Exception as e:
+            # fail open: a broken limiter backend must not take the API down
+            print(f"Rate limiter unavailable: {e}")
+            return True, 0.0
+
+    async def admit(self, request) -> Tuple[Optional[JSONResponse], Callable[[], None]]:
+        route_class = classify(request.url.path)
+        # CORS preflights carry no credentials and never reach a handler
+        if route_class is None or request.method == "OPTIONS":
+            return None, lambda: None
+
+        if self.inflight >= MAX_INFLIGHT_REQUESTS:
+            ADMISSION_REJECTIONS.inc(route_class=route_class, reason="overloaded")
+            return _rejection(503, "Server is busy, please retry shortly", 1), lambda: None
+
+        if RATE_LIMIT_ENABLED:
+            allowed, retry_after = await self._check_rate(request, route_class)
+            if not allowed:
+                ADMISSION_REJECTIONS.inc(route_class=route_class, reason="rate_limited")
+                return _rejection(429, "Too many requests", retry_after), lambda: None
+
+        gate = self.gates.get(UPSTREAM_GATES.get(route_class))
+        if gate is not None:
+            reason = await gate.acquire()
+            if reason is not None:
+                ADMISSION_REJECTIONS.inc(route_class=route_class, reason=reason)
+                return _rejection(503, "Service is at capacity, please retry shortly", gate.timeout), lambda: None
+
+        self.inflight += 1
+
+        def release():
+            self.inflight -= 1
+            if gate is not None:
+                gate.release()
+        return None, release
+
+admission = AdmissionController()
@@ -1,49 +1,113 @@
+import hashlib
+import json
 import os
-from openai import OpenAI
+import threading
 from typing import List, Dict
+from pydantic import ValidationError
 from backend.models.portfolio import Stock, Portfolio
-from backend.services.stock_service import get_stock_price, get_stock_info
+from backend.services.stock_service import get_stock_prices, get_stock_info
 from backend.schemas.ai import InvestmentRecommendation
+from backend.services.metrics import track_upstream
+from backend.services.cache import get_cache
 
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+client = None
+_client_lock = threading.Lock()
 
-def get_financial_advice(user_message: str, context: str = None) -> str:
-    try:
-        system_prompt = "You are WealthMate, a knowledgeable financial advisor AI assistant. Provide helpful, accurate, and concise financial advice."
-        
-        if context:
-            system_prompt += f"\n\nAdditional context: {context}"
-        
-        response = client.chat.completions.create(
+# Only for low-temperature, non-conversational prompts (summaries,
+# recommendations); chat replies are sampled per request and never cached
+llm_cache = get_cache("llm_responses", ttl=float(os.getenv("LLM_CACHE_TTL_SECONDS", 3600)))
+
+def _completion_key(**request) -> str:
+    return hashlib.sha256(json.dumps(request, sort_keys=True).encode()).hexdigest()
+
+def get_openai_client():
+    # Deferred so importing the API does not pay for the openai SDK.
+    global client
+    if client is None:
+        with _client_lock:
+            if client is None:
+                from openai import OpenAI
+                client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    return client
+
+def request_financial_advice(user_message: str, context: str = None, history: List[Dict] = None, summary: str = None) -> str:
+    # Raises on upstream failure; callers that store the reply must not keep an apology
+    system_prompt = "You are WealthMate, a knowledgeable financial advisor AI assistant. Provide helpful, accurate, and concise financial advice."
+    
+    if context:
+        system_prompt += f"\n\nAdditional context: {context}"
+    if summary:
+        system_prompt += f"\n\nSummary of the earlier conversation with this user: {summary}"
+    
+    messages = [{"role": "system", "content": system_prompt}]
+    messages.extend(history or [])
+    messages.append({"role": "user", "content": user_message})
+    
+    with track_upstream("openai", "chat_completion"):
+        response = get_openai_client().chat.completions.create(
             model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_message}
-            ],
+            messages=messages,
             max_tokens=500,
             temperature=0.7
         )
-        
-        return response.choices[0].message.content
+    
+    content = response.choices[0].message.content
+    if not content:
+        raise RuntimeError("Empty completion from OpenAI")
+    return content
+
+ADVICE_UNAVAILABLE = "I apologize, but I'm having trouble processing your request at the moment. Please try again later."
+
+def get_financial_advice(user_message: str, context: str = None, history: List[Dict] = None, summary: str = None) -> str:
+    try:
+        return request_financial_advice(user_message, context, history, summary)
     except Exception as e:
-        return f"I apologize, but I'm having trouble processing your request at the moment. Please try again later."
+        return ADVICE_UNAVAILABLE
+
+def summarize_conversation(previous_summary: str, turns: List[Dict], max_tokens: int = 250) -> str:
+    transcript = "\n".join(f"User: {t['message']}\nWealthMate: {t['response']}" for t in turns)
+    prompt = f"""Update the running summary of a conversation between a user and their financial advisor.
+Keep facts about the user's goals, income, holdings, risk tolerance and open questions. Drop small talk.
+
+Current summary:
+{previous_summary or "(none)"}
+
+New exchanges:
+{transcript}
+
+Return only the updated summary in under {max_tokens} tokens."""
+    
+    request = {"model": "gpt-3.5-turbo", "messages": [{"role": "user", "content": prompt}],
+               "max_tokens": max_tokens, "temperature": 0.2}
+    cache_key = _completion_key(**request)
+    cached = llm_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    
+    with track_upstream("openai", "summarize"):
+        response = get_openai_client().chat.completions.create(**request)
+    
+    summary = response.choices[0].message.content.strip()
+    llm_cache.set(cache_key, summary)
+    return summary
 
 def analyze_portfolio_with_ai(portfolio: Portfolio, stocks_data: List[Stock]) -> Dict:
-    try:
-        portfolio_summary = []
-        total_value = 0
-        
-        for stock in stocks_data:
-            current_price_data = get_stock_price(stock.symbol)
-            if current_price_data:
-                current_value = stock.shares * current_price_data.current_price
-                purchase_value = stock.shares * stock.purchase_price
-                profit_loss = current_value - purchase_value
-                
-                total_value += current_value
-                portfolio_summary.append(f"{stock.symbol}: {stock.shares} shares at ${current_price_data.current_price:.2f} (P/L: ${profit_loss:.2f})")
-        
-        prompt = f"""Analyze this investment portfolio and provide:
+    # Errors propagate so the analysis job is marked failed and retried
+    portfolio_summary = []
+    total_value = 0
+    quotes = get_stock_prices([stock.symbol for stock in stocks_data])
+    
+    for stock in stocks_data:
+        current_price_data = quotes.get(stock.symbol.upper())
+        if current_price_data:
+            current_value = stock.shares * current_price_data.current_price
+            purchase_value = stock.shares * stock.purchase_price
+            profit_loss = current_value - purchase_value
+            
+            total_value += current_value
+            portfolio_summary.append(f"{stock.symbol}: {stock.shares} shares at ${current_price_data.current_price:.2f} (P/L: ${profit_loss:.2f})")
+    
+    prompt = f"""Analyze this investment portfolio and provide:
 1. Overall risk assessment
 2. Diversification analysis
 3. Specific recommendations for improvement
@@ -54,50 +118,63 @@ Portfolio:
 Total Portfolio Value: ${total_value:.2f}
 
 Provide a concise analysis with actionable recommendations."""
-        
-        analysis = get_financial_advice(prompt)
-        
-        return {
-            "total_value": total_value,
-            "analysis": analysis,
-            "stocks_count": len(stocks_data)
-        }
-    except Exception as e:
-        return {
-            "total_value": 0,
-            "analysis": "Unable to analyze portfolio at this time.",
-            "stocks_count": 0
-        }
+    
+    analysis = request_financial_advice(prompt)
+    
+    return {
+        "total_value": total_value,
+        "analysis": analysis,
+        "stocks_count": len(stocks_data)
+    }
 
-def get_investment_recommendations(risk_profile: str, budget: float) -> List[InvestmentRecommendation]:
+def get_investment_recommendations(risk_profile: str, budget: str) -> List[InvestmentRecommendation]:
     try:
         prompt = f"""As a financial advisor, recommend 3-5 stocks or ETFs for an investor with:
 - Risk Profile: {risk_profile}
-- Investment Budget: ${budget}
-
-Provide recommendations in this format for each:
-- Symbol
-- Action (Buy/Hold)
-- Reason (1-2 sentences)
-- Confidence (0-100)
-- Risk Level (Low/Medium/High)"""
+- Investment Budget: {budget}
+
+Respond with a JSON object of the form
+{{"recommendations": [{{"symbol": "VTI", "action": "Buy", "reason": "1-2 sentences",
+"confidence": 0-100, "risk_level": "Low"}}]}}
+where action is Buy or Hold and risk_level is Low, Medium or High."""
         
-        response = get_financial_advice(prompt)
+        request = {"model": "gpt-3.5-turbo", "messages": [{"role": "user", "content": prompt}],
+                   "max_tokens": 600, "temperature": 0.3, "response_format": {"type": "json_object"}}
+        cache_key = _completion_key(**request)
+        content = llm_cache.get(cache_key)
+        if content is None:
+            with track_upstream("openai", "recommendations"):
+                response = get_openai_client().chat.completions.create(**request)
+            content = response.choices[0].message.content
         
-        return []
+        items = json.loads(content).get("recommendations", [])
+        recommendations = []
+        for item in items:
+            try:
+                recommendation = InvestmentRecommendation.model_validate(item)
+            except ValidationError:
+                continue
+            recommendation.symbol = recommendation.symbol.upper()
+            recommendations.append(recommendation)
+        # cached only once it parses to something usable
+        if recommendations:
+            llm_cache.set(cache_key, content)
+        return recommendations
     except Exception as e:
+        print(f"Error generating recommendations for {risk_profile}: {e}")
         return []
 
 def assess_portfolio_risk(stocks_data: List[Stock]) -> Dict:
     try:
         sectors = {}
         total_value = 0
+        quotes = get_stock_prices([stock.symbol for stock in stocks_data])
         
         for stock in stocks_data:
             info = get_stock_info(stock.symbol)
             sector = info.get('sector', 'Unknown')
             
-            current_price_data = get_stock_price(stock.symbol)
+            current_price_data = quotes.get(stock.symbol.upper())
             if current_price_data:
                 value = stock.shares * current_price_data.current_price
                 sectors[sector] = sectors.get(sector, 0) + value
@@ -0,0 +1,209 @@
+import argparse
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import re
+import shutil
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+HASHED_EXTENSIONS = {".js", ".css", ".png", ".jpg", ".jpeg", ".gif", ".svg", ".ico", ".woff", ".woff2"}
+PAGE_EXTENSIONS = {".html"}
+COMPRESSIBLE_EXTENSIONS = {".js", ".css", ".html", ".svg", ".json"}
+ENCODING_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+MANIFEST_NAME = "manifest.json"
+ASSET_URL_PREFIX = "/assets/"
+
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE = "no-cache"
+
+_REFERENCE = re.compile(r'''(?P<attr>src|href)=(?P<q>["'])(?:\./|/static/|/)?(?P<name>[^"'/?#:]+)(?P=q)''')
+
+def _content_type(name: str) -> str:
+    content_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+    if content_type.startswith("text/") or content_type in ("application/javascript", "image/svg+xml"):
+        content_type += "; charset=utf-8"
+    return content_type
+
+def _compress(name: str, data: bytes) -> Dict[str, bytes]:
+    variants = {"identity": data}
+    if Path(name).suffix not in COMPRESSIBLE_EXTENSIONS:
+        return variants
+    gz = gzip.compress(data, compresslevel=9, mtime=0)
+    if len(gz) < len(data):
+        variants["gzip"] = gz
+    if brotli is not None:
+        br = brotli.compress(data, quality=11)
+        if len(br) < len(data):
+            variants["br"] = br
+    return variants
+
+def _rewrite_page(html: str, hashed: Dict[str, str]) -> str:
+    def replace(match):
+        name = match.group("name")
+        if name not in hashed:
+            return match.group(0)
+        return f'{match.group("attr")}={match.group("q")}{ASSET_URL_PREFIX}{hashed[name]}{match.group("q")}'
+    return _REFERENCE.sub(replace, html)
+
+def compile_assets(source_dir: Path) -> Tuple[Dict, Dict[str, Dict[str, bytes]]]:
+    # Returns the manifest and every served file with its encoded variants.
+    # Only top-level files are considered; the frontend is a flat directory.
+    hashed, files = {}, {}
+    for path in sorted(source_dir.iterdir()):
+        if not path.is_file() or path.suffix not in HASHED_EXTENSIONS:
+            continue
+        data = path.read_bytes()
+        digest = hashlib.sha256(data).hexdigest()[:12]
+        hashed_name = f"{path.stem}.{digest}{path.suffix}"
+        hashed[path.name] = hashed_name
+        files[hashed_name] = _compress(path.name, data)
+
+    pages = {}
+    for path in sorted(source_dir.iterdir()):
+        if not path.is_file() or path.suffix not in PAGE_EXTENSIONS:
+            continue
+        data = _rewrite_page(path.read_text(encoding="utf-8"), hashed).encode("utf-8")
+        pages[path.name] = path.name
+        files[path.name] = _compress(path.name, data)
+
+    manifest = {
+        "assets": hashed,
+        "pages": pages,
+        "files": {
+            name: {
+                "content_type": _content_type(name),
+                "etag": '"' + hashlib.sha256(variants["identity"]).hexdigest()[:16] + '"',
+                "encodings": sorted(e for e in variants if e != "identity"),
+                "immutable": name not in pages,
+            }
+            for name, variants in files.items()
+        },
+    }
+    return manifest, files
+
+def build(source_dir: Path, out_dir: Path) -> Dict:
+    manifest, files = compile_assets(source_dir)
+    if out_dir.exists():
+        shutil.rmtree(out_dir)
+    out_dir.mkdir(parents=True)
+    for name, variants in files.items():
+        for encoding, data in variants.items():
+            (out_dir / (name + ENCODING_SUFFIXES.get(encoding, ""))).write_bytes(data)
+    (out_dir / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2, sort_keys=True))
+    return manifest
+
+def negotiate_encoding(accept_encoding: str, available) -> str:
+    accepted = {}
+    for part in (accept_encoding or "").split(","):
+        fields = part.strip().split(";")
+        coding = fields[0].strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in fields[1:]:
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[coding] = q
+
+    for encoding in ("br", "gzip"):
+        if encoding in available and accepted.get(encoding, accepted.get("*", 0)) > 0:
+            return encoding
+    return "identity"
+
+class AssetStore:
+    # Everything is held in memory after startup: serving a file never
+    # touches the filesystem.
+    def __init__(self, manifest: Dict, files: Dict[str, Dict[str, bytes]]):
+        self.manifest = manifest
+        self.files = files
+        self.aliases = dict(manifest["assets"])
+
+    @classmethod
+    def load(cls, dist_dir: Path) -> "AssetStore":
+        manifest = json.loads((dist_dir / MANIFEST_NAME).read_text())
+        files = {}
+        for name, meta in manifest["files"].items():
+            variants = {"identity": (dist_dir / name).read_bytes()}
+            for encoding in meta["encodings"]:
+                variants[encoding] = (dist_dir / (name + ENCODING_SUFFIXES[encoding])).read_bytes()
+            files[name] = variants
+        return cls(manifest, files)
+
+    @classmethod
+    def from_source(cls, source_dir: Path) -> "AssetStore":
+        return cls(*compile_assets(source_dir))
+
+    def resolve(self, name: str) -> Optional[str]:
+        if name in self.files:
+            return name
+        return self.aliases.get(name)
+
+    def is_hashed(self, name: str) -> bool:
+        return name in self.files and self.manifest["files"][name]["immutable"]
+
+    def response_parts(self, name: str, accept_encoding: str, cache_control: str) -> Tuple[bytes, Dict[str, str]]:
+        meta = self.manifest["files"][name]
+        encoding = negotiate_encoding(accept_encoding, meta["encodings"])
+        etag = meta["etag"] if encoding == "identity" else f'{meta["etag"][:-1]}-{encoding}"'
+        headers = {
+            "Content-Type": meta["content_type"],
+            "ETag": etag,
+            "Cache-Control": cache_control,
+            "Vary": "Accept-Encoding",
+        }
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+        return self.files[name][encoding], headers
+
+def default_source_dir() -> Path:
+    root = Path(__file__).resolve().parent.parent.parent
+    configured = os.getenv("FRONTEND_DIR")
+    if configured:
+        return Path(configured)
+    return root / "frontend" if (root / "frontend").is_dir() else root
+
+def default_dist_dir() -> Path:
+    return Path(os.getenv("ASSET_DIST_DIR", default_source_dir() / "dist"))
+
+def load_asset_store() -> AssetStore:
+    dist_dir = default_dist_dir()
+    if (dist_dir / MANIFEST_NAME).is_file():
+        return AssetStore.load(dist_dir)
+    # No build output (local development): compile in memory at startup.
+    return AssetStore.from_source(default_source_dir())
+
+_store: Optional[AssetStore] = None
+
+def get_asset_store() -> AssetStore:
+    global _store
+    if _store is None:
+        _store = load_asset_store()
+    return _store
+
+def main():
+    parser = argparse.ArgumentParser(description="Build hashed, precompressed frontend assets")
+    parser.add_argument("command", choices=["build"])
+    parser.add_argument("--source", type=Path, default=None)
+    parser.add_argument("--out", type=Path, default=None)
+    args = parser.parse_args()
+
+    source = args.source or default_source_dir()
+    out = args.out or default_dist_dir()
+    manifest = build(source, out)
+    print(f"Built {len(manifest['assets'])} assets and {len(manifest['pages'])} pages into {out}"
+          f"{'' if brotli else ' (brotli not installed, gzip only)'}")
+
+if __name__ == "__main__":
+    main()
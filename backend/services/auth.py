@@ -6,9 +6,10 @@ import hashlib
 import secrets
 from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, make_transient_to_detached
 from backend.database import get_db
 from backend.models.user import User
+from backend.services.cache import get_cache
 
 SECRET_KEY = os.getenv("JWT_SECRET", "your-secret-key")
 ALGORITHM = "HS256"
@@ -17,6 +18,20 @@ REFRESH_TOKEN_EXPIRE_DAYS = 7
 
 security = HTTPBearer()
 
+user_cache = get_cache("users", ttl=float(os.getenv("USER_CACHE_TTL_SECONDS", 300)))
+USER_CACHE_COLUMNS = [c.name for c in User.__table__.columns if c.name != "hashed_password"]
+# A profile update only invalidates the cache it can reach, so users are
+# cached in a shared backend (CACHE_URL=redis://...) or, with the memory
+# backend, only when one worker serves every request; backend/server.py
+# sets USER_CACHE_LOCAL=1 when started with --workers 1.
+USER_CACHE_LOCAL = os.getenv("USER_CACHE_LOCAL", "0") == "1"
+
+def user_cache_enabled() -> bool:
+    return USER_CACHE_LOCAL or user_cache.shared
+
+def invalidate_cached_user(email: str):
+    user_cache.delete(email)
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     salt = hashed_password[:32]
     stored_hash = hashed_password[32:]
@@ -69,6 +84,16 @@ async def get_current_user(
             detail="Invalid authentication credentials"
         )
     
+    use_cache = user_cache_enabled()
+    cached = user_cache.get(email) if use_cache else None
+    if cached is not None:
+        # Attach the cached row to this session without a SELECT; attribute
+        # changes still flush as a normal UPDATE, and uncached columns
+        # (the password hash) load on first access.
+        user = User(**cached)
+        make_transient_to_detached(user)
+        return db.merge(user, load=False)
+    
     user = db.query(User).filter(User.email == email).first()
     if user is None:
         raise HTTPException(
@@ -76,4 +101,6 @@ async def get_current_user(
             detail="User not found"
         )
     
+    if use_cache:
+        user_cache.set(email, {c: getattr(user, c) for c in USER_CACHE_COLUMNS})
     return user
@@ -0,0 +1,189 @@
+import argparse
+import math
+import os
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from sqlalchemy import case, func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from backend.database import SessionLocal
+from backend.models.budget import Budget, SpendingStat
+
+EWMA_ALPHA = float(os.getenv("SPENDING_EWMA_ALPHA", 0.3))
+# Entries needed in a category before it can be called anomalous
+ANOMALY_MIN_HISTORY = int(os.getenv("SPENDING_ANOMALY_MIN_HISTORY", 5))
+ANOMALY_ZSCORE = float(os.getenv("SPENDING_ANOMALY_ZSCORE", 3.0))
+ANOMALY_ALERT_DAYS = int(os.getenv("SPENDING_ANOMALY_ALERT_DAYS", 30))
+# A category is recurring once its gaps and amounts are this regular
+RECURRING_MIN_INTERVALS = int(os.getenv("RECURRING_MIN_INTERVALS", 2))
+# Shorter cycles (e.g. groceries every few days) are habits, not bills
+RECURRING_MIN_INTERVAL_DAYS = float(os.getenv("RECURRING_MIN_INTERVAL_DAYS", 6))
+RECURRING_MAX_INTERVAL_CV = float(os.getenv("RECURRING_MAX_INTERVAL_CV", 0.2))
+RECURRING_MAX_AMOUNT_CV = float(os.getenv("RECURRING_MAX_AMOUNT_CV", 0.25))
+UPCOMING_LOOKAHEAD_DAYS = int(os.getenv("UPCOMING_EXPENSE_LOOKAHEAD_DAYS", 7))
+UPCOMING_GRACE_DAYS = int(os.getenv("UPCOMING_EXPENSE_GRACE_DAYS", 3))
+
+def calculate_analytics_summary(db: Session, user_id: int) -> Dict:
+    # Both totals in one pass over the user's rows
+    total_income, total_expense = (
+        db.query(
+            func.sum(case((Budget.type == "income", Budget.amount), else_=0.0)),
+            func.sum(case((Budget.type == "expense", Budget.amount), else_=0.0)),
+        )
+        .filter(Budget.user_id == user_id)
+        .one()
+    )
+    total_income = total_income or 0
+    total_expense = total_expense or 0
+    savings = max(total_income - total_expense, 0)
+
+    # Placeholder: pull real-time investment value later
+    investments = 0.0
+    monthly_expenses = total_expense  # simple
+
+    return {
+        "total_balance": savings + investments,
+        "investments": investments,
+        "savings": savings,
+        "monthly_expenses": monthly_expenses
+    }
+
+def _std(m2: float, count: int) -> float:
+    return math.sqrt(m2 / (count - 1)) if count > 1 else 0.0
+
+def _zscore(amount: float, mean: float, std: float) -> float:
+    # Floor the spread so a run of identical amounts does not make any
+    # change look infinitely unusual
+    return (amount - mean) / max(std, abs(mean) * 0.05, 1.0)
+
+def _get_stat(db: Session, user_id: int, category: str, entry_type: str) -> SpendingStat:
+    key = {"user_id": user_id, "category": category, "type": entry_type}
+    stat = db.query(SpendingStat).filter_by(**key).with_for_update().first()
+    if stat is not None:
+        return stat
+    stat = SpendingStat(**key, count=0, mean=0.0, m2=0.0, ewma=0.0, ewm_var=0.0,
+                        interval_count=0, interval_mean=0.0, interval_m2=0.0)
+    try:
+        with db.begin_nested():
+            db.add(stat)
+        return stat
+    except IntegrityError:
+        # created by a concurrent insert for the same category
+        return db.query(SpendingStat).filter_by(**key).with_for_update().one()
+
+def update_spending_stats(db: Session, entry: Budget) -> Optional[float]:
+    # O(1) per entry: Welford and EWMA updates of the amount, Welford over
+    # the gaps between entries, and an anomaly check against the statistics
+    # as they stood before this entry. Returns the z-score when anomalous.
+    stat = _get_stat(db, entry.user_id, entry.category, entry.type)
+    amount = entry.amount
+    anomaly = None
+
+    if stat.count >= ANOMALY_MIN_HISTORY:
+        # Anomalous against both the long-run and the recent level, so a
+        # lasting change in spending stops alerting once the EWMA adapts
+        z_long = _zscore(amount, stat.mean, _std(stat.m2, stat.count))
+        z_recent = _zscore(amount, stat.ewma, math.sqrt(stat.ewm_var))
+        if abs(z_long) >= ANOMALY_ZSCORE and abs(z_recent) >= ANOMALY_ZSCORE:
+            anomaly = z_long if abs(z_long) < abs(z_recent) else z_recent
+            stat.anomaly_budget_id = entry.id
+            stat.anomaly_amount = amount
+            stat.anomaly_expected = round(stat.ewma, 2)
+            stat.anomaly_zscore = round(anomaly, 2)
+            stat.anomaly_date = entry.date
+
+    stat.count += 1
+    delta = amount - stat.mean
+    stat.mean += delta / stat.count
+    stat.m2 += delta * (amount - stat.mean)
+    if stat.count == 1:
+        stat.ewma, stat.ewm_var = amount, 0.0
+    else:
+        diff = amount - stat.ewma
+        increment = EWMA_ALPHA * diff
+        stat.ewma += increment
+        stat.ewm_var = (1 - EWMA_ALPHA) * (stat.ewm_var + diff * increment)
+
+    if stat.last_date is None or entry.date >= stat.last_date:
+        if stat.last_date is not None:
+            # backdated entries only feed the amount statistics
+            gap = (entry.date - stat.last_date).total_seconds() / 86400
+            stat.interval_count += 1
+            delta = gap - stat.interval_mean
+            stat.interval_mean += delta / stat.interval_count
+            stat.interval_m2 += delta * (gap - stat.interval_mean)
+        stat.last_date = entry.date
+        stat.last_amount = amount
+    return anomaly
+
+def is_recurring(stat: SpendingStat) -> bool:
+    if stat.interval_count < RECURRING_MIN_INTERVALS or stat.interval_mean < RECURRING_MIN_INTERVAL_DAYS:
+        return False
+    interval_cv = _std(stat.interval_m2, stat.interval_count) / stat.interval_mean
+    amount_cv = math.sqrt(stat.ewm_var) / abs(stat.ewma) if stat.ewma else float("inf")
+    return interval_cv <= RECURRING_MAX_INTERVAL_CV and amount_cv <= RECURRING_MAX_AMOUNT_CV
+
+def get_budget_alerts(db: Session, user_id: int, now: Optional[datetime] = None) -> List[Dict]:
+    # Reads only the user's statistics rows, one per category and type
+    now = now or datetime.utcnow()
+    alerts = []
+    for stat in db.query(SpendingStat).filter(SpendingStat.user_id == user_id).all():
+        if stat.anomaly_date is not None and stat.anomaly_date >= now - timedelta(days=ANOMALY_ALERT_DAYS):
+            direction = "higher" if stat.anomaly_zscore > 0 else "lower"
+            alerts.append({
+                "kind": "anomaly",
+                "category": stat.category,
+                "type": stat.type,
+                "message": f"{stat.category} {stat.type} of {stat.anomaly_amount:,.2f} is much {direction} "
+                           f"than usual (about {stat.anomaly_expected:,.2f})",
+                "amount": stat.anomaly_amount,
+                "expected_amount": stat.anomaly_expected,
+                "zscore": stat.anomaly_zscore,
+                "date": stat.anomaly_date,
+            })
+        if stat.type == "expense" and is_recurring(stat):
+            due = stat.last_date + timedelta(days=stat.interval_mean)
+            days_until = (due - now).total_seconds() / 86400
+            if -UPCOMING_GRACE_DAYS <= days_until <= UPCOMING_LOOKAHEAD_DAYS:
+                when = "is overdue" if days_until < 0 else f"is due in {math.ceil(days_until)} day(s)"
+                alerts.append({
+                    "kind": "upcoming_expense",
+                    "category": stat.category,
+                    "type": stat.type,
+                    "message": f"Recurring {stat.category} expense of about {stat.ewma:,.2f} {when}",
+                    "amount": round(stat.last_amount, 2),
+                    "expected_amount": round(stat.ewma, 2),
+                    "date": due,
+                })
+    alerts.sort(key=lambda a: a["date"])
+    return alerts
+
+def rebuild_spending_stats(db: Session, user_id: Optional[int] = None) -> int:
+    # One-off backfill for entries written before the statistics existed;
+    # replays each user's entries in date order, one user per transaction.
+    user_ids = [user_id] if user_id is not None else [
+        row[0] for row in db.query(Budget.user_id).distinct().order_by(Budget.user_id)
+    ]
+    count = 0
+    for uid in user_ids:
+        db.query(SpendingStat).filter(SpendingStat.user_id == uid).delete(synchronize_session=False)
+        entries = db.query(Budget).filter(Budget.user_id == uid).order_by(Budget.date, Budget.id).all()
+        for entry in entries:
+            update_spending_stats(db, entry)
+        db.commit()
+        db.expunge_all()
+        count += len(entries)
+    return count
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild per-category spending statistics")
+    parser.add_argument("--user-id", type=int)
+    args = parser.parse_args()
+    db = SessionLocal()
+    try:
+        print(f"Replayed {rebuild_spending_stats(db, args.user_id)} budget entries")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
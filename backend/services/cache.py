@@ -0,0 +1,216 @@
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Protocol
+from backend.services.metrics import Counter, REGISTRY, record_cache
+
+CACHE_ERRORS = Counter(
+    "wealthmate_cache_backend_errors_total", "Cache backend operations that failed",
+    ("backend", "operation")
+)
+REGISTRY.append(CACHE_ERRORS)
+
+class CacheBackend(Protocol):
+    name: str
+    # True when every worker process sees the same entries
+    shared: bool
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]: ...
+
+    def set_many(self, mapping: Dict[str, Any], ttl: Optional[float] = None): ...
+
+    def delete(self, key: str): ...
+
+    def incr(self, key: str, amount: int = 1, ttl: Optional[float] = None) -> int: ...
+
+class MemoryCache:
+    # Per-process LRU with TTLs. Fine for a single worker; with several
+    # workers each one holds its own copy, so use a shared backend instead.
+    name = "memory"
+    shared = False
+
+    def __init__(self, max_entries: int = 50_000):
+        self.max_entries = max_entries
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, key: str, now: float):
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= now:
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return entry
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        now = time.monotonic()
+        found = {}
+        with self._lock:
+            for key in keys:
+                entry = self._get(key, now)
+                if entry is not None:
+                    found[key] = entry[0]
+        return found
+
+    def set_many(self, mapping: Dict[str, Any], ttl: Optional[float] = None):
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            for key, value in mapping.items():
+                self._data[key] = (value, expires_at)
+                self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def incr(self, key: str, amount: int = 1, ttl: Optional[float] = None) -> int:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._get(key, now)
+            value = (entry[0] if entry else 0) + amount
+            expires_at = entry[1] if entry else (now + ttl if ttl else None)
+            self._data[key] = (value, expires_at)
+            return value
+
+class RedisCache:
+    # Works against any Redis-protocol server (redis, valkey, keydb, dragonfly)
+    # so every worker process shares one warm cache.
+    name = "redis"
+    shared = True
+
+    def __init__(self, url: str, prefix: str = "wealthmate:"):
+        import redis
+
+        self.client = redis.Redis.from_url(url, socket_timeout=0.25, socket_connect_timeout=0.25)
+        self.prefix = prefix
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        keys = list(keys)
+        if not keys:
+            return {}
+        values = self.client.mget([self.prefix + k for k in keys])
+        found = {}
+        for key, raw in zip(keys, values):
+            if raw is None:
+                continue
+            try:
+                found[key] = pickle.loads(raw)
+            except Exception:
+                continue
+        return found
+
+    def set_many(self, mapping: Dict[str, Any], ttl: Optional[float] = None):
+        if not mapping:
+            return
+        pipe = self.client.pipeline(transaction=False)
+        for key, value in mapping.items():
+            pipe.set(self.prefix + key, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL),
+                     px=int(ttl * 1000) if ttl else None)
+        pipe.execute()
+
+    def delete(self, key: str):
+        self.client.delete(self.prefix + key)
+
+    def incr(self, key: str, amount: int = 1, ttl: Optional[float] = None) -> int:
+        pipe = self.client.pipeline(transaction=True)
+        if ttl:
+            # starts the expiry clock only when the counter is created
+            pipe.set(self.prefix + key, 0, nx=True, px=int(ttl * 1000))
+        pipe.incrby(self.prefix + key, amount)
+        return int(pipe.execute()[-1])
+
+class Cache:
+    # A named view over the shared backend. Backend failures are treated as
+    # misses so an unavailable cache server degrades to uncached behaviour.
+    def __init__(self, namespace: str, ttl: Optional[float] = None, backend: Optional[CacheBackend] = None):
+        self.namespace = namespace
+        self.ttl = ttl
+        self._backend = backend
+
+    @property
+    def backend(self) -> CacheBackend:
+        # Resolved per call so CACHE_URL and set_backend() apply to caches
+        # created at import time.
+        return self._backend or get_backend()
+
+    @property
+    def shared(self) -> bool:
+        return self.backend.shared
+
+    def _key(self, key) -> str:
+        return f"{self.namespace}:{key}"
+
+    def get(self, key, default=None):
+        return self.get_many([key]).get(key, default)
+
+    def get_many(self, keys: Iterable) -> Dict:
+        keys = list(keys)
+        if not keys:
+            return {}
+        try:
+            raw = self.backend.get_many([self._key(k) for k in keys])
+        except Exception as e:
+            CACHE_ERRORS.inc(backend=self.backend.name, operation="get")
+            print(f"Cache get failed for {self.namespace}: {e}")
+            raw = {}
+        found = {}
+        for key in keys:
+            full_key = self._key(key)
+            hit = full_key in raw
+            record_cache(self.namespace, hit)
+            if hit:
+                found[key] = raw[full_key]
+        return found
+
+    def set(self, key, value, ttl: Optional[float] = None):
+        self.set_many({key: value}, ttl)
+
+    def set_many(self, mapping: Dict, ttl: Optional[float] = None):
+        try:
+            self.backend.set_many({self._key(k): v for k, v in mapping.items()}, ttl or self.ttl)
+        except Exception as e:
+            CACHE_ERRORS.inc(backend=self.backend.name, operation="set")
+            print(f"Cache set failed for {self.namespace}: {e}")
+
+    def delete(self, key):
+        try:
+            self.backend.delete(self._key(key))
+        except Exception as e:
+            CACHE_ERRORS.inc(backend=self.backend.name, operation="delete")
+            print(f"Cache delete failed for {self.namespace}: {e}")
+
+    def incr(self, key, amount: int = 1, ttl: Optional[float] = None) -> int:
+        return self.backend.incr(self._key(key), amount, ttl or self.ttl)
+
+def build_backend(url: str) -> CacheBackend:
+    if url.startswith("memory://"):
+        return MemoryCache(max_entries=int(os.getenv("CACHE_MAX_ENTRIES", 50_000)))
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisCache(url, prefix=os.getenv("CACHE_KEY_PREFIX", "wealthmate:"))
+    raise ValueError(f"Unsupported CACHE_URL: {url}")
+
+_backend: Optional[CacheBackend] = None
+_backend_lock = threading.Lock()
+
+def get_backend() -> CacheBackend:
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = build_backend(os.getenv("CACHE_URL", "memory://"))
+    return _backend
+
+def set_backend(backend: Optional[CacheBackend]):
+    global _backend
+    with _backend_lock:
+        _backend = backend
+
+def get_cache(namespace: str, ttl: Optional[float] = None) -> Cache:
+    return Cache(namespace, ttl)
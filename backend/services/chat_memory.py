@@ -0,0 +1,203 @@
+import os
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import and_, or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from backend.database import SessionLocal
+from backend.models.chat import ChatHistory, ChatSummary
+from backend.services.chat_writer import pending_chat_turns
+
+CONTEXT_TURNS = int(os.getenv("CHAT_CONTEXT_TURNS", 6))
+CONTEXT_TOKEN_BUDGET = int(os.getenv("CHAT_CONTEXT_TOKEN_BUDGET", 1500))
+SUMMARY_TOKEN_BUDGET = int(os.getenv("CHAT_SUMMARY_TOKEN_BUDGET", 250))
+SUMMARY_BATCH = int(os.getenv("CHAT_SUMMARY_BATCH", 10))
+# Folding keeps fewer unsummarized turns than this, so the context can
+# carry all of them and no turn is in neither the summary nor the prompt
+UNSUMMARIZED_LIMIT = CONTEXT_TURNS + SUMMARY_BATCH
+# 0 keeps every row; otherwise summarized rows beyond the newest N are deleted
+RETENTION_TURNS = int(os.getenv("CHAT_RETENTION_TURNS", 0))
+
+_folding = set()
+_folding_lock = threading.Lock()
+
+def estimate_tokens(text: str) -> int:
+    # ~4 characters per token for English text, plus per-message overhead
+    return len(text) // 4 + 4
+
+def _truncate_to_tokens(text: str, tokens: int) -> str:
+    max_chars = max(tokens - 4, 0) * 4
+    if len(text) <= max_chars:
+        return text
+    return text[:max_chars].rsplit(" ", 1)[0] + " ..."
+
+def _after_watermark(query, through_at: Optional[datetime], through_id: int):
+    # Strictly after the (created_at, id) watermark; the plain created_at
+    # bound lets Postgres prune older partitions.
+    if through_at is None:
+        return query
+    return query.filter(
+        ChatHistory.created_at >= through_at,
+        or_(ChatHistory.created_at > through_at,
+            and_(ChatHistory.created_at == through_at, ChatHistory.id > through_id))
+    )
+
+def load_recent_turns(db: Session, user_id: int, limit: int = CONTEXT_TURNS,
+                      through_at: Optional[datetime] = None, through_id: int = 0) -> List[ChatHistory]:
+    query = _after_watermark(db.query(ChatHistory).filter(ChatHistory.user_id == user_id), through_at, through_id)
+    rows = (
+        query
+        .order_by(ChatHistory.created_at.desc(), ChatHistory.id.desc())
+        .limit(limit)
+        .all()
+    )
+    return list(reversed(rows))
+
+def fit_to_budget(summary: str, turns: List[ChatHistory], budget: int = CONTEXT_TOKEN_BUDGET) -> Tuple[str, List[Dict]]:
+    summary = _truncate_to_tokens(summary or "", min(SUMMARY_TOKEN_BUDGET, budget // 3))
+    remaining = budget - (estimate_tokens(summary) if summary else 0)
+
+    # Keep the newest turns that fit; a turn is only useful with both halves.
+    kept = []
+    for turn in reversed(turns):
+        cost = estimate_tokens(turn.message) + estimate_tokens(turn.response)
+        if cost > remaining:
+            break
+        kept.append(turn)
+        remaining -= cost
+
+    history = []
+    for turn in reversed(kept):
+        history.append({"role": "user", "content": turn.message})
+        history.append({"role": "assistant", "content": turn.response})
+    return summary, history
+
+def build_chat_context(db: Session, user_id: int) -> Tuple[str, List[Dict]]:
+    summary_row = db.get(ChatSummary, user_id)
+    # Every turn after the summary watermark is sent, not just the newest
+    # CONTEXT_TURNS: turns that left the window wait there until the next
+    # fold takes a whole SUMMARY_BATCH of them.
+    turns = load_recent_turns(
+        db, user_id, limit=UNSUMMARIZED_LIMIT,
+        through_at=summary_row.summarized_through_at if summary_row else None,
+        through_id=summary_row.summarized_through_id if summary_row else 0
+    )
+    turns = merge_pending_turns(turns, pending_chat_turns(user_id), limit=UNSUMMARIZED_LIMIT)
+    return fit_to_budget(summary_row.summary if summary_row else "", turns)
+
+def merge_pending_turns(turns: List[ChatHistory], pending: List[ChatHistory],
+                        limit: int = CONTEXT_TURNS) -> List[ChatHistory]:
+    # Turns still queued for the write-behind writer; a row that committed
+    # between the two reads shows up in both and is kept once.
+    if not pending:
+        return turns
+    stored = {(t.created_at, t.message) for t in turns}
+    merged = turns + [t for t in pending if (t.created_at, t.message) not in stored]
+    merged.sort(key=lambda t: t.created_at)
+    return merged[-limit:]
+
+def _fallback_summary(previous: str, turns: List[Dict]) -> str:
+    questions = "; ".join(t["message"][:120] for t in turns)
+    combined = f"{previous} Earlier the user asked about: {questions}".strip()
+    return _truncate_to_tokens(combined, SUMMARY_TOKEN_BUDGET)
+
+def fold_chat_summary(user_id: int, db: Optional[Session] = None):
+    # Folds the oldest unsummarized turns that have left the context window
+    # into the rolling summary, SUMMARY_BATCH at a time. Every read is bounded
+    # by CONTEXT_TURNS + SUMMARY_BATCH rows, so cost does not grow with history.
+    with _folding_lock:
+        if user_id in _folding:
+            return
+        _folding.add(user_id)
+
+    owns_session = db is None
+    db = db or SessionLocal()
+    try:
+        # a backlog (e.g. after summarization was off) is folded until fewer
+        # than UNSUMMARIZED_LIMIT turns remain
+        while _fold(db, user_id):
+            pass
+    finally:
+        with _folding_lock:
+            _folding.discard(user_id)
+        if owns_session:
+            db.close()
+
+def _fold(db: Session, user_id: int) -> bool:
+    # True when a batch was folded
+    from backend.services.ai_service import summarize_conversation
+
+    summary_row = db.get(ChatSummary, user_id)
+    previous_summary = summary_row.summary if summary_row else ""
+    through_id = summary_row.summarized_through_id if summary_row else 0
+    through_at = summary_row.summarized_through_at if summary_row else None
+
+    query = _after_watermark(db.query(ChatHistory).filter(ChatHistory.user_id == user_id), through_at, through_id)
+    pending = (
+        query.order_by(ChatHistory.created_at, ChatHistory.id)
+        .limit(UNSUMMARIZED_LIMIT)
+        .all()
+    )
+    if len(pending) < UNSUMMARIZED_LIMIT:
+        return False
+
+    batch = pending[:SUMMARY_BATCH]
+    turns = [{"message": t.message, "response": t.response} for t in batch]
+    try:
+        summary = summarize_conversation(previous_summary, turns, SUMMARY_TOKEN_BUDGET)
+    except Exception as e:
+        print(f"Error summarizing chat history for user {user_id}: {e}")
+        summary = _fallback_summary(previous_summary, turns)
+
+    values = {
+        "summary": summary,
+        "summarized_through_id": batch[-1].id,
+        "summarized_through_at": batch[-1].created_at,
+        "summarized_turns": (summary_row.summarized_turns if summary_row else 0) + len(batch),
+    }
+    # Conditional write: another worker process that folded the same batch
+    # first wins, and this result is dropped rather than double-counted.
+    if summary_row is None:
+        db.add(ChatSummary(user_id=user_id, **values))
+        try:
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            return False
+    else:
+        updated = (
+            db.query(ChatSummary)
+            .filter(ChatSummary.user_id == user_id, ChatSummary.summarized_through_id == through_id)
+            .update(values, synchronize_session=False)
+        )
+        db.commit()
+        if not updated:
+            return False
+
+    if RETENTION_TURNS:
+        prune_chat_history(db, user_id, values["summarized_through_id"], values["summarized_through_at"])
+    return True
+
+def prune_chat_history(db: Session, user_id: int, summarized_through_id: int, summarized_through_at,
+                       keep: int = RETENTION_TURNS) -> int:
+    cutoff = (
+        db.query(ChatHistory.id, ChatHistory.created_at)
+        .filter(ChatHistory.user_id == user_id)
+        .order_by(ChatHistory.created_at.desc(), ChatHistory.id.desc())
+        .offset(keep)
+        .first()
+    )
+    if cutoff is None or summarized_through_at is None:
+        return 0
+
+    # Only rows that are both summarized and outside the retention window go.
+    limit_at = min(cutoff.created_at, summarized_through_at)
+    deleted = (
+        db.query(ChatHistory)
+        .filter(ChatHistory.user_id == user_id, ChatHistory.created_at <= limit_at,
+                ChatHistory.id <= summarized_through_id)
+        .delete(synchronize_session=False)
+    )
+    db.commit()
+    return deleted
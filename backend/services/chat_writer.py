@@ -0,0 +1,204 @@
+import argparse
+import asyncio
+import json
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+from sqlalchemy import insert
+from backend.database import get_engine
+from backend.models.chat import ChatHistory
+from backend.services.metrics import COUNT_BUCKETS, Counter, Histogram, REGISTRY
+
+# "0" writes each turn synchronously inside the request, as before
+WRITE_BEHIND = os.getenv("CHAT_WRITE_BEHIND", "1") == "1"
+BATCH_SIZE = int(os.getenv("CHAT_WRITE_BATCH_SIZE", 200))
+FLUSH_INTERVAL = float(os.getenv("CHAT_WRITE_FLUSH_MS", 5)) / 1000
+QUEUE_SIZE = int(os.getenv("CHAT_WRITE_QUEUE_SIZE", 10_000))
+WRITE_RETRIES = int(os.getenv("CHAT_WRITE_RETRIES", 3))
+# Batches that still fail after WRITE_RETRIES are appended here as JSON lines;
+# `python -m backend.services.chat_writer replay` inserts them later
+SPILL_PATH = os.getenv("CHAT_WRITE_SPILL_PATH", "chat_history.spill.jsonl")
+
+CHAT_WRITES = Counter(
+    "wealthmate_chat_history_writes_total", "Chat history rows persisted, by path", ("path",)
+)
+CHAT_WRITE_BATCH = Histogram(
+    "wealthmate_chat_history_write_batch_rows", "Rows per group commit of chat history",
+    buckets=COUNT_BUCKETS
+)
+REGISTRY.extend([CHAT_WRITES, CHAT_WRITE_BATCH])
+
+_STOP = object()
+
+def _insert_rows(rows: List[Dict]):
+    with get_engine().begin() as conn:
+        conn.execute(insert(ChatHistory.__table__), rows)
+
+def _spill(rows: List[Dict]):
+    # Last resort for a batch the database would not take. If even the
+    # spill file fails, each row is logged in full so it can be recovered.
+    try:
+        with open(SPILL_PATH, "a", encoding="utf-8") as f:
+            for row in rows:
+                f.write(json.dumps({**row, "created_at": row["created_at"].isoformat()}) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        CHAT_WRITES.inc(len(rows), path="spilled")
+        for row in rows:
+            print(f"Spilled chat history row for user {row['user_id']} at {row['created_at'].isoformat()} to {SPILL_PATH}")
+    except Exception as e:
+        CHAT_WRITES.inc(len(rows), path="failed")
+        for row in rows:
+            print(f"Dropped chat history row ({e}): {json.dumps({**row, 'created_at': row['created_at'].isoformat()})}")
+
+class ChatHistoryWriter:
+    # Buffers chat turns in a bounded queue and inserts them from one thread,
+    # BATCH_SIZE rows or FLUSH_INTERVAL at a time, in a single transaction.
+    # Rows stay visible through pending() until their batch has committed.
+    def __init__(self, batch_size: int = BATCH_SIZE, flush_interval: float = FLUSH_INTERVAL,
+                 queue_size: int = QUEUE_SIZE):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue" = queue.Queue(maxsize=queue_size)
+        self._pending: Dict[int, List[Dict]] = {}
+        self._pending_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="chat-history-writer", daemon=True)
+        self._thread.start()
+
+    async def submit(self, row: Dict):
+        # Called from request handlers, so nothing here blocks the event loop
+        with self._pending_lock:
+            self._pending.setdefault(row["user_id"], []).append(row)
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            # Backpressure: the writer is behind, so this request pays for its own insert
+            try:
+                await asyncio.to_thread(_insert_rows, [row])
+                CHAT_WRITES.inc(path="overflow")
+            finally:
+                self._forget([row])
+
+    def pending(self, user_id: int) -> List[Dict]:
+        with self._pending_lock:
+            return list(self._pending.get(user_id, ()))
+
+    def _forget(self, rows: List[Dict]):
+        with self._pending_lock:
+            for row in rows:
+                user_rows = self._pending.get(row["user_id"])
+                if not user_rows:
+                    continue
+                user_rows[:] = [r for r in user_rows if r is not row]
+                if not user_rows:
+                    del self._pending[row["user_id"]]
+
+    def _next_batch(self) -> List:
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size and batch[-1] is not _STOP:
+            timeout = deadline - time.monotonic()
+            try:
+                batch.append(self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, rows: List[Dict]):
+        delay = 0.05
+        for attempt in range(WRITE_RETRIES + 1):
+            try:
+                _insert_rows(rows)
+                CHAT_WRITES.inc(len(rows), path="batched")
+                CHAT_WRITE_BATCH.observe(len(rows))
+                break
+            except Exception as e:
+                if attempt == WRITE_RETRIES:
+                    print(f"Spilling {len(rows)} chat history rows after {attempt + 1} failed writes: {e}")
+                    _spill(rows)
+                    break
+                time.sleep(delay)
+                delay *= 2
+        self._forget(rows)
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            stopping = batch[-1] is _STOP
+            rows = batch[:-1] if stopping else batch
+            if rows:
+                self._write(rows)
+            if stopping:
+                return
+
+    def stop(self, timeout: float = 10.0):
+        # Everything queued before the sentinel is committed before the thread exits
+        self._queue.put(_STOP)
+        self._thread.join(timeout=timeout)
+        if self._thread.is_alive():
+            print(f"Chat history writer did not drain within {timeout}s")
+
+_writer: Optional[ChatHistoryWriter] = None
+_writer_lock = threading.Lock()
+
+def get_chat_writer() -> ChatHistoryWriter:
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = ChatHistoryWriter()
+    return _writer
+
+async def record_chat_turn(user_id: int, message: str, response: str):
+    # created_at is stamped now so ordering follows response time, not commit time
+    row = {"user_id": user_id, "message": message, "response": response, "created_at": datetime.utcnow()}
+    if not WRITE_BEHIND:
+        await asyncio.to_thread(_insert_rows, [row])
+        CHAT_WRITES.inc(path="sync")
+        return
+    await get_chat_writer().submit(row)
+
+def pending_chat_turns(user_id: int) -> List[ChatHistory]:
+    if _writer is None:
+        return []
+    return [ChatHistory(**row) for row in _writer.pending(user_id)]
+
+def shutdown_chat_writer():
+    global _writer
+    with _writer_lock:
+        if _writer is not None:
+            _writer.stop()
+            _writer = None
+
+def replay_spilled(path: str = SPILL_PATH, batch_size: int = BATCH_SIZE) -> int:
+    # The file is renamed first so rows spilled meanwhile start a new one;
+    # on failure the renamed copy stays behind and the next replay retries it.
+    claimed = f"{path}.replaying"
+    if os.path.exists(path) and not os.path.exists(claimed):
+        os.replace(path, claimed)
+    if not os.path.exists(claimed):
+        return 0
+    with open(claimed, encoding="utf-8") as f:
+        rows = [json.loads(line) for line in f if line.strip()]
+    for row in rows:
+        row["created_at"] = datetime.fromisoformat(row["created_at"])
+    # one transaction, so a failed replay can be re-run without duplicates
+    with get_engine().begin() as conn:
+        for i in range(0, len(rows), batch_size):
+            conn.execute(insert(ChatHistory.__table__), rows[i:i + batch_size])
+    os.remove(claimed)
+    return len(rows)
+
+def main():
+    parser = argparse.ArgumentParser(description="Insert chat history rows spilled by the write-behind writer")
+    parser.add_argument("command", choices=["replay"])
+    parser.add_argument("--path", default=SPILL_PATH)
+    args = parser.parse_args()
+
+    print(f"Replayed {replay_spilled(args.path)} chat history rows from {args.path}")
+
+if __name__ == "__main__":
+    main()
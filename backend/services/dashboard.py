@@ -0,0 +1,136 @@
+import asyncio
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Set
+from fastapi.encoders import jsonable_encoder
+from backend.database import SessionLocal
+from backend.models.budget import Budget, FinancialGoal
+from backend.models.portfolio import Portfolio, Stock
+from backend.schemas.budget import Budget as BudgetSchema, FinancialGoal as FinancialGoalSchema
+from backend.schemas.portfolio import Stock as StockSchema
+from backend.services.budget_service import calculate_analytics_summary
+from backend.services.goal_projection import project_goals
+from backend.services.portfolio_service import calculate_portfolio_performance
+
+SECTION_TIMEOUT_MS = float(os.getenv("DASHBOARD_SECTION_TIMEOUT_MS", 1500))
+RECENT_BUDGET_DAYS = int(os.getenv("DASHBOARD_BUDGET_DAYS", 30))
+RECENT_BUDGET_LIMIT = int(os.getenv("DASHBOARD_BUDGET_LIMIT", 100))
+
+class DashboardContext:
+    # Loaded once per request and shared by every section
+    def __init__(self, user_id: int, portfolio: Optional[Portfolio], stocks: List[Stock]):
+        self.user_id = user_id
+        self.portfolio = portfolio
+        self.stocks = stocks
+
+def _with_session(fn: Callable) -> Callable:
+    # Sections run on worker threads; each DB section gets its own session.
+    def run(ctx: DashboardContext):
+        db = SessionLocal()
+        try:
+            return fn(ctx, db)
+        finally:
+            db.close()
+    return run
+
+@_with_session
+def _summary(ctx: DashboardContext, db):
+    return calculate_analytics_summary(db, ctx.user_id)
+
+def _holdings(ctx: DashboardContext):
+    return [StockSchema.model_validate(stock) for stock in ctx.stocks]
+
+def _valuation(ctx: DashboardContext):
+    if ctx.portfolio is None:
+        return None
+    # stocks are preloaded, so this only touches the (cached) quote lookup
+    return calculate_portfolio_performance(ctx.portfolio, None, stocks=ctx.stocks)
+
+@_with_session
+def _budgets(ctx: DashboardContext, db):
+    since = datetime.utcnow() - timedelta(days=RECENT_BUDGET_DAYS)
+    rows = (
+        db.query(Budget)
+        .filter(Budget.user_id == ctx.user_id, Budget.date >= since)
+        .order_by(Budget.date.desc())
+        .limit(RECENT_BUDGET_LIMIT)
+        .all()
+    )
+    return [BudgetSchema.model_validate(row) for row in rows]
+
+@_with_session
+def _goals(ctx: DashboardContext, db):
+    goals = db.query(FinancialGoal).filter(FinancialGoal.user_id == ctx.user_id).all()
+    return [FinancialGoalSchema.model_validate(goal) for goal in goals]
+
+@_with_session
+def _projections(ctx: DashboardContext, db):
+    return project_goals(db, ctx.user_id)
+
+SECTIONS: Dict[str, Callable] = {
+    "summary": _summary,
+    "holdings": _holdings,
+    "valuation": _valuation,
+    "budgets": _budgets,
+    "goals": _goals,
+    "projections": _projections,
+}
+
+def parse_sections(sections: Optional[str]) -> List[str]:
+    if not sections:
+        return list(SECTIONS)
+    requested = [s.strip() for s in sections.split(",") if s.strip()]
+    unknown = [s for s in requested if s not in SECTIONS]
+    if unknown:
+        raise ValueError(f"Unknown dashboard sections: {', '.join(unknown)}")
+    return requested
+
+def parse_fields(fields: Optional[str]) -> Dict[str, Set[str]]:
+    # "valuation.total_value,holdings.symbol" -> {"valuation": {...}, "holdings": {...}}
+    selected: Dict[str, Set[str]] = {}
+    for item in (fields or "").split(","):
+        section, _, field = item.strip().partition(".")
+        if section and field:
+            selected.setdefault(section, set()).add(field)
+    return selected
+
+def _select(value, fields: Optional[Set[str]]):
+    if not fields:
+        return value
+    if isinstance(value, list):
+        return [_select(item, fields) for item in value]
+    if isinstance(value, dict):
+        return {k: v for k, v in value.items() if k in fields}
+    return value
+
+async def _run_section(name: str, ctx: DashboardContext, timeout: float):
+    started = time.perf_counter()
+    try:
+        # A timed-out section keeps running on its thread; its result is dropped.
+        result = await asyncio.wait_for(asyncio.to_thread(SECTIONS[name], ctx), timeout)
+        return name, jsonable_encoder(result), None, time.perf_counter() - started
+    except asyncio.TimeoutError:
+        return name, None, "timeout", time.perf_counter() - started
+    except Exception as e:
+        print(f"Dashboard section {name} failed: {e}")
+        return name, None, "error", time.perf_counter() - started
+
+async def build_dashboard(db, user_id: int, sections: List[str], fields: Dict[str, Set[str]],
+                          timeout_ms: float = SECTION_TIMEOUT_MS) -> Dict:
+    portfolio = db.query(Portfolio).filter(Portfolio.user_id == user_id).first()
+    stocks = db.query(Stock).filter(Stock.portfolio_id == portfolio.id).all() if portfolio else []
+    ctx = DashboardContext(user_id, portfolio, stocks)
+
+    results = await asyncio.gather(*(_run_section(name, ctx, timeout_ms / 1000) for name in sections))
+
+    dashboard = {}
+    errors = {}
+    timings = {}
+    for name, value, error, elapsed in results:
+        dashboard[name] = _select(value, fields.get(name))
+        timings[name] = round(elapsed * 1000, 1)
+        if error:
+            errors[name] = error
+    dashboard["meta"] = {"partial": bool(errors), "errors": errors, "timings_ms": timings}
+    return dashboard
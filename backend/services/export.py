@@ -0,0 +1,156 @@
+import csv
+import io
+import os
+import zipfile
+from datetime import datetime
+from typing import Callable, Iterator, List, Tuple
+from sqlalchemy import Table, select
+from backend.database import SessionLocal
+from backend.models.budget import Budget, FinancialGoal
+from backend.models.chat import ChatHistory
+from backend.models.portfolio import Portfolio, Stock, Transaction
+
+EXPORT_FORMATS = ("csv", "parquet")
+CHUNK_ROWS = int(os.getenv("EXPORT_CHUNK_ROWS", 5000))
+COMPRESS_LEVEL = int(os.getenv("EXPORT_COMPRESS_LEVEL", 6))
+
+def _user_portfolios(user_id: int):
+    return select(Portfolio.id).where(Portfolio.user_id == user_id)
+
+def _user_stocks(user_id: int):
+    return select(Stock.id).where(Stock.portfolio_id.in_(_user_portfolios(user_id)))
+
+# (file name, table, query for one user's rows); each query is ordered so
+# the file reads naturally and Postgres can walk an index
+EXPORT_TABLES: List[Tuple[str, Table, Callable]] = [
+    ("budgets", Budget.__table__,
+     lambda uid: select(Budget.__table__).where(Budget.user_id == uid).order_by(Budget.date, Budget.id)),
+    ("goals", FinancialGoal.__table__,
+     lambda uid: select(FinancialGoal.__table__).where(FinancialGoal.user_id == uid).order_by(FinancialGoal.id)),
+    ("holdings", Stock.__table__,
+     lambda uid: select(Stock.__table__).where(Stock.portfolio_id.in_(_user_portfolios(uid))).order_by(Stock.id)),
+    ("transactions", Transaction.__table__,
+     lambda uid: select(Transaction.__table__).where(Transaction.stock_id.in_(_user_stocks(uid)))
+     .order_by(Transaction.transaction_date, Transaction.id)),
+    ("chat_history", ChatHistory.__table__,
+     lambda uid: select(ChatHistory.__table__).where(ChatHistory.user_id == uid)
+     .order_by(ChatHistory.created_at, ChatHistory.id)),
+]
+
+class _ChunkBuffer:
+    # Write-only sink for ZipFile. It has no tell()/seek(), so zipfile
+    # streams members with data descriptors and never rewinds; drain()
+    # hands over whatever has been compressed so far.
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+def parquet_available() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+def _chunks(db, query) -> Iterator[list]:
+    # Server-side cursor on Postgres; rows arrive CHUNK_ROWS at a time
+    result = db.execute(query.execution_options(stream_results=True, yield_per=CHUNK_ROWS))
+    for partition in result.partitions(CHUNK_ROWS):
+        yield partition
+
+def _csv_value(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+def _write_csv(member, table: Table, chunks: Iterator[list], buffer: _ChunkBuffer) -> Iterator[bytes]:
+    text = io.TextIOWrapper(member, encoding="utf-8", newline="", write_through=True)
+    writer = csv.writer(text)
+    writer.writerow(table.columns.keys())
+    for rows in chunks:
+        writer.writerows([_csv_value(v) for v in row] for row in rows)
+        yield buffer.drain()
+    text.detach()
+
+def _arrow_schema(table: Table):
+    import pyarrow as pa
+
+    types = {int: pa.int64(), float: pa.float64(), str: pa.string(), datetime: pa.timestamp("us")}
+    return pa.schema([(c.name, types.get(c.type.python_type, pa.string())) for c in table.columns])
+
+class _PositionTracker:
+    # The parquet writer records column chunk offsets with tell(), which a
+    # streamed zip member cannot answer; count the bytes instead.
+    closed = False
+
+    def __init__(self, member):
+        self.member = member
+        self.position = 0
+
+    def write(self, data) -> int:
+        self.member.write(data)
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        # the zip member is closed by the archive
+        self.closed = True
+
+def _write_parquet(member, table: Table, chunks: Iterator[list], buffer: _ChunkBuffer) -> Iterator[bytes]:
+    # One row group per chunk; parquet compresses its own pages
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = _arrow_schema(table)
+    names = table.columns.keys()
+    with pq.ParquetWriter(pa.PythonFile(_PositionTracker(member), mode="w"), schema) as writer:
+        for rows in chunks:
+            columns = list(zip(*rows))
+            writer.write_table(pa.Table.from_arrays(
+                [pa.array(values, type=field.type) for values, field in zip(columns, schema)], names=names
+            ))
+            yield buffer.drain()
+
+def _stream_archive(user_id: int, export_format: str) -> Iterator[bytes]:
+    buffer = _ChunkBuffer()
+    db = SessionLocal()
+    try:
+        with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=COMPRESS_LEVEL) as archive:
+            for name, table, build_query in EXPORT_TABLES:
+                if export_format == "parquet":
+                    # already compressed, so stored as-is
+                    member_name = zipfile.ZipInfo(f"{name}.parquet", date_time=datetime.utcnow().timetuple()[:6])
+                    member_name.compress_type = zipfile.ZIP_STORED
+                    write = _write_parquet
+                else:
+                    member_name = f"{name}.csv"
+                    write = _write_csv
+                with archive.open(member_name, "w", force_zip64=True) as member:
+                    yield from write(member, table, _chunks(db, build_query(user_id)), buffer)
+                yield buffer.drain()
+        # central directory
+        yield buffer.drain()
+    finally:
+        db.close()
+
+def stream_user_export(user_id: int, export_format: str = "csv") -> Iterator[bytes]:
+    # Yields the zip as it is built, one compressed chunk of rows at a time,
+    # so memory stays flat and the download starts with the first chunk.
+    for data in _stream_archive(user_id, export_format):
+        if data:
+            yield data
@@ -0,0 +1,206 @@
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from sqlalchemy import or_, and_
+from sqlalchemy.orm import Session
+from backend.database import SessionLocal
+from backend.models.job import AnalysisJob
+from backend.models.portfolio import Portfolio, Stock
+
+# "inprocess" runs jobs on a thread pool inside the API process; "external"
+# only enqueues and leaves execution to `python -m backend.worker`.
+JOB_MODE = os.getenv("JOB_MODE", "inprocess")
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", 2))
+ANALYSIS_CACHE_TTL = timedelta(seconds=int(os.getenv("ANALYSIS_CACHE_TTL_SECONDS", 6 * 3600)))
+JOB_STALE_AFTER = timedelta(seconds=int(os.getenv("JOB_STALE_SECONDS", 300)))
+
+def portfolio_version(stocks: List[Stock]) -> str:
+    holdings = sorted((s.symbol.upper(), float(s.shares), float(s.purchase_price)) for s in stocks)
+    return hashlib.sha256(json.dumps(holdings).encode()).hexdigest()
+
+def job_to_dict(job: AnalysisJob) -> Dict:
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "created_at": job.created_at,
+        "finished_at": job.finished_at,
+        "result": json.loads(job.result) if job.result else None,
+        "error": job.error
+    }
+
+def find_reusable_job(db: Session, portfolio_id: int, version: str) -> Optional[AnalysisJob]:
+    # In-flight jobs count only while they are younger than JOB_STALE_AFTER;
+    # an older one was most likely lost to a restart or crash.
+    now = datetime.utcnow()
+    return (
+        db.query(AnalysisJob)
+        .filter(
+            AnalysisJob.portfolio_id == portfolio_id,
+            AnalysisJob.portfolio_version == version,
+            or_(
+                and_(AnalysisJob.status == "pending", AnalysisJob.created_at >= now - JOB_STALE_AFTER),
+                and_(AnalysisJob.status == "running", AnalysisJob.started_at >= now - JOB_STALE_AFTER),
+                and_(AnalysisJob.status == "done", AnalysisJob.finished_at >= now - ANALYSIS_CACHE_TTL)
+            )
+        )
+        .order_by(AnalysisJob.created_at.desc())
+        .first()
+    )
+
+def find_stale_job(db: Session, portfolio_id: int, version: str) -> Optional[AnalysisJob]:
+    return (
+        db.query(AnalysisJob)
+        .filter(
+            AnalysisJob.portfolio_id == portfolio_id,
+            AnalysisJob.portfolio_version == version,
+            AnalysisJob.status.in_(["pending", "running"])
+        )
+        .order_by(AnalysisJob.created_at.desc())
+        .first()
+    )
+
+def submit_portfolio_analysis(db: Session, portfolio: Portfolio, stocks: List[Stock]) -> AnalysisJob:
+    version = portfolio_version(stocks)
+    job = find_reusable_job(db, portfolio.id, version)
+    if job:
+        return job
+
+    job = find_stale_job(db, portfolio.id, version)
+    if job:
+        # run_job reclaims it atomically, so concurrent resubmits run it once;
+        # in external mode the worker reclaims stale jobs itself
+        if JOB_MODE == "inprocess":
+            get_worker_pool().submit(job.id)
+        return job
+
+    job = AnalysisJob(
+        id=uuid.uuid4().hex,
+        user_id=portfolio.user_id,
+        portfolio_id=portfolio.id,
+        portfolio_version=version,
+        status="pending"
+    )
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+
+    if JOB_MODE == "inprocess":
+        get_worker_pool().submit(job.id)
+    return job
+
+def get_job(db: Session, job_id: str, user_id: int) -> Optional[AnalysisJob]:
+    return db.query(AnalysisJob).filter(AnalysisJob.id == job_id, AnalysisJob.user_id == user_id).first()
+
+async def wait_for_job(job_id: str, timeout: float) -> Optional[AnalysisJob]:
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    interval = 0.05
+    while True:
+        db = SessionLocal()
+        try:
+            job = db.get(AnalysisJob, job_id)
+            if job is None or job.status in ("done", "failed") or loop.time() >= deadline:
+                return job
+        finally:
+            db.close()
+        await asyncio.sleep(min(interval, max(deadline - loop.time(), 0)))
+        interval = min(interval * 2, 1.0)
+
+def _claim(db: Session, job_id: str) -> bool:
+    now = datetime.utcnow()
+    claimed = (
+        db.query(AnalysisJob)
+        .filter(
+            AnalysisJob.id == job_id,
+            or_(AnalysisJob.status == "pending",
+                and_(AnalysisJob.status == "running", AnalysisJob.started_at < now - JOB_STALE_AFTER))
+        )
+        .update({"status": "running", "started_at": now}, synchronize_session=False)
+    )
+    db.commit()
+    return claimed == 1
+
+def claim_next_job(db: Session) -> Optional[str]:
+    now = datetime.utcnow()
+    candidates = (
+        db.query(AnalysisJob.id)
+        .filter(or_(
+            AnalysisJob.status == "pending",
+            and_(AnalysisJob.status == "running", AnalysisJob.started_at < now - JOB_STALE_AFTER)
+        ))
+        .order_by(AnalysisJob.created_at)
+        .limit(10)
+        .all()
+    )
+    for (job_id,) in candidates:
+        if _claim(db, job_id):
+            return job_id
+    return None
+
+def run_claimed_job(job_id: str):
+    from backend.services.ai_service import analyze_portfolio_with_ai
+
+    db = SessionLocal()
+    try:
+        job = db.get(AnalysisJob, job_id)
+        portfolio = db.get(Portfolio, job.portfolio_id)
+        stocks = db.query(Stock).filter(Stock.portfolio_id == job.portfolio_id).all()
+
+        try:
+            if portfolio is None or not stocks:
+                raise ValueError("Portfolio has no stocks to analyze")
+            result = analyze_portfolio_with_ai(portfolio, stocks)
+            job.result = json.dumps(result)
+            job.status = "done"
+        except Exception as e:
+            print(f"Error running analysis job {job_id}: {e}")
+            job.error = str(e)
+            job.status = "failed"
+
+        job.finished_at = datetime.utcnow()
+        db.commit()
+    finally:
+        db.close()
+
+def run_job(job_id: str):
+    db = SessionLocal()
+    try:
+        claimed = _claim(db, job_id)
+    finally:
+        db.close()
+    if claimed:
+        run_claimed_job(job_id)
+
+class JobWorkerPool:
+    def __init__(self, workers: int = JOB_WORKERS):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="analysis-job")
+
+    def submit(self, job_id: str):
+        self.executor.submit(run_job, job_id)
+
+    def shutdown(self, wait: bool = True):
+        self.executor.shutdown(wait=wait, cancel_futures=not wait)
+
+_pool: Optional[JobWorkerPool] = None
+_pool_lock = threading.Lock()
+
+def get_worker_pool() -> JobWorkerPool:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = JobWorkerPool()
+    return _pool
+
+def shutdown_worker_pool(wait: bool = True):
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=wait)
+            _pool = None
@@ -0,0 +1,419 @@
+import json
+import os
+import random
+import threading
+import time
+import zlib
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Protocol, runtime_checkable
+
+from backend.schemas.portfolio import StockPrice
+from backend.services.metrics import record_cache, track_upstream
+
+PERIOD_BARS = {
+    "1d": 1,
+    "5d": 5,
+    "1mo": 21,
+    "3mo": 63,
+    "6mo": 126,
+    "ytd": 252,
+    "1y": 252,
+    "2y": 504,
+    "5y": 1260,
+    "10y": 2520,
+    "max": None,
+}
+
+DEFAULT_FIXTURE_DIR = Path(__file__).resolve().parent.parent / "fixtures" / "market_data"
+
+
+class MarketDataError(Exception):
+    pass
+
+
+@runtime_checkable
+class MarketDataProvider(Protocol):
+    name: str
+
+    def get_quote(self, symbol: str) -> Optional[StockPrice]: ...
+
+    def get_quotes(self, symbols: List[str]) -> Dict[str, StockPrice]: ...
+
+    def get_history(self, symbol: str, period: str = "1mo") -> Dict: ...
+
+    def get_info(self, symbol: str) -> Dict: ...
+
+
+def _info_dict(symbol: str, info: Dict) -> Dict:
+    return {
+        "symbol": symbol.upper(),
+        "name": info.get('longName', symbol),
+        "sector": info.get('sector', 'Unknown'),
+        "industry": info.get('industry', 'Unknown'),
+        "market_cap": info.get('marketCap', 0),
+        "pe_ratio": info.get('trailingPE', 0),
+        "dividend_yield": info.get('dividendYield', 0),
+        "52_week_high": info.get('fiftyTwoWeekHigh', 0),
+        "52_week_low": info.get('fiftyTwoWeekLow', 0)
+    }
+
+
+class YFinanceProvider:
+    name = "yfinance"
+
+    def get_quote(self, symbol: str) -> Optional[StockPrice]:
+        import yfinance as yf
+
+        with track_upstream("yfinance", "quote"):
+            stock = yf.Ticker(symbol)
+            info = stock.info
+            hist = stock.history(period="1d")
+
+        if hist.empty:
+            return None
+
+        current_price = hist['Close'].iloc[-1]
+        prev_close = info.get('previousClose', current_price)
+        change_percent = ((current_price - prev_close) / prev_close) * 100 if prev_close else 0
+
+        return StockPrice(
+            symbol=symbol.upper(),
+            current_price=float(current_price),
+            change_percent=float(change_percent),
+            day_high=float(hist['High'].iloc[-1]),
+            day_low=float(hist['Low'].iloc[-1]),
+            volume=int(hist['Volume'].iloc[-1])
+        )
+
+    def get_quotes(self, symbols: List[str]) -> Dict[str, StockPrice]:
+        import yfinance as yf
+
+        symbols = sorted({s.upper() for s in symbols})
+        if not symbols:
+            return {}
+
+        with track_upstream("yfinance", "bulk_quotes"):
+            data = yf.download(symbols, period="5d", group_by="ticker", progress=False, threads=True)
+        quotes = {}
+        for symbol in symbols:
+            try:
+                hist = data[symbol] if len(symbols) > 1 else data
+            except KeyError:
+                continue
+            hist = hist.dropna(subset=['Close'])
+            if hist.empty:
+                continue
+
+            current_price = float(hist['Close'].iloc[-1])
+            prev_close = float(hist['Close'].iloc[-2]) if len(hist) > 1 else current_price
+            change_percent = ((current_price - prev_close) / prev_close) * 100 if prev_close else 0
+
+            quotes[symbol] = StockPrice(
+                symbol=symbol,
+                current_price=current_price,
+                change_percent=float(change_percent),
+                day_high=float(hist['High'].iloc[-1]),
+                day_low=float(hist['Low'].iloc[-1]),
+                volume=int(hist['Volume'].iloc[-1])
+            )
+        return quotes
+
+    def get_history(self, symbol: str, period: str = "1mo") -> Dict:
+        import yfinance as yf
+
+        with track_upstream("yfinance", "history"):
+            hist = yf.Ticker(symbol).history(period=period)
+        if hist.empty:
+            return {}
+
+        return {
+            "symbol": symbol.upper(),
+            "dates": hist.index.strftime('%Y-%m-%d').tolist(),
+            "prices": hist['Close'].tolist(),
+            "volumes": hist['Volume'].tolist()
+        }
+
+    def get_info(self, symbol: str) -> Dict:
+        import yfinance as yf
+
+        with track_upstream("yfinance", "info"):
+            info = yf.Ticker(symbol).info
+        if not info:
+            return {}
+        return _info_dict(symbol, info)
+
+
+class FixtureProvider:
+    # Serves quotes, history and info from <fixture_dir>/<SYMBOL>.json.
+    # With synthesize=True, symbols without a file get a deterministic
+    # random walk seeded from the ticker so any universe size is reproducible.
+    name = "fixture"
+
+    def __init__(self, fixture_dir: Optional[str] = None, synthesize: bool = False,
+                 as_of: Optional[date] = None, history_days: int = 504):
+        self.fixture_dir = Path(fixture_dir) if fixture_dir else DEFAULT_FIXTURE_DIR
+        self.synthesize = synthesize
+        self.as_of = as_of or date(2025, 1, 31)
+        self.history_days = history_days
+        self._cache: Dict[str, Optional[Dict]] = {}
+        self._lock = threading.Lock()
+
+    def _load(self, symbol: str) -> Optional[Dict]:
+        symbol = symbol.upper()
+        with self._lock:
+            if symbol in self._cache:
+                record_cache("fixture_data", True)
+                return self._cache[symbol]
+        record_cache("fixture_data", False)
+
+        path = self.fixture_dir / f"{symbol}.json"
+        if path.is_file():
+            with open(path) as f:
+                data = json.load(f)
+        elif self.synthesize:
+            data = synthesize_fixture(symbol, self.as_of, self.history_days)
+        else:
+            data = None
+
+        with self._lock:
+            self._cache[symbol] = data
+        return data
+
+    def get_quote(self, symbol: str) -> Optional[StockPrice]:
+        data = self._load(symbol)
+        if not data or not data["history"]["close"]:
+            return None
+
+        hist = data["history"]
+        current_price = hist["close"][-1]
+        prev_close = hist["close"][-2] if len(hist["close"]) > 1 else current_price
+        change_percent = ((current_price - prev_close) / prev_close) * 100 if prev_close else 0
+
+        return StockPrice(
+            symbol=symbol.upper(),
+            current_price=float(current_price),
+            change_percent=float(change_percent),
+            day_high=float(hist["high"][-1]),
+            day_low=float(hist["low"][-1]),
+            volume=int(hist["volume"][-1])
+        )
+
+    def get_quotes(self, symbols: List[str]) -> Dict[str, StockPrice]:
+        quotes = {}
+        for symbol in {s.upper() for s in symbols}:
+            quote = self.get_quote(symbol)
+            if quote:
+                quotes[symbol] = quote
+        return quotes
+
+    def get_history(self, symbol: str, period: str = "1mo") -> Dict:
+        data = self._load(symbol)
+        if not data:
+            return {}
+
+        hist = data["history"]
+        bars = PERIOD_BARS.get(period, PERIOD_BARS["1mo"])
+        start = -bars if bars else 0
+        return {
+            "symbol": symbol.upper(),
+            "dates": hist["dates"][start:],
+            "prices": hist["close"][start:],
+            "volumes": hist["volume"][start:]
+        }
+
+    def get_info(self, symbol: str) -> Dict:
+        data = self._load(symbol)
+        if not data:
+            return {}
+        return _info_dict(symbol, data.get("info", {}))
+
+
+def synthesize_fixture(symbol: str, as_of: date, days: int) -> Dict:
+    symbol = symbol.upper()
+    rng = random.Random(zlib.crc32(symbol.encode()))
+    sectors = ["Technology", "Healthcare", "Financial Services", "Consumer Cyclical",
+               "Energy", "Industrials", "Utilities", "Communication Services"]
+
+    price = rng.uniform(10, 500)
+    drift = rng.uniform(-0.0002, 0.0008)
+    vol = rng.uniform(0.008, 0.03)
+
+    dates, opens, highs, lows, closes, volumes = [], [], [], [], [], []
+    day = as_of - timedelta(days=int(days * 7 / 5) + 7)
+    while len(dates) < days:
+        day += timedelta(days=1)
+        if day.weekday() >= 5:
+            continue
+        open_price = price
+        price = max(0.5, price * (1 + drift + rng.gauss(0, vol)))
+        dates.append(day.isoformat())
+        opens.append(round(open_price, 4))
+        closes.append(round(price, 4))
+        highs.append(round(max(open_price, price) * (1 + abs(rng.gauss(0, vol / 2))), 4))
+        lows.append(round(min(open_price, price) * (1 - abs(rng.gauss(0, vol / 2))), 4))
+        volumes.append(rng.randint(100_000, 50_000_000))
+
+    return {
+        "info": {
+            "longName": f"{symbol} Holdings",
+            "sector": rng.choice(sectors),
+            "industry": "Synthetic",
+            "marketCap": int(price * rng.randint(10_000_000, 5_000_000_000)),
+            "trailingPE": round(rng.uniform(5, 60), 2),
+            "dividendYield": round(rng.uniform(0, 0.04), 4),
+            "fiftyTwoWeekHigh": max(highs[-252:]),
+            "fiftyTwoWeekLow": min(lows[-252:]),
+        },
+        "history": {
+            "dates": dates,
+            "open": opens,
+            "high": highs,
+            "low": lows,
+            "close": closes,
+            "volume": volumes,
+        },
+    }
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self.opened_at is None:
+                return "closed"
+            if time.monotonic() - self.opened_at >= self.reset_timeout:
+                return "half-open"
+            return "open"
+
+    def allow(self) -> bool:
+        return self.state != "open"
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.failures >= self.failure_threshold or self.opened_at is not None:
+                self.opened_at = time.monotonic()
+
+
+class ChainedProvider:
+    # Tries each provider in order, skipping those whose breaker is open.
+    # Exceptions count against the breaker; an empty answer only moves on
+    # to the next provider, since an unknown symbol is not an outage.
+    name = "chain"
+
+    def __init__(self, providers: List[MarketDataProvider], failure_threshold: int = 5,
+                 reset_timeout: float = 30.0):
+        if not providers:
+            raise ValueError("ChainedProvider needs at least one provider")
+        self.providers = providers
+        self.breakers = {
+            p.name: CircuitBreaker(failure_threshold, reset_timeout) for p in providers
+        }
+
+    def _call(self, method: str, *args):
+        last_error = None
+        answered = False
+        result = None
+        for provider in self.providers:
+            breaker = self.breakers[provider.name]
+            if not breaker.allow():
+                continue
+            try:
+                result = getattr(provider, method)(*args)
+            except Exception as e:
+                breaker.record_failure()
+                last_error = e
+                continue
+            breaker.record_success()
+            answered = True
+            if result:
+                return result
+
+        if not answered and last_error is not None:
+            raise MarketDataError(f"All market data providers failed for {method}") from last_error
+        return result
+
+    def get_quote(self, symbol: str) -> Optional[StockPrice]:
+        return self._call("get_quote", symbol)
+
+    def get_quotes(self, symbols: List[str]) -> Dict[str, StockPrice]:
+        wanted = {s.upper() for s in symbols}
+        quotes: Dict[str, StockPrice] = {}
+        for provider in self.providers:
+            missing = sorted(wanted - quotes.keys())
+            if not missing:
+                break
+            breaker = self.breakers[provider.name]
+            if not breaker.allow():
+                continue
+            try:
+                quotes.update(provider.get_quotes(missing))
+            except Exception as e:
+                breaker.record_failure()
+                print(f"Market data provider {provider.name} failed bulk quotes: {e}")
+                continue
+            breaker.record_success()
+        return quotes
+
+    def get_history(self, symbol: str, period: str = "1mo") -> Dict:
+        return self._call("get_history", symbol, period) or {}
+
+    def get_info(self, symbol: str) -> Dict:
+        return self._call("get_info", symbol) or {}
+
+
+def build_provider(spec: str) -> MarketDataProvider:
+    # spec is a provider name or a comma separated fallback chain,
+    # e.g. "yfinance", "fixture" or "yfinance,fixture".
+    names = [n.strip().lower() for n in spec.split(",") if n.strip()]
+    providers = []
+    for name in names:
+        if name == "yfinance":
+            providers.append(YFinanceProvider())
+        elif name == "fixture":
+            providers.append(FixtureProvider(
+                fixture_dir=os.getenv("MARKET_DATA_FIXTURE_DIR"),
+                synthesize=os.getenv("MARKET_DATA_FIXTURE_SYNTHESIZE", "0") == "1"
+            ))
+        else:
+            raise ValueError(f"Unknown market data provider: {name}")
+
+    if len(providers) == 1:
+        return providers[0]
+    return ChainedProvider(
+        providers,
+        failure_threshold=int(os.getenv("MARKET_DATA_BREAKER_THRESHOLD", 5)),
+        reset_timeout=float(os.getenv("MARKET_DATA_BREAKER_RESET_SECONDS", 30))
+    )
+
+
+_provider: Optional[MarketDataProvider] = None
+_provider_lock = threading.Lock()
+
+
+def get_provider() -> MarketDataProvider:
+    global _provider
+    if _provider is None:
+        with _provider_lock:
+            if _provider is None:
+                _provider = build_provider(os.getenv("MARKET_DATA_PROVIDER", "yfinance"))
+    return _provider
+
+
+def set_provider(provider: Optional[MarketDataProvider]):
+    global _provider
+    with _provider_lock:
+        _provider = provider
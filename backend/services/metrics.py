@@ -0,0 +1,220 @@
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional, Sequence, Tuple
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 250)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Tuple, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = tuple(labels.get(n, "") for n in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        key = tuple(labels.get(n, "") for n in self.labelnames)
+        with self._lock:
+            return self._values.get(key, 0.0)
+
+    def collect(self):
+        with self._lock:
+            return dict(self._values)
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        for key, value in sorted(self.collect().items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return "\n".join(lines)
+
+
+class Histogram:
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(labels.get(n, "") for n in self.labelnames)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                # per-bucket counts (last slot is +Inf), then sum and count
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            snapshot = {k: ([*v[0]], v[1], v[2]) for k, v in self._series.items()}
+        for key, (counts, total, count) in sorted(snapshot.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {count}")
+        return "\n".join(lines)
+
+
+REQUEST_LATENCY = Histogram(
+    "wealthmate_http_request_duration_seconds", "HTTP request latency by route",
+    ("method", "route", "status")
+)
+REQUEST_DB_QUERIES = Histogram(
+    "wealthmate_http_request_db_queries", "Database queries issued per HTTP request",
+    ("method", "route"), buckets=COUNT_BUCKETS
+)
+REQUEST_DB_SECONDS = Histogram(
+    "wealthmate_http_request_db_seconds", "Database time spent per HTTP request",
+    ("method", "route")
+)
+DB_QUERY_LATENCY = Histogram(
+    "wealthmate_db_query_duration_seconds", "Latency of individual database statements",
+    ("statement",)
+)
+UPSTREAM_LATENCY = Histogram(
+    "wealthmate_upstream_request_duration_seconds", "Latency of calls to external services",
+    ("upstream", "operation")
+)
+UPSTREAM_ERRORS = Counter(
+    "wealthmate_upstream_errors_total", "Failed calls to external services",
+    ("upstream", "operation")
+)
+CACHE_REQUESTS = Counter(
+    "wealthmate_cache_requests_total", "Cache lookups by result",
+    ("cache", "result")
+)
+
+REGISTRY = [
+    REQUEST_LATENCY, REQUEST_DB_QUERIES, REQUEST_DB_SECONDS, DB_QUERY_LATENCY,
+    UPSTREAM_LATENCY, UPSTREAM_ERRORS, CACHE_REQUESTS,
+]
+
+
+class RequestStats:
+    __slots__ = ("db_queries", "db_seconds", "threads")
+
+    def __init__(self):
+        self.db_queries = 0
+        self.db_seconds = 0.0
+        self.threads = {threading.get_ident()}
+
+
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def start_request() -> RequestStats:
+    stats = RequestStats()
+    _request_stats.set(stats)
+    return stats
+
+
+def current_request() -> Optional[RequestStats]:
+    return _request_stats.get()
+
+
+def observe_request(method: str, route: str, status: int, seconds: float, stats: RequestStats):
+    REQUEST_LATENCY.observe(seconds, method=method, route=route, status=str(status))
+    REQUEST_DB_QUERIES.observe(stats.db_queries, method=method, route=route)
+    REQUEST_DB_SECONDS.observe(stats.db_seconds, method=method, route=route)
+
+
+def install_db_hooks(engine):
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["query_started"].pop()
+        elapsed = time.perf_counter() - started
+        DB_QUERY_LATENCY.observe(elapsed, statement=statement.lstrip().split(" ", 1)[0].upper())
+
+        stats = _request_stats.get()
+        if stats is not None:
+            stats.db_queries += 1
+            stats.db_seconds += elapsed
+            stats.threads.add(threading.get_ident())
+
+    @event.listens_for(engine, "handle_error")
+    def _handle_error(exception_context):
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_started"):
+            conn.info["query_started"].pop()
+
+
+@contextmanager
+def track_upstream(upstream: str, operation: str):
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.threads.add(threading.get_ident())
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        UPSTREAM_ERRORS.inc(upstream=upstream, operation=operation)
+        raise
+    finally:
+        UPSTREAM_LATENCY.observe(time.perf_counter() - started, upstream=upstream, operation=operation)
+
+
+def record_cache(cache: str, hit: bool):
+    CACHE_REQUESTS.inc(cache=cache, result="hit" if hit else "miss")
+
+
+def _render_cache_ratios() -> str:
+    totals: Dict[str, list] = {}
+    for (cache, result), value in CACHE_REQUESTS.collect().items():
+        entry = totals.setdefault(cache, [0.0, 0.0])
+        entry[0 if result == "hit" else 1] += value
+
+    lines = ["# HELP wealthmate_cache_hit_ratio Share of cache lookups served from cache",
+             "# TYPE wealthmate_cache_hit_ratio gauge"]
+    for cache, (hits, misses) in sorted(totals.items()):
+        ratio = hits / (hits + misses) if hits + misses else 0.0
+        lines.append(f'wealthmate_cache_hit_ratio{{cache="{cache}"}} {_format_value(round(ratio, 6))}')
+    return "\n".join(lines)
+
+
+def render_metrics() -> str:
+    return "\n".join([m.render() for m in REGISTRY] + [_render_cache_ratios()]) + "\n"
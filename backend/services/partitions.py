@@ -0,0 +1,319 @@
+import argparse
+import gzip
+import json
+import os
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+from sqlalchemy import func, select, text
+from sqlalchemy.engine import Engine
+from backend.database import Base, ensure_indexes, get_engine
+# Registers every table on Base.metadata, also when run as a CLI
+import backend.models  # noqa: F401
+from backend.services.periodic import PeriodicTask
+
+# Append-only tables, partitioned by month on Postgres. Other databases
+# (SQLite in tests and local runs) keep plain tables and get the same
+# retention behaviour through range deletes.
+PARTITIONED_TABLES = {
+    "chat_history": {
+        "key": "created_at",
+        "retention_env": "CHAT_HISTORY_RETENTION_MONTHS",
+        "ddl": """
+            CREATE TABLE IF NOT EXISTS chat_history (
+                id SERIAL NOT NULL,
+                user_id INTEGER NOT NULL REFERENCES users (id),
+                message TEXT NOT NULL,
+                response TEXT NOT NULL,
+                created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT (now() AT TIME ZONE 'utc'),
+                PRIMARY KEY (id, created_at)
+            ) PARTITION BY RANGE (created_at)
+        """,
+    },
+    "budgets": {
+        "key": "date",
+        "retention_env": "BUDGET_RETENTION_MONTHS",
+        "ddl": """
+            CREATE TABLE IF NOT EXISTS budgets (
+                id SERIAL NOT NULL,
+                user_id INTEGER NOT NULL REFERENCES users (id),
+                category VARCHAR NOT NULL,
+                amount FLOAT NOT NULL,
+                type VARCHAR NOT NULL,
+                date TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT (now() AT TIME ZONE 'utc'),
+                PRIMARY KEY (id, date)
+            ) PARTITION BY RANGE (date)
+        """,
+    },
+}
+MONTHS_AHEAD = int(os.getenv("PARTITION_MONTHS_AHEAD", 3))
+ARCHIVE_DIR = os.getenv("ARCHIVE_DIR", "archive")
+# How often the API re-runs ensure_partitions; 0 leaves it to the CLI
+MAINTENANCE_SECONDS = float(os.getenv("PARTITION_MAINTENANCE_SECONDS", 24 * 3600))
+
+def month_start(value) -> date:
+    return date(value.year, value.month, 1)
+
+def add_months(value: date, months: int) -> date:
+    index = value.year * 12 + value.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+def month_range(start: date, end: date) -> Iterator[date]:
+    # month starts from start's month up to and including end's month
+    current = month_start(start)
+    while current <= end:
+        yield current
+        current = add_months(current, 1)
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_p{month.year}{month.month:02d}"
+
+def is_partitioned(engine: Engine) -> bool:
+    return engine.dialect.name == "postgresql"
+
+def create_schema(engine: Optional[Engine] = None, partitions_from: Optional[datetime] = None):
+    # create_all() would build plain tables, so the partitioned parents are
+    # created first and create_all() then skips them.
+    engine = engine or get_engine()
+    if is_partitioned(engine):
+        plain = [t for t in Base.metadata.sorted_tables if t.name not in PARTITIONED_TABLES]
+        Base.metadata.create_all(bind=engine, tables=plain)
+        with engine.begin() as conn:
+            for spec in PARTITIONED_TABLES.values():
+                conn.execute(text(spec["ddl"]))
+    Base.metadata.create_all(bind=engine)
+    ensure_indexes()
+    ensure_partitions(engine, partitions_from)
+
+def ensure_partitions(engine: Optional[Engine] = None, start: Optional[datetime] = None,
+                      months_ahead: int = MONTHS_AHEAD) -> List[str]:
+    # Monthly partitions from `start` (default: this month) through
+    # `months_ahead`, plus a default partition for backdated rows.
+    engine = engine or get_engine()
+    if not is_partitioned(engine):
+        return []
+
+    today = datetime.utcnow().date()
+    created = []
+    for table in PARTITIONED_TABLES:
+        with engine.begin() as conn:
+            conn.execute(text(f"CREATE TABLE IF NOT EXISTS {table}_default PARTITION OF {table} DEFAULT"))
+        for month in month_range(start or today, add_months(month_start(today), months_ahead)):
+            name = partition_name(table, month)
+            try:
+                with engine.begin() as conn:
+                    if _create_partition(conn, table, month):
+                        created.append(name)
+            except Exception as e:
+                print(f"Could not create partition {name}: {e}")
+    return created
+
+def _create_partition(conn, table: str, month: date) -> bool:
+    # Postgres refuses a partition whose range already has rows in the
+    # default partition, so those rows are moved out and back in around the
+    # CREATE, all in the caller's transaction. Writes to the default
+    # partition wait on the lock meanwhile; other months are unaffected.
+    name = partition_name(table, month)
+    exists = text("SELECT to_regclass(:name) IS NOT NULL")
+    if conn.execute(exists, {"name": name}).scalar():
+        return False
+    conn.execute(text(f"LOCK TABLE {table}_default IN SHARE ROW EXCLUSIVE MODE"))
+    if conn.execute(exists, {"name": name}).scalar():
+        return False
+
+    key = PARTITIONED_TABLES[table]["key"]
+    bounds = {"start": month, "end": add_months(month, 1)}
+    moved = conn.execute(text(
+        f"SELECT EXISTS (SELECT 1 FROM {table}_default WHERE {key} >= :start AND {key} < :end)"
+    ), bounds).scalar()
+    if moved:
+        conn.execute(text(f"CREATE TEMP TABLE {name}_moving (LIKE {table}) ON COMMIT DROP"))
+        conn.execute(text(
+            f"WITH moved AS (DELETE FROM {table}_default WHERE {key} >= :start AND {key} < :end RETURNING *) "
+            f"INSERT INTO {name}_moving SELECT * FROM moved"
+        ), bounds)
+    conn.execute(text(
+        f"CREATE TABLE {name} PARTITION OF {table} "
+        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+    ))
+    if moved:
+        conn.execute(text(f"INSERT INTO {table} SELECT * FROM {name}_moving"))
+    return True
+
+def _existing_partitions(conn, table: str) -> set:
+    rows = conn.execute(text(
+        "SELECT child.relname FROM pg_inherits "
+        "JOIN pg_class parent ON pg_inherits.inhparent = parent.oid "
+        "JOIN pg_class child ON pg_inherits.inhrelid = child.oid "
+        "WHERE parent.relname = :table"
+    ), {"table": table})
+    return {row[0] for row in rows}
+
+def _detached_partitions(conn, table: str) -> set:
+    # Month tables left standalone by an archive run that stopped after
+    # DETACH; the next run exports and drops them.
+    rows = conn.execute(text(
+        "SELECT relname FROM pg_class WHERE relkind = 'r' AND NOT relispartition AND relname ~ :pattern"
+    ), {"pattern": f"^{table}_p[0-9]{{6}}$"})
+    return {row[0] for row in rows}
+
+def _json_value(value):
+    return value.isoformat() if isinstance(value, (date, datetime)) else value
+
+def _archive_file(archive_dir: Path, table_name: str, month: date) -> Path:
+    # <archive_dir>/<table>/<YYYY-MM>.jsonl.gz. Each run appends a new gzip
+    # member, which readers see as one stream.
+    path = archive_dir / table_name / f"{month:%Y-%m}.jsonl.gz"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return path
+
+def _write_rows(path: Path, rows: Iterable) -> int:
+    count = 0
+    with gzip.open(path, "at", encoding="utf-8") as out:
+        for row in rows:
+            out.write(json.dumps({k: _json_value(v) for k, v in row._mapping.items()}) + "\n")
+            count += 1
+    return count
+
+def export_partition(engine: Engine, table_name: str, name: str, month: date, archive_dir: Path) -> int:
+    # Streams a detached month table, which nothing writes to any more.
+    key = PARTITIONED_TABLES[table_name]["key"]
+    with engine.connect().execution_options(stream_results=True, yield_per=2000) as conn:
+        rows = conn.execute(text(f"SELECT * FROM {name} ORDER BY {key}"))
+        return _write_rows(_archive_file(archive_dir, table_name, month), rows)
+
+def _delete_month(conn, table_name: str, month: date, archive_dir: Optional[Path]) -> int:
+    # Rows in the default partition or a plain table. DELETE ... RETURNING
+    # hands back exactly the rows removed, so the archive matches what was
+    # deleted even while new rows arrive; a failed export rolls it back.
+    table = Base.metadata.tables[table_name]
+    key = table.c[PARTITIONED_TABLES[table_name]["key"]]
+    statement = table.delete().where(key >= month, key < add_months(month, 1))
+    if archive_dir is None:
+        return conn.execute(statement).rowcount
+    rows = conn.execute(statement.returning(*table.c)).all()
+    return _write_rows(_archive_file(archive_dir, table_name, month), rows) if rows else 0
+
+def archive_expired(engine: Optional[Engine] = None, retention: Optional[Dict[str, int]] = None,
+                    archive_dir: Optional[str] = None, archive: bool = True,
+                    today: Optional[date] = None) -> Dict[str, int]:
+    # Removes whole months older than each table's retention, exporting them
+    # first. Postgres partitions are detached before the export, so nothing
+    # can be written to them afterwards, then dropped: no DELETE, vacuum or
+    # index churn touches the live months.
+    engine = engine or get_engine()
+    archive_path = Path(archive_dir or ARCHIVE_DIR)
+    today = today or datetime.utcnow().date()
+    removed = {}
+
+    for table_name, spec in PARTITIONED_TABLES.items():
+        months = (retention or {}).get(table_name, int(os.getenv(spec["retention_env"], 0)))
+        if months <= 0:
+            continue
+        table = Base.metadata.tables[table_name]
+        key = table.c[spec["key"]]
+        cutoff = add_months(month_start(today), -months)
+
+        with engine.connect() as conn:
+            oldest = conn.execute(select(func.min(key)).where(key < cutoff)).scalar()
+            partitions = _existing_partitions(conn, table_name) if is_partitioned(engine) else set()
+            detached = _detached_partitions(conn, table_name) if is_partitioned(engine) else set()
+
+        expired = set(month_range(oldest, add_months(cutoff, -1))) if oldest is not None else set()
+        for name in detached:
+            month = datetime.strptime(name[len(table_name) + 2:], "%Y%m").date()
+            if month < cutoff:
+                expired.add(month)
+        if not expired:
+            continue
+
+        removed[table_name] = 0
+        for month in sorted(expired):
+            name = partition_name(table_name, month)
+            if name in partitions:
+                with engine.begin() as conn:
+                    conn.execute(text(f"ALTER TABLE {table_name} DETACH PARTITION {name}"))
+                detached.add(name)
+            if name in detached:
+                if archive:
+                    export_partition(engine, table_name, name, month, archive_path)
+                with engine.begin() as conn:
+                    removed[table_name] += conn.execute(text(f"SELECT count(*) FROM {name}")).scalar()
+                    conn.execute(text(f"DROP TABLE {name}"))
+            # rows in the default partition, or a plain table
+            with engine.begin() as conn:
+                removed[table_name] += _delete_month(conn, table_name, month, archive_path if archive else None)
+    return removed
+
+_maintainer: Optional[PeriodicTask] = None
+
+def start_partition_maintenance(engine: Optional[Engine] = None):
+    # Re-runs ensure_partitions once per interval so upcoming months exist
+    # before rows arrive for them; startup already ran it, so the first
+    # round waits.
+    global _maintainer
+    if MAINTENANCE_SECONDS > 0 and _maintainer is None and is_partitioned(engine or get_engine()):
+        _maintainer = PeriodicTask("partition_maintenance", ensure_partitions, MAINTENANCE_SECONDS, run_first=False)
+        _maintainer.start()
+
+def stop_partition_maintenance():
+    global _maintainer
+    if _maintainer is not None:
+        _maintainer.stop()
+        _maintainer = None
+
+def migrate_to_partitioned(engine: Optional[Engine] = None):
+    # One-off conversion of existing plain Postgres tables. Runs in a single
+    # transaction: rename, create the partitioned parent, copy, drop the old.
+    engine = engine or get_engine()
+    if not is_partitioned(engine):
+        print("Partitioning is only used on Postgres; nothing to migrate")
+        return
+
+    for table_name, spec in PARTITIONED_TABLES.items():
+        key = spec["key"]
+        with engine.begin() as conn:
+            kind = conn.execute(text("SELECT relkind FROM pg_class WHERE relname = :t"), {"t": table_name}).scalar()
+            if kind != "r":
+                continue
+            legacy = f"{table_name}_legacy"
+            conn.execute(text(f"ALTER TABLE {table_name} RENAME TO {legacy}"))
+            # constraint and index names are schema-wide; free them for the new parent
+            conn.execute(text(f"ALTER TABLE {legacy} RENAME CONSTRAINT {table_name}_pkey TO {legacy}_pkey"))
+            for index in Base.metadata.tables[table_name].indexes:
+                conn.execute(text(f"ALTER INDEX IF EXISTS {index.name} RENAME TO {index.name}_legacy"))
+            conn.execute(text(spec["ddl"]))
+            oldest = conn.execute(text(f"SELECT min({key}) FROM {legacy}")).scalar()
+        ensure_partitions(engine, oldest)
+        with engine.begin() as conn:
+            columns = ", ".join(c.name for c in Base.metadata.tables[table_name].columns)
+            conn.execute(text(f"INSERT INTO {table_name} ({columns}) SELECT {columns} FROM {legacy}"))
+            conn.execute(text(
+                f"SELECT setval(pg_get_serial_sequence('{table_name}', 'id'), "
+                f"COALESCE((SELECT MAX(id) FROM {table_name}), 1))"
+            ))
+            conn.execute(text(f"DROP TABLE {legacy}"))
+        print(f"Migrated {table_name} to monthly partitions")
+    ensure_indexes()
+
+def main():
+    parser = argparse.ArgumentParser(description="Maintain monthly partitions and archive expired data")
+    parser.add_argument("command", choices=["ensure", "archive", "migrate"])
+    parser.add_argument("--months-ahead", type=int, default=MONTHS_AHEAD)
+    parser.add_argument("--archive-dir", default=ARCHIVE_DIR)
+    parser.add_argument("--no-export", action="store_true", help="drop expired months without archiving them")
+    args = parser.parse_args()
+
+    if args.command == "ensure":
+        created = ensure_partitions(months_ahead=args.months_ahead)
+        print(f"Partitions created: {', '.join(created) or 'none (already present, or not Postgres)'}")
+    elif args.command == "archive":
+        ensure_partitions(months_ahead=args.months_ahead)
+        removed = archive_expired(archive_dir=args.archive_dir, archive=not args.no_export)
+        for table, count in removed.items():
+            print(f"Archived {count} rows from {table}")
+    else:
+        migrate_to_partitioned()
+
+if __name__ == "__main__":
+    main()
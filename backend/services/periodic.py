@@ -0,0 +1,44 @@
+import threading
+import time
+from typing import Callable, Optional
+from backend.services.cache import get_cache
+
+class PeriodicTask:
+    # Runs `task` on a daemon thread once per interval, in rounds aligned to
+    # multiples of the interval. With several API workers the shared cache
+    # counter lets only one of them do each round.
+    def __init__(self, name: str, task: Callable[[], None], interval: float, run_first: bool = True):
+        self.name = name
+        self.task = task
+        self.interval = interval
+        # False when startup already did the work, so the first round waits
+        self.run_first = run_first
+        self._locks = get_cache(name)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name=self.name.replace("_", "-"), daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def run_round(self) -> bool:
+        # True when this process did the round
+        round_id = int(time.time() // self.interval)
+        try:
+            if self._locks.incr(f"round:{round_id}", ttl=self.interval) == 1:
+                self.task()
+                return True
+        except Exception as e:
+            print(f"Error running {self.name}: {e}")
+        return False
+
+    def _run(self):
+        if self.run_first:
+            self.run_round()
+        while not self._stop.wait(self.interval - time.time() % self.interval):
+            self.run_round()
@@ -1,19 +1,21 @@
 from typing import List, Dict
 from sqlalchemy.orm import Session
 from backend.models.portfolio import Portfolio, Stock, Transaction
-from backend.services.stock_service import get_stock_price
+from backend.services.stock_service import get_stock_price, get_stock_prices
 from backend.schemas.ai import PortfolioAnalysis
 
-def calculate_portfolio_performance(portfolio: Portfolio, db: Session) -> PortfolioAnalysis:
+def calculate_portfolio_performance(portfolio: Portfolio, db: Session, stocks: List[Stock] = None) -> PortfolioAnalysis:
     try:
-        stocks = db.query(Stock).filter(Stock.portfolio_id == portfolio.id).all()
+        if stocks is None:
+            stocks = db.query(Stock).filter(Stock.portfolio_id == portfolio.id).all()
         
         total_value = 0
         total_cost = 0
         recommendations = []
+        quotes = get_stock_prices([stock.symbol for stock in stocks])
         
         for stock in stocks:
-            current_price_data = get_stock_price(stock.symbol)
+            current_price_data = quotes.get(stock.symbol.upper())
             if current_price_data:
                 current_value = stock.shares * current_price_data.current_price
                 purchase_value = stock.shares * stock.purchase_price
@@ -0,0 +1,78 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from backend.models.market import PriceBar
+from backend.services.cache import get_cache
+from backend.services.market_data import PERIOD_BARS, get_provider
+
+HISTORY_PERIOD = os.getenv("PRICE_HISTORY_PERIOD", "2y")
+SYNC_CONCURRENCY = int(os.getenv("PRICE_SYNC_CONCURRENCY", 8))
+# A symbol is asked upstream for new bars at most once per interval
+sync_markers = get_cache("price_history_synced", ttl=float(os.getenv("PRICE_SYNC_INTERVAL_SECONDS", 6 * 3600)))
+
+def latest_bar_dates(db: Session, symbols: Iterable[str]) -> Dict[str, date]:
+    rows = (
+        db.query(PriceBar.symbol, func.max(PriceBar.date))
+        .filter(PriceBar.symbol.in_(list(symbols)))
+        .group_by(PriceBar.symbol)
+        .all()
+    )
+    return {symbol: latest for symbol, latest in rows}
+
+def period_covering(days: int) -> str:
+    # Smallest provider period that spans a gap of `days` calendar days
+    for period in ("5d", "1mo", "3mo", "6mo", "1y", "2y"):
+        if PERIOD_BARS[period] * 7 / 5 >= days + 3:
+            return period
+    return HISTORY_PERIOD
+
+def _fetch(symbol: str, period: str) -> Dict:
+    try:
+        return get_provider().get_history(symbol, period)
+    except Exception as e:
+        print(f"Error fetching price history for {symbol}: {e}")
+        return {}
+
+def sync_price_history(db: Session, symbols: List[str], today: Optional[date] = None) -> Dict[str, date]:
+    # Appends bars newer than what is stored and returns the latest stored
+    # date per symbol. Only the gap since the last stored bar is requested.
+    symbols = sorted({s.upper() for s in symbols})
+    today = today or datetime.utcnow().date()
+    latest = latest_bar_dates(db, symbols)
+
+    synced = sync_markers.get_many(symbols)
+    stale = [s for s in symbols if s not in synced and latest.get(s) != today]
+    if not stale:
+        return latest
+
+    periods = {
+        s: period_covering((today - latest[s]).days) if s in latest else HISTORY_PERIOD
+        for s in stale
+    }
+    with ThreadPoolExecutor(max_workers=min(SYNC_CONCURRENCY, len(stale))) as pool:
+        histories = dict(zip(stale, pool.map(lambda s: _fetch(s, periods[s]), stale)))
+
+    rows = []
+    for symbol, history in histories.items():
+        volumes = history.get("volumes") or [None] * len(history.get("dates", []))
+        for day, close, volume in zip(history.get("dates", []), history.get("prices", []), volumes):
+            day = date.fromisoformat(day[:10])
+            if close is None or close != close or (symbol in latest and day <= latest[symbol]):
+                continue
+            rows.append({"symbol": symbol, "date": day, "close": float(close), "volume": volume})
+
+    if rows:
+        try:
+            db.bulk_insert_mappings(PriceBar, rows)
+            db.commit()
+        except IntegrityError:
+            # another request stored the same bars first
+            db.rollback()
+        latest = latest_bar_dates(db, symbols)
+
+    sync_markers.set_many({s: True for s in stale if histories.get(s)})
+    return latest
@@ -0,0 +1,97 @@
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter, deque
+from pathlib import Path
+from typing import Iterable, Optional
+
+# Opt-in sampling profiler. When PROFILE_SLOW_REQUEST_MS is set, a daemon
+# thread samples every Python thread's stack every PROFILE_INTERVAL_MS into
+# a bounded ring buffer. Requests slower than the threshold dump the samples
+# taken on their threads during their lifetime as collapsed stacks
+# (one "frame;frame;frame count" line per stack), which flamegraph.pl,
+# speedscope and inferno read directly.
+
+
+class SamplingProfiler:
+    def __init__(self, interval: float = 0.005, max_samples: int = 200_000):
+        self.interval = interval
+        self._samples = deque(maxlen=max_samples)
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+            self._thread = None
+
+    def _run(self):
+        own_ident = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            now = time.perf_counter()
+            for ident, frame in sys._current_frames().items():
+                if ident == own_ident:
+                    continue
+                self._samples.append((now, ident, _collapse(frame)))
+
+    def collapsed(self, started: float, finished: float, threads: Iterable[int]) -> Counter:
+        threads = set(threads)
+        stacks = Counter()
+        for ts, ident, stack in list(self._samples):
+            if started <= ts <= finished and ident in threads:
+                stacks[stack] += 1
+        return stacks
+
+
+def _collapse(frame) -> str:
+    frames = []
+    while frame is not None:
+        code = frame.f_code
+        frames.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return ";".join(reversed(frames))
+
+
+_profiler: Optional[SamplingProfiler] = None
+_threshold: Optional[float] = None
+_output_dir = Path(os.getenv("PROFILE_DIR", "profiles"))
+
+
+def init_profiler() -> Optional[SamplingProfiler]:
+    global _profiler, _threshold
+    threshold_ms = os.getenv("PROFILE_SLOW_REQUEST_MS")
+    if not threshold_ms or _profiler is not None:
+        return _profiler
+
+    _threshold = float(threshold_ms) / 1000
+    _profiler = SamplingProfiler(interval=float(os.getenv("PROFILE_INTERVAL_MS", 5)) / 1000)
+    _profiler.start()
+    return _profiler
+
+
+def maybe_dump_slow_request(method: str, path: str, started: float, finished: float,
+                            threads: Iterable[int]) -> Optional[Path]:
+    if _profiler is None or finished - started < _threshold:
+        return None
+
+    stacks = _profiler.collapsed(started, finished, threads)
+    if not stacks:
+        return None
+
+    _output_dir.mkdir(parents=True, exist_ok=True)
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", path).strip("_") or "root"
+    duration_ms = int((finished - started) * 1000)
+    out = _output_dir / f"{time.strftime('%Y%m%dT%H%M%S')}-{method}-{slug}-{duration_ms}ms.folded"
+    with open(out, "w") as f:
+        for stack, count in stacks.most_common():
+            f.write(f"{stack} {count}\n")
+    return out
@@ -0,0 +1,117 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from backend.schemas.ai import InvestmentRecommendation
+from backend.services.cache import get_cache
+from backend.services.periodic import PeriodicTask
+from backend.services.stock_service import get_stock_prices
+
+RISK_PROFILES = ("conservative", "moderate", "aggressive")
+# (label, upper bound, description used in the prompt)
+BUDGET_BUCKETS = (
+    ("under_1k", 1_000, "under $1,000"),
+    ("1k_10k", 10_000, "$1,000 to $10,000"),
+    ("10k_50k", 50_000, "$10,000 to $50,000"),
+    ("50k_250k", 250_000, "$50,000 to $250,000"),
+    ("over_250k", None, "over $250,000"),
+)
+# 0 disables the background refresh; buckets are then filled on first request
+REFRESH_SECONDS = float(os.getenv("RECOMMENDATION_REFRESH_SECONDS", 6 * 3600))
+REFRESH_CONCURRENCY = int(os.getenv("RECOMMENDATION_REFRESH_CONCURRENCY", 3))
+# A cold bucket whose generation failed is not retried for this long
+FAILURE_RETRY_SECONDS = float(os.getenv("RECOMMENDATION_FAILURE_RETRY_SECONDS", 60))
+
+# Entries outlive one refresh interval so a failed refresh keeps serving
+# the previous set instead of falling back to a live LLM call.
+recommendation_cache = get_cache("recommendations", ttl=max(REFRESH_SECONDS, 3600) * 3)
+_failed_buckets = get_cache("recommendation_failures", ttl=FAILURE_RETRY_SECONDS)
+_bucket_locks: Dict[Tuple[str, str], threading.Lock] = {}
+_bucket_locks_guard = threading.Lock()
+
+def normalize_risk_profile(risk_profile: str) -> str:
+    profile = (risk_profile or "").strip().lower()
+    return profile if profile in RISK_PROFILES else "moderate"
+
+def budget_bucket(budget: float) -> Tuple[str, str]:
+    for label, upper, description in BUDGET_BUCKETS:
+        if upper is None or budget <= upper:
+            return label, description
+    return BUDGET_BUCKETS[-1][0], BUDGET_BUCKETS[-1][2]
+
+def _bucket_lock(key: Tuple[str, str]) -> threading.Lock:
+    with _bucket_locks_guard:
+        return _bucket_locks.setdefault(key, threading.Lock())
+
+def refresh_bucket(risk_profile: str, label: str, description: str) -> Optional[Dict]:
+    from backend.services.ai_service import get_investment_recommendations
+
+    recommendations = get_investment_recommendations(risk_profile, description)
+    if not recommendations:
+        return None
+    entry = {
+        "generated_at": datetime.utcnow(),
+        "recommendations": [r.model_dump(exclude={"current_price", "change_percent"}) for r in recommendations],
+    }
+    recommendation_cache.set(f"{risk_profile}:{label}", entry)
+    return entry
+
+def refresh_all():
+    buckets = [(p, label, description) for p in RISK_PROFILES for label, _, description in BUDGET_BUCKETS]
+    with ThreadPoolExecutor(max_workers=REFRESH_CONCURRENCY) as pool:
+        results = list(pool.map(lambda b: refresh_bucket(*b), buckets))
+    failed = sum(1 for r in results if r is None)
+    if failed:
+        print(f"Recommendation refresh: {failed} of {len(buckets)} buckets kept their previous results")
+
+def _enrich(recommendations: List[Dict]) -> List[InvestmentRecommendation]:
+    quotes = get_stock_prices([r["symbol"] for r in recommendations])
+    enriched = []
+    for item in recommendations:
+        quote = quotes.get(item["symbol"])
+        if quote is None:
+            # the model named a ticker the market data provider does not know
+            continue
+        enriched.append(InvestmentRecommendation(
+            **item, current_price=quote.current_price, change_percent=quote.change_percent
+        ))
+    return enriched
+
+def get_recommendations(risk_profile: str, budget: float) -> Dict:
+    risk_profile = normalize_risk_profile(risk_profile)
+    label, description = budget_bucket(budget)
+    key = f"{risk_profile}:{label}"
+
+    entry = recommendation_cache.get(key)
+    if entry is None:
+        # Cold bucket: one request generates it while concurrent ones wait,
+        # and a failure is remembered so the LLM is not called on every request.
+        with _bucket_lock((risk_profile, label)):
+            entry = recommendation_cache.get(key)
+            if entry is None and not _failed_buckets.get(key):
+                entry = refresh_bucket(risk_profile, label, description)
+                if entry is None:
+                    _failed_buckets.set(key, True)
+
+    return {
+        "risk_profile": risk_profile,
+        "budget_bucket": label,
+        "generated_at": entry["generated_at"] if entry else None,
+        "recommendations": _enrich(entry["recommendations"]) if entry else [],
+    }
+
+_refresher: Optional[PeriodicTask] = None
+
+def start_recommendation_refresher():
+    # Regenerates every bucket once per interval, starting right away
+    global _refresher
+    if REFRESH_SECONDS > 0 and _refresher is None:
+        _refresher = PeriodicTask("recommendation_refresh", refresh_all, REFRESH_SECONDS)
+        _refresher.start()
+
+def stop_recommendation_refresher():
+    global _refresher
+    if _refresher is not None:
+        _refresher.stop()
+        _refresher = None
@@ -0,0 +1,239 @@
+import hashlib
+import os
+from datetime import date
+from typing import Dict, List, Optional
+from sqlalchemy.orm import Session
+from backend.models.market import PriceBar
+from backend.models.portfolio import Stock
+from backend.services.cache import get_cache
+from backend.services.price_history import sync_price_history
+from backend.services.stock_service import get_stock_info, get_stock_prices
+
+# Daily log returns kept per symbol set
+RISK_WINDOW = int(os.getenv("RISK_WINDOW_DAYS", 252))
+# Incremental updates accumulate rounding; rebuild from stored bars after this many
+REBUILD_AFTER_BARS = int(os.getenv("RISK_REBUILD_AFTER_BARS", 63))
+MC_SIMULATIONS = int(os.getenv("RISK_MC_SIMULATIONS", 10_000))
+CONFIDENCE_LEVELS = (0.95, 0.99)
+
+model_cache = get_cache("risk_models", ttl=float(os.getenv("RISK_MODEL_CACHE_TTL_SECONDS", 7 * 24 * 3600)))
+
+# Shocks are simple returns applied by sector; "*" hits every holding.
+STRESS_SCENARIOS = {
+    "tech_selloff": ("Technology sector falls 20%", {"Technology": -0.20, "Communication Services": -0.10}),
+    "market_crash": ("Broad market falls 30%", {"*": -0.30}),
+    "financial_crisis": ("Financials fall 35%", {"Financial Services": -0.35}),
+    "energy_shock": ("Energy falls 25%", {"Energy": -0.25}),
+    "consumer_slowdown": ("Consumer cyclicals fall 15%", {"Consumer Cyclical": -0.15}),
+}
+
+def model_key(symbols: List[str]) -> str:
+    return hashlib.sha1(",".join(symbols).encode()).hexdigest()
+
+def _aligned_closes(db: Session, symbols: List[str], after: Optional[date] = None):
+    # Closing prices on the dates every symbol has a bar, oldest first
+    import numpy as np
+
+    query = db.query(PriceBar.symbol, PriceBar.date, PriceBar.close).filter(PriceBar.symbol.in_(symbols))
+    if after is not None:
+        query = query.filter(PriceBar.date > after)
+    rows = query.all()
+    if not rows:
+        return [], np.empty((0, len(symbols)))
+
+    column = {s: i for i, s in enumerate(symbols)}
+    dates = sorted({r.date for r in rows})
+    row = {d: i for i, d in enumerate(dates)}
+    closes = np.full((len(dates), len(symbols)), np.nan)
+    for r in rows:
+        closes[row[r.date], column[r.symbol]] = r.close
+    complete = ~np.isnan(closes).any(axis=1)
+    return [d for d, keep in zip(dates, complete) if keep], closes[complete]
+
+def _factor(mean, m2, count: int) -> Dict:
+    import numpy as np
+
+    covariance = m2 / max(count - 1, 1)
+    jitter = 1e-12
+    while True:
+        try:
+            cholesky = np.linalg.cholesky(covariance + jitter * np.eye(len(mean)))
+            break
+        except np.linalg.LinAlgError:
+            # fewer observations than holdings, or perfectly correlated ones
+            jitter *= 100
+    return {"covariance": covariance, "cholesky": cholesky}
+
+def build_model(db: Session, symbols: List[str]) -> Optional[Dict]:
+    import numpy as np
+
+    dates, closes = _aligned_closes(db, symbols)
+    if len(dates) < 3:
+        return None
+    returns = np.diff(np.log(closes), axis=0)[-RISK_WINDOW:]
+    mean = returns.mean(axis=0)
+    centered = returns - mean
+    m2 = centered.T @ centered
+    return {
+        "symbols": symbols,
+        "as_of": dates[-1],
+        "last_close": closes[-1],
+        "returns": returns,
+        "mean": mean,
+        "m2": m2,
+        "updates": 0,
+        **_factor(mean, m2, len(returns)),
+    }
+
+def update_model(db: Session, model: Dict) -> Dict:
+    # Welford add/remove per new bar keeps the rolling window's mean and
+    # co-moment matrix current without re-reading the whole history; the
+    # Cholesky factor is then refreshed from the updated covariance.
+    import numpy as np
+
+    dates, closes = _aligned_closes(db, model["symbols"], after=model["as_of"])
+    if not dates:
+        return model
+    if model["updates"] + len(dates) > REBUILD_AFTER_BARS:
+        return build_model(db, model["symbols"]) or model
+
+    new_returns = np.diff(np.log(np.vstack([model["last_close"], closes])), axis=0)
+    returns = model["returns"]
+    mean = model["mean"].copy()
+    m2 = model["m2"].copy()
+    count = len(returns)
+    for r in new_returns:
+        count += 1
+        delta = r - mean
+        mean += delta / count
+        m2 += np.outer(delta, r - mean)
+    returns = np.vstack([returns, new_returns])
+    for r in returns[:max(len(returns) - RISK_WINDOW, 0)]:
+        count -= 1
+        delta = r - mean
+        mean -= delta / count
+        m2 -= np.outer(delta, r - mean)
+    returns = returns[-RISK_WINDOW:]
+
+    return {
+        "symbols": model["symbols"],
+        "as_of": dates[-1],
+        "last_close": closes[-1],
+        "returns": returns,
+        "mean": mean,
+        "m2": m2,
+        "updates": model["updates"] + len(dates),
+        **_factor(mean, m2, count),
+    }
+
+def get_risk_model(db: Session, symbols: List[str]) -> Optional[Dict]:
+    symbols = sorted({s.upper() for s in symbols})
+    latest = sync_price_history(db, symbols)
+    if len(latest) < len(symbols):
+        symbols = [s for s in symbols if s in latest]
+    if not symbols:
+        return None
+
+    key = model_key(symbols)
+    model = model_cache.get(key)
+    if model is None:
+        model = build_model(db, symbols)
+    elif min(latest.values()) > model["as_of"]:
+        model = update_model(db, model)
+    else:
+        return model
+    if model is not None:
+        model_cache.set(key, model)
+    return model
+
+def _loss_stats(pnl, confidence: float) -> Dict:
+    import numpy as np
+
+    losses = -pnl
+    var = float(np.quantile(losses, confidence))
+    tail = losses[losses >= var]
+    pct = int(round(confidence * 100))
+    return {f"var_{pct}": round(max(var, 0.0), 2), f"cvar_{pct}": round(max(float(tail.mean()), 0.0), 2)}
+
+def value_at_risk(model: Dict, values, horizon_days: int = 1) -> Dict:
+    import numpy as np
+
+    # Historical: revalue today's holdings under each observed day, scaled
+    # by sqrt(horizon). Monte Carlo: correlated normal log returns via L z.
+    historical_pnl = np.expm1(model["returns"]) @ values * np.sqrt(horizon_days)
+    rng = np.random.default_rng(0)
+    shocks = rng.standard_normal((MC_SIMULATIONS, len(values))) @ model["cholesky"].T
+    simulated = model["mean"] * horizon_days + shocks * np.sqrt(horizon_days)
+    mc_pnl = np.expm1(simulated) @ values
+
+    historical, monte_carlo = {}, {}
+    for confidence in CONFIDENCE_LEVELS:
+        historical.update(_loss_stats(historical_pnl, confidence))
+        monte_carlo.update(_loss_stats(mc_pnl, confidence))
+    return {
+        "horizon_days": horizon_days,
+        "observations": len(model["returns"]),
+        "as_of": model["as_of"].isoformat(),
+        "historical": historical,
+        "monte_carlo": monte_carlo,
+        "daily_volatility": round(float(np.sqrt(values @ model["covariance"] @ values) / values.sum()), 6),
+    }
+
+def stress_test(model: Dict, values, sectors: List[str]) -> List[Dict]:
+    # Holdings in the shocked sectors take the shock directly; the rest move
+    # by their conditional expectation given those shocks under the cached
+    # covariance, so correlated names are hit too.
+    import numpy as np
+
+    covariance = model["covariance"]
+    total = float(values.sum())
+    results = []
+    for name, (description, shocks) in STRESS_SCENARIOS.items():
+        direct = np.array([shocks.get(sector, shocks.get("*", np.nan)) for sector in sectors], dtype=float)
+        hit = ~np.isnan(direct)
+        if not hit.any():
+            continue
+        log_shock = np.log1p(direct[hit])
+        moves = np.zeros(len(values))
+        moves[hit] = log_shock
+        rest = ~hit
+        if rest.any():
+            beta = np.linalg.lstsq(covariance[np.ix_(hit, hit)], log_shock, rcond=None)[0]
+            moves[rest] = covariance[np.ix_(rest, hit)] @ beta
+        direct_pnl = float(np.expm1(log_shock) @ values[hit])
+        total_pnl = float(np.expm1(moves) @ values)
+        results.append({
+            "scenario": name,
+            "description": description,
+            "direct_pnl": round(direct_pnl, 2),
+            "total_pnl": round(total_pnl, 2),
+            "pnl_percentage": round(total_pnl / total * 100, 2) if total else 0.0,
+        })
+    return results
+
+def assess_market_risk(db: Session, stocks: List[Stock], horizon_days: int = 1) -> Dict:
+    import numpy as np
+
+    try:
+        quotes = get_stock_prices([stock.symbol for stock in stocks])
+        holdings = {}
+        for stock in stocks:
+            quote = quotes.get(stock.symbol.upper())
+            if quote:
+                symbol = stock.symbol.upper()
+                holdings[symbol] = holdings.get(symbol, 0.0) + stock.shares * quote.current_price
+
+        model = get_risk_model(db, list(holdings))
+        if model is None:
+            return {"value_at_risk": None, "stress_tests": [], "excluded_symbols": sorted(holdings)}
+
+        values = np.array([holdings[s] for s in model["symbols"]])
+        sectors = [get_stock_info(s).get("sector", "Unknown") for s in model["symbols"]]
+        return {
+            "value_at_risk": value_at_risk(model, values, horizon_days),
+            "stress_tests": stress_test(model, values, sectors),
+            "excluded_symbols": sorted(set(holdings) - set(model["symbols"])),
+        }
+    except Exception as e:
+        print(f"Error computing market risk: {e}")
+        return {"value_at_risk": None, "stress_tests": [], "excluded_symbols": []}
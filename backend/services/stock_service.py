@@ -1,67 +1,58 @@
-import yfinance as yf
-from typing import Dict, Optional
+import os
+from typing import Dict, List, Optional
 from backend.schemas.portfolio import StockPrice
+from backend.services.cache import get_cache
+from backend.services.market_data import get_provider
+
+quote_cache = get_cache("quotes", ttl=float(os.getenv("QUOTE_CACHE_TTL_SECONDS", 60)))
+info_cache = get_cache("stock_info", ttl=float(os.getenv("STOCK_INFO_CACHE_TTL_SECONDS", 24 * 3600)))
 
 def get_stock_price(symbol: str) -> Optional[StockPrice]:
+    symbol = symbol.upper()
+    cached = quote_cache.get(symbol)
+    if cached is not None:
+        return cached
     try:
-        stock = yf.Ticker(symbol)
-        info = stock.info
-        hist = stock.history(period="1d")
-        
-        if hist.empty:
-            return None
-        
-        current_price = hist['Close'].iloc[-1]
-        day_high = hist['High'].iloc[-1]
-        day_low = hist['Low'].iloc[-1]
-        volume = int(hist['Volume'].iloc[-1])
-        
-        prev_close = info.get('previousClose', current_price)
-        change_percent = ((current_price - prev_close) / prev_close) * 100 if prev_close else 0
-        
-        return StockPrice(
-            symbol=symbol.upper(),
-            current_price=float(current_price),
-            change_percent=float(change_percent),
-            day_high=float(day_high),
-            day_low=float(day_low),
-            volume=volume
-        )
+        quote = get_provider().get_quote(symbol)
     except Exception as e:
         print(f"Error fetching stock price for {symbol}: {e}")
         return None
+    if quote:
+        quote_cache.set(symbol, quote)
+    return quote
+
+def get_stock_prices(symbols: List[str]) -> Dict[str, StockPrice]:
+    symbols = sorted({s.upper() for s in symbols})
+    quotes = quote_cache.get_many(symbols)
+    missing = [s for s in symbols if s not in quotes]
+    if not missing:
+        return quotes
+    try:
+        fetched = get_provider().get_quotes(missing)
+    except Exception as e:
+        print(f"Error fetching stock prices for {', '.join(missing)}: {e}")
+        return quotes
+    quote_cache.set_many(fetched)
+    quotes.update(fetched)
+    return quotes
 
 def get_stock_historical_data(symbol: str, period: str = "1mo") -> Dict:
     try:
-        stock = yf.Ticker(symbol)
-        hist = stock.history(period=period)
-        
-        return {
-            "symbol": symbol.upper(),
-            "dates": hist.index.strftime('%Y-%m-%d').tolist(),
-            "prices": hist['Close'].tolist(),
-            "volumes": hist['Volume'].tolist()
-        }
+        return get_provider().get_history(symbol, period)
     except Exception as e:
         print(f"Error fetching historical data for {symbol}: {e}")
         return {}
 
 def get_stock_info(symbol: str) -> Dict:
+    symbol = symbol.upper()
+    cached = info_cache.get(symbol)
+    if cached is not None:
+        return cached
     try:
-        stock = yf.Ticker(symbol)
-        info = stock.info
-        
-        return {
-            "symbol": symbol.upper(),
-            "name": info.get('longName', symbol),
-            "sector": info.get('sector', 'Unknown'),
-            "industry": info.get('industry', 'Unknown'),
-            "market_cap": info.get('marketCap', 0),
-            "pe_ratio": info.get('trailingPE', 0),
-            "dividend_yield": info.get('dividendYield', 0),
-            "52_week_high": info.get('fiftyTwoWeekHigh', 0),
-            "52_week_low": info.get('fiftyTwoWeekLow', 0)
-        }
+        info = get_provider().get_info(symbol)
     except Exception as e:
         print(f"Error fetching stock info for {symbol}: {e}")
         return {}
+    if info:
+        info_cache.set(symbol, info)
+    return info
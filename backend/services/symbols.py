@@ -0,0 +1,191 @@
+import argparse
+import bisect
+import csv
+import difflib
+import io
+import os
+import re
+import threading
+import time
+import urllib.request
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+DEFAULT_LISTING_PATH = Path(__file__).resolve().parent.parent / "fixtures" / "symbols.csv"
+LISTING_PATH = os.getenv("SYMBOL_LISTING_PATH", str(DEFAULT_LISTING_PATH))
+# How often the listing file's mtime is checked for a refreshed copy
+LISTING_CHECK_SECONDS = float(os.getenv("SYMBOL_LISTING_CHECK_SECONDS", 60))
+# Tickers missing from the listing are accepted if the quote provider knows
+# them, so a partial listing (like the bundled fixture) never rejects a real one
+UNKNOWN_SYMBOL_QUOTE_FALLBACK = os.getenv("SYMBOL_UNKNOWN_QUOTE_FALLBACK", "1") == "1"
+# Exchange directories used by `python -m backend.services.symbols refresh`
+NASDAQ_LISTED_URL = "https://www.nasdaqtrader.com/dynamic/SymDir/nasdaqlisted.txt"
+OTHER_LISTED_URL = "https://www.nasdaqtrader.com/dynamic/SymDir/otherlisted.txt"
+OTHER_EXCHANGES = {"A": "NYSE MKT", "N": "NYSE", "P": "NYSE ARCA", "Z": "BATS", "V": "IEXG"}
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+def normalize_symbol(symbol: str) -> str:
+    # Listings write share classes as BRK.B, the quote provider as BRK-B
+    return symbol.strip().upper().replace(".", "-")
+
+class SymbolIndex:
+    # Sorted parallel arrays: tickers for exact lookups and prefix ranges,
+    # plus (word, position) pairs over company names for word-prefix search.
+    def __init__(self, rows: List[Tuple[str, str, str]]):
+        rows = sorted({normalize_symbol(s): (normalize_symbol(s), n, e) for s, n, e in rows if s}.values())
+        self.symbols = [r[0] for r in rows]
+        self.names = [r[1] for r in rows]
+        self.exchanges = [r[2] for r in rows]
+        self.name_words = [tuple(set(_WORD.findall(name.lower()))) for name in self.names]
+        self.words = sorted((word, i) for i, words in enumerate(self.name_words) for word in words)
+        self._word_keys = [w for w, _ in self.words]
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def __contains__(self, symbol: str) -> bool:
+        symbol = normalize_symbol(symbol)
+        i = bisect.bisect_left(self.symbols, symbol)
+        return i < len(self.symbols) and self.symbols[i] == symbol
+
+    def _entry(self, i: int) -> Dict:
+        return {"symbol": self.symbols[i], "name": self.names[i], "exchange": self.exchanges[i]}
+
+    def _prefix_range(self, keys: List[str], prefix: str) -> range:
+        start = bisect.bisect_left(keys, prefix)
+        end = bisect.bisect_left(keys, prefix + "\uffff", lo=start)
+        return range(start, end)
+
+    def search(self, query: str, limit: int = 10) -> List[Dict]:
+        # Exact ticker, then ticker prefix (shortest first), then name word
+        # prefix, then close spellings of the ticker if nothing matched.
+        query = query.strip()
+        if not query or limit <= 0:
+            return []
+        ticker = normalize_symbol(query)
+        matches: List[int] = []
+        seen = set()
+
+        def add(indices):
+            for i in indices:
+                if i not in seen:
+                    seen.add(i)
+                    matches.append(i)
+
+        add(sorted(self._prefix_range(self.symbols, ticker), key=lambda i: (len(self.symbols[i]), self.symbols[i])))
+        terms = _WORD.findall(query.lower())
+        if terms and len(matches) < limit:
+            # every query word must prefix some word of the name; start from
+            # the rarest word's range and filter the rest against it
+            ranges = sorted(((self._prefix_range(self._word_keys, term), term) for term in terms),
+                            key=lambda r: len(r[0]))
+            candidates = {self.words[j][1] for j in ranges[0][0]}
+            for _, term in ranges[1:]:
+                candidates = {i for i in candidates if any(w.startswith(term) for w in self.name_words[i])}
+            add(sorted(candidates, key=lambda i: (len(self.names[i]), self.symbols[i])))
+        if not matches and len(ticker) >= 2:
+            # typo fallback, limited to tickers with the same first letter
+            same_letter = self._prefix_range(self.symbols, ticker[0])
+            close = difflib.get_close_matches(ticker, self.symbols[same_letter.start:same_letter.stop],
+                                              n=limit, cutoff=0.6)
+            add(bisect.bisect_left(self.symbols, s) for s in close)
+
+        return [self._entry(i) for i in matches[:limit]]
+
+def load_listing(path: str) -> SymbolIndex:
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = [(r["symbol"], r.get("name") or r["symbol"], r.get("exchange") or "") for r in csv.DictReader(f)]
+    return SymbolIndex(rows)
+
+_index: Optional[SymbolIndex] = None
+_index_mtime = 0.0
+_index_checked = 0.0
+_index_lock = threading.Lock()
+
+def get_symbol_index() -> SymbolIndex:
+    # Loaded on first use and reloaded when the listing file is replaced.
+    global _index, _index_mtime, _index_checked
+    now = time.monotonic()
+    if _index is not None and now - _index_checked < LISTING_CHECK_SECONDS:
+        return _index
+    with _index_lock:
+        if _index is not None and now - _index_checked < LISTING_CHECK_SECONDS:
+            return _index
+        _index_checked = now
+        try:
+            mtime = os.path.getmtime(LISTING_PATH)
+            if _index is None or mtime != _index_mtime:
+                _index = load_listing(LISTING_PATH)
+                _index_mtime = mtime
+        except Exception as e:
+            print(f"Error loading symbol listing {LISTING_PATH}: {e}")
+            if _index is None:
+                _index = SymbolIndex([])
+    return _index
+
+def is_known_symbol(symbol: str) -> bool:
+    return symbol in get_symbol_index()
+
+def validate_symbol(symbol: str) -> Optional[str]:
+    # Normalized ticker if it is listed, otherwise None
+    symbol = normalize_symbol(symbol)
+    if symbol and symbol in get_symbol_index():
+        return symbol
+    if symbol and UNKNOWN_SYMBOL_QUOTE_FALLBACK:
+        from backend.services.stock_service import get_stock_price
+
+        if get_stock_price(symbol):
+            return symbol
+    return None
+
+def search_symbols(query: str, limit: int = 10) -> List[Dict]:
+    return get_symbol_index().search(query, limit)
+
+def _download(url: str) -> List[Dict[str, str]]:
+    with urllib.request.urlopen(url, timeout=30) as response:
+        text = response.read().decode("utf-8")
+    # pipe-delimited, with a trailing "File Creation Time" line
+    lines = [line for line in text.splitlines() if not line.startswith("File Creation Time")]
+    return list(csv.DictReader(io.StringIO("\n".join(lines)), delimiter="|"))
+
+def fetch_listing() -> List[Tuple[str, str, str]]:
+    rows = []
+    for r in _download(NASDAQ_LISTED_URL):
+        if r.get("Test Issue") != "Y":
+            rows.append((r["Symbol"], r["Security Name"], "NASDAQ"))
+    for r in _download(OTHER_LISTED_URL):
+        if r.get("Test Issue") != "Y":
+            rows.append((r["ACT Symbol"], r["Security Name"], OTHER_EXCHANGES.get(r.get("Exchange"), r.get("Exchange", ""))))
+    return rows
+
+def write_listing(rows: List[Tuple[str, str, str]], path: str):
+    # Written next to the target and renamed, so readers never see a partial file
+    index = SymbolIndex(rows)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["symbol", "name", "exchange"])
+        writer.writerows(zip(index.symbols, index.names, index.exchanges))
+    os.replace(tmp, path)
+
+def main():
+    parser = argparse.ArgumentParser(description="Refresh or query the local symbol listing")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    refresh = subparsers.add_parser("refresh", help="download the current exchange listings")
+    refresh.add_argument("--output", default=LISTING_PATH)
+    search = subparsers.add_parser("search")
+    search.add_argument("query")
+    search.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+
+    if args.command == "refresh":
+        rows = fetch_listing()
+        write_listing(rows, args.output)
+        print(f"Wrote {len(rows)} symbols to {args.output}")
+    else:
+        for match in search_symbols(args.query, args.limit):
+            print(f"{match['symbol']:<8} {match['exchange']:<10} {match['name']}")
+
+if __name__ == "__main__":
+    main()
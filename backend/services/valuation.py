@@ -0,0 +1,227 @@
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+from sqlalchemy import and_, func, select
+from backend.database import get_engine, init_engine, wait_for_database
+from backend.models.market import PriceBar
+from backend.models.portfolio import Portfolio, PortfolioValuation, Stock
+from backend.services.stock_service import get_stock_prices
+
+# Portfolios per task; a task reads, values and upserts its range on its own
+CHUNK_PORTFOLIOS = int(os.getenv("VALUATION_CHUNK_PORTFOLIOS", 5000))
+WORKERS = int(os.getenv("VALUATION_WORKERS", os.cpu_count() or 1))
+QUOTE_BATCH = int(os.getenv("VALUATION_QUOTE_BATCH", 500))
+# A past date is valued from the last stored close at most this many days
+# before it (weekends, holidays); older bars leave the holding unpriced
+MAX_CLOSE_AGE_DAYS = int(os.getenv("VALUATION_MAX_CLOSE_AGE_DAYS", 7))
+
+# Price vector for value_range, set once per process by _load_prices
+_symbols: Dict[str, int] = {}
+_prices = None
+
+def distinct_symbols(engine) -> List[str]:
+    with engine.connect() as conn:
+        return sorted({s.upper() for s in conn.execute(select(Stock.symbol).distinct()).scalars()})
+
+def fetch_prices(symbols: List[str]) -> Dict[str, float]:
+    prices = {}
+    for i in range(0, len(symbols), QUOTE_BATCH):
+        quotes = get_stock_prices(symbols[i:i + QUOTE_BATCH])
+        prices.update({symbol: quote.current_price for symbol, quote in quotes.items()})
+    return prices
+
+def closes_as_of(engine, symbols: List[str], as_of: date) -> Dict[str, float]:
+    # Last stored daily close on or before as_of, from the price_bars history
+    prices = {}
+    with engine.connect() as conn:
+        for i in range(0, len(symbols), QUOTE_BATCH):
+            latest = (
+                select(PriceBar.symbol, func.max(PriceBar.date).label("date"))
+                .where(PriceBar.symbol.in_(symbols[i:i + QUOTE_BATCH]),
+                       PriceBar.date <= as_of, PriceBar.date >= as_of - timedelta(days=MAX_CLOSE_AGE_DAYS))
+                .group_by(PriceBar.symbol)
+                .subquery()
+            )
+            rows = conn.execute(
+                select(PriceBar.symbol, PriceBar.close)
+                .join(latest, and_(PriceBar.symbol == latest.c.symbol, PriceBar.date == latest.c.date))
+            )
+            prices.update({symbol: close for symbol, close in rows})
+    return prices
+
+def portfolio_ranges(engine, chunk: int = CHUNK_PORTFOLIOS) -> List[Tuple[int, int]]:
+    # (first id, last id) per chunk of portfolios, so each task is a range
+    # scan on stocks.portfolio_id
+    with engine.connect() as conn:
+        ids = conn.execute(select(Portfolio.id).order_by(Portfolio.id)).scalars().all()
+    return [(ids[i], ids[min(i + chunk, len(ids)) - 1]) for i in range(0, len(ids), chunk)]
+
+def _load_prices(symbols: List[str], prices: List[float]):
+    import numpy as np
+
+    global _symbols, _prices
+    _symbols = {s: i for i, s in enumerate(symbols)}
+    _prices = np.array(prices, dtype=np.float64)
+
+def _init_worker(symbols: List[str], prices: List[float], database_url: str):
+    # Runs in each worker process: the price vector is shipped once, and an
+    # engine inherited over fork is replaced with a fresh connection pool.
+    from backend import database
+
+    _load_prices(symbols, prices)
+    if database.engine is not None:
+        database.engine.dispose(close=False)
+        database.engine = None
+    init_engine(database_url)
+
+def _upsert(conn, rows: List[Dict]):
+    dialect = conn.dialect.name
+    table = PortfolioValuation.__table__
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        conn.execute(table.delete().where(
+            table.c.as_of == rows[0]["as_of"],
+            table.c.portfolio_id.in_([r["portfolio_id"] for r in rows])
+        ))
+        conn.execute(table.insert(), rows)
+        return
+    statement = insert(table)
+    updates = {c.name: statement.excluded[c.name] for c in table.columns if not c.primary_key}
+    conn.execute(statement.on_conflict_do_update(index_elements=["portfolio_id", "as_of"], set_=updates), rows)
+
+def value_range(first_id: int, last_id: int, as_of: date) -> Tuple[int, int]:
+    # Values every portfolio with id in [first_id, last_id] in one vectorized
+    # pass and upserts the results; returns (portfolios, holdings) processed.
+    import numpy as np
+
+    with get_engine().connect() as conn:
+        rows = conn.execute(
+            select(Stock.portfolio_id, Stock.symbol, Stock.shares, Stock.purchase_price)
+            .where(Stock.portfolio_id.between(first_id, last_id))
+        ).all()
+    if not rows:
+        return 0, 0
+
+    portfolio_ids, symbols, shares, purchase_prices = zip(*rows)
+    shares = np.array(shares, dtype=np.float64)
+    cost = shares * np.array(purchase_prices, dtype=np.float64)
+    index = np.fromiter((_symbols.get(s.upper(), -1) for s in symbols), dtype=np.int64, count=len(rows))
+    priced = index >= 0
+    # with no prices at all (no closes for a past date, quotes down) every
+    # holding is unpriced; the lookup below needs at least one entry
+    prices = _prices if _prices is not None and len(_prices) else np.full(1, np.nan)
+    value = np.where(priced, shares * prices[np.where(priced, index, 0)], 0.0)
+    priced &= ~np.isnan(value)
+    value = np.where(priced, value, 0.0)
+    # unpriced holdings are left out of both value and cost, as on demand
+    cost = np.where(priced, cost, 0.0)
+
+    ids, group = np.unique(np.array(portfolio_ids, dtype=np.int64), return_inverse=True)
+    total_value = np.bincount(group, weights=value, minlength=len(ids))
+    total_cost = np.bincount(group, weights=cost, minlength=len(ids))
+    holdings = np.bincount(group, minlength=len(ids))
+    unpriced = holdings - np.bincount(group, weights=priced, minlength=len(ids)).astype(np.int64)
+    profit_loss = total_value - total_cost
+    pct = np.divide(profit_loss * 100, total_cost, out=np.zeros_like(total_cost), where=total_cost > 0)
+
+    valued_at = datetime.utcnow()
+    results = [
+        {
+            "portfolio_id": int(pid), "as_of": as_of,
+            "total_value": round(float(v), 2), "total_cost": round(float(c), 2),
+            "profit_loss": round(float(pl), 2), "profit_loss_percentage": round(float(p), 2),
+            "holdings": int(h), "unpriced_holdings": int(u), "valued_at": valued_at,
+        }
+        for pid, v, c, pl, p, h, u in zip(ids, total_value, total_cost, profit_loss, pct, holdings, unpriced)
+    ]
+    with get_engine().begin() as conn:
+        _upsert(conn, results)
+    return len(results), len(rows)
+
+def _report(done: int, total: int, holdings: int, started: float):
+    elapsed = time.perf_counter() - started
+    rate = holdings / elapsed if elapsed else 0.0
+    print(f"Valued {done}/{total} portfolio chunks, {holdings} holdings "
+          f"({rate:,.0f} holdings/s, {elapsed:.1f}s elapsed)", flush=True)
+
+def run_valuation(as_of: Optional[date] = None, workers: int = WORKERS, chunk: int = CHUNK_PORTFOLIOS,
+                  progress: Optional[Callable[[int, int, int, float], None]] = _report) -> Dict:
+    # Live quotes are only right for today; a past date is valued from
+    # stored closes so a backfill never writes today's prices into history.
+    today = datetime.utcnow().date()
+    as_of = as_of or today
+    if as_of > today:
+        raise ValueError(f"Cannot value portfolios as of {as_of.isoformat()}, a future date")
+    started = time.perf_counter()
+    engine = get_engine()
+
+    symbols = distinct_symbols(engine)
+    if as_of == today:
+        prices = fetch_prices(symbols)
+        source = "live quotes"
+    else:
+        prices = closes_as_of(engine, symbols, as_of)
+        source = f"closes on or before {as_of.isoformat()}"
+    priced_symbols = sorted(prices)
+    price_vector = [prices[s] for s in priced_symbols]
+    fetched = time.perf_counter()
+    print(f"Fetched {len(prices)}/{len(symbols)} prices ({source}) in {fetched - started:.1f}s", flush=True)
+
+    ranges = portfolio_ranges(engine, chunk)
+    portfolios = holdings = done = 0
+    if workers <= 1 or len(ranges) <= 1:
+        _load_prices(priced_symbols, price_vector)
+        for first_id, last_id in ranges:
+            valued, rows = value_range(first_id, last_id, as_of)
+            portfolios, holdings, done = portfolios + valued, holdings + rows, done + 1
+            if progress:
+                progress(done, len(ranges), holdings, started)
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker,
+            initargs=(priced_symbols, price_vector, engine.url.render_as_string(hide_password=False))
+        ) as pool:
+            futures = [pool.submit(value_range, first_id, last_id, as_of) for first_id, last_id in ranges]
+            for future in as_completed(futures):
+                valued, rows = future.result()
+                portfolios, holdings, done = portfolios + valued, holdings + rows, done + 1
+                if progress:
+                    progress(done, len(ranges), holdings, started)
+
+    elapsed = time.perf_counter() - started
+    return {
+        "as_of": as_of.isoformat(),
+        "symbols": len(symbols),
+        "priced_symbols": len(prices),
+        "portfolios": portfolios,
+        "holdings": holdings,
+        "seconds": round(elapsed, 2),
+        "holdings_per_second": round(holdings / elapsed, 1) if elapsed else 0.0,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Value every portfolio and store the daily valuation")
+    parser.add_argument("--as-of", type=date.fromisoformat,
+                        help="valuation date (default: today, UTC); past dates use stored daily closes")
+    parser.add_argument("--workers", type=int, default=WORKERS)
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_PORTFOLIOS, help="portfolios per task")
+    args = parser.parse_args()
+
+    wait_for_database(float(os.getenv("DB_STARTUP_TIMEOUT_SECONDS", 30)))
+    from backend.services.partitions import create_schema
+    create_schema()
+    try:
+        summary = run_valuation(args.as_of, args.workers, args.chunk_size)
+    except ValueError as e:
+        parser.error(str(e))
+    print(f"Valued {summary['portfolios']} portfolios ({summary['holdings']} holdings) in "
+          f"{summary['seconds']}s, {summary['holdings_per_second']:,.0f} holdings/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+import argparse
+import os
+import signal
+import threading
+import time
+
+from backend.database import SessionLocal, wait_for_database
+from backend.services.jobs import claim_next_job, run_claimed_job
+from backend.services.partitions import create_schema
+
+stop_event = threading.Event()
+
+def work(poll_interval: float):
+    while not stop_event.is_set():
+        db = SessionLocal()
+        try:
+            job_id = claim_next_job(db)
+        except Exception as e:
+            print(f"Error claiming analysis job: {e}")
+            job_id = None
+        finally:
+            db.close()
+
+        if job_id is None:
+            stop_event.wait(poll_interval)
+            continue
+        started = time.perf_counter()
+        run_claimed_job(job_id)
+        print(f"Finished analysis job {job_id} in {time.perf_counter() - started:.2f}s")
+
+def main():
+    parser = argparse.ArgumentParser(description="Run WealthMate portfolio analysis jobs")
+    parser.add_argument("--concurrency", type=int, default=2)
+    parser.add_argument("--poll-interval", type=float, default=0.5)
+    args = parser.parse_args()
+
+    wait_for_database(float(os.getenv("DB_STARTUP_TIMEOUT_SECONDS", 30)))
+    create_schema()
+
+    def handle_signal(signum, frame):
+        print("Stopping after in-flight jobs finish...")
+        stop_event.set()
+
+    signal.signal(signal.SIGTERM, handle_signal)
+    signal.signal(signal.SIGINT, handle_signal)
+
+    threads = [
+        threading.Thread(target=work, args=(args.poll_interval,), name=f"analysis-worker-{i}")
+        for i in range(args.concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+import argparse
+import json
+import sys
+
+LATENCY_KEYS = ["p50_ms", "p95_ms", "p99_ms"]
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> list:
+    regressions = []
+    for scenario, base in baseline["results"].items():
+        cur = current["results"].get(scenario)
+        if cur is None:
+            continue
+        for key in LATENCY_KEYS:
+            if base[key] and cur[key] > base[key] * (1 + threshold):
+                regressions.append((scenario, key, base[key], cur[key]))
+        if base["throughput_rps"] and cur["throughput_rps"] < base["throughput_rps"] * (1 - threshold):
+            regressions.append((scenario, "throughput_rps", base["throughput_rps"], cur["throughput_rps"]))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two benchmark JSON reports")
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed relative slowdown")
+    args = parser.parse_args()
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+
+    regressions = compare(baseline, current, args.threshold)
+    for scenario, key, before, after in regressions:
+        print(f"REGRESSION {scenario} {key}: {before} -> {after}")
+    if not regressions:
+        print(f"No regressions beyond {args.threshold:.0%} "
+              f"({baseline['meta']['git_commit'][:10]} -> {current['meta']['git_commit'][:10]})")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
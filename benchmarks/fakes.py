@@ -0,0 +1,39 @@
+import json
+import time
+from types import SimpleNamespace
+
+from backend.services.market_data import FixtureProvider, set_provider
+
+
+class FakeCompletions:
+    def __init__(self, latency_ms: float = 0.0):
+        self.latency_ms = latency_ms
+        self.calls = 0
+
+    def create(self, model, messages, **kwargs):
+        self.calls += 1
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        prompt = messages[-1]["content"]
+        if kwargs.get("response_format", {}).get("type") == "json_object":
+            content = json.dumps({"recommendations": [
+                {"symbol": symbol, "action": "Buy", "reason": "Broad, low-cost exposure.",
+                 "confidence": 70, "risk_level": "Medium"}
+                for symbol in ("VTI", "SPY", "MSFT")
+            ]})
+        else:
+            content = f"[fake:{model}] Based on your question ({len(prompt)} chars), diversify and keep costs low."
+        message = SimpleNamespace(role="assistant", content=content)
+        return SimpleNamespace(choices=[SimpleNamespace(index=0, message=message, finish_reason="stop")])
+
+
+class FakeOpenAI:
+    def __init__(self, latency_ms: float = 0.0):
+        self.chat = SimpleNamespace(completions=FakeCompletions(latency_ms))
+
+
+def install_fakes(llm_latency_ms: float = 0.0, fixture_dir: str = None):
+    from backend.services import ai_service
+
+    set_provider(FixtureProvider(fixture_dir=fixture_dir, synthesize=True))
+    ai_service.client = FakeOpenAI(llm_latency_ms)
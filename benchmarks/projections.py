@@ -0,0 +1,76 @@
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime
+
+# Horizons (months) that must each fit the budget; the last is the longest
+# deadline a goal can have.
+HORIZONS = [60, 120, 360]
+
+
+def build_goals(n_goals: int, horizon: int, now: datetime):
+    from backend.models.budget import FinancialGoal
+
+    goals = []
+    for i in range(n_goals):
+        # deadlines spread up to the horizon, the last one exactly on it
+        months = max(horizon * (i + 1) // n_goals, 1)
+        year, month = divmod(now.month - 1 + months, 12)
+        goals.append(FinancialGoal(
+            id=i + 1, name=f"goal {i + 1}", target_amount=25_000.0 * (i + 1) * months / 12,
+            current_amount=5_000.0 * i, deadline=now.replace(year=now.year + year, month=month + 1)
+        ))
+    return goals
+
+
+def measure(n_goals: int, horizon: int, runs: int) -> dict:
+    import numpy as np
+    from backend.services.goal_projection import PROJECTION_PATHS, _simulate
+
+    now = datetime(2026, 1, 15)
+    goals = build_goals(n_goals, horizon, now)
+    savings = np.random.default_rng(1).normal(1_500, 600, 12)
+    _simulate(goals, savings, now, 1)
+
+    timings = []
+    for run in range(runs):
+        started = time.perf_counter()
+        _simulate(goals, savings, now, run)
+        timings.append((time.perf_counter() - started) * 1000)
+    return {"horizon_months": horizon, "goals": n_goals, "paths": PROJECTION_PATHS,
+            "best_ms": round(min(timings), 1), "runs_ms": [round(t, 1) for t in timings]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Guard the goal projection latency budget")
+    parser.add_argument("--budget-ms", type=float, default=float(os.getenv("PROJECTION_BUDGET_MS", 100)),
+                        help="fail if simulating all of a user's goals takes longer than this")
+    parser.add_argument("--goals", type=int, default=5, help="goals per user")
+    parser.add_argument("--horizons", type=int, nargs="+", default=HORIZONS, help="longest deadline, in months")
+    parser.add_argument("--runs", type=int, default=5, help="best of N runs is compared to the budget")
+    parser.add_argument("--output", help="write JSON results here instead of stdout")
+    args = parser.parse_args()
+
+    results = [measure(args.goals, horizon, args.runs) for horizon in args.horizons]
+    failures = [
+        f"{r['goals']} goals over {r['horizon_months']} months took {r['best_ms']}ms, budget is {args.budget_ms}ms"
+        for r in results if r["best_ms"] > args.budget_ms
+    ]
+
+    report = {"budget_ms": args.budget_ms, "results": results, "passed": not failures, "failures": failures}
+    payload = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(payload + "\n")
+    else:
+        print(payload)
+
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
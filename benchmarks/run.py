@@ -0,0 +1,164 @@
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+from benchmarks.seed import BENCH_PASSWORD, CHAT_PROMPTS, user_email, volumes
+
+SCENARIOS = ["login", "portfolio_analytics", "analytics_summary", "budget_list", "chat"]
+
+
+def percentile(sorted_values, pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[rank]
+
+
+def build_request(scenario: str, rng: random.Random, n_users: int, tokens: dict):
+    user_id = rng.randint(1, n_users)
+    if scenario == "login":
+        return "POST", "/api/login", {}, {"email": user_email(user_id), "password": BENCH_PASSWORD}
+
+    headers = {"Authorization": f"Bearer {tokens[user_id]}"}
+    if scenario == "portfolio_analytics":
+        return "GET", "/api/portfolio/analytics", headers, None
+    if scenario == "analytics_summary":
+        return "GET", "/api/analytics/summary", headers, None
+    if scenario == "budget_list":
+        return "GET", "/api/budget/list", headers, None
+    if scenario == "chat":
+        return "POST", "/api/chat", headers, {"message": rng.choice(CHAT_PROMPTS)}
+    raise ValueError(f"Unknown scenario: {scenario}")
+
+
+async def run_scenario(client, scenario: str, n_users: int, tokens: dict, concurrency: int,
+                       duration: float, warmup: int, seed_value: int) -> dict:
+    rng = random.Random(seed_value)
+
+    for _ in range(warmup):
+        method, path, headers, body = build_request(scenario, rng, n_users, tokens)
+        await client.request(method, path, headers=headers, json=body)
+
+    latencies = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+
+    async def worker():
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            method, path, headers, body = build_request(scenario, rng, n_users, tokens)
+            started = time.perf_counter()
+            response = await client.request(method, path, headers=headers, json=body)
+            latencies.append((time.perf_counter() - started) * 1000)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "duration_s": round(elapsed, 3),
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "mean_ms": round(sum(latencies) / len(latencies), 3) if latencies else 0.0,
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "max_ms": round(latencies[-1], 3) if latencies else 0.0,
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], stderr=subprocess.DEVNULL, text=True).strip()
+    except Exception:
+        return "unknown"
+
+
+async def run(args) -> dict:
+    import httpx
+    from benchmarks.fakes import install_fakes
+    from backend.main import app
+    from backend.services.auth import create_access_token
+
+    install_fakes(llm_latency_ms=args.llm_latency_ms)
+
+    n_users = volumes(args.scale)["users"]
+    tokens = {i: create_access_token({"email": user_email(i)}) for i in range(1, n_users + 1)}
+
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for scenario in args.scenarios:
+                results[scenario] = await run_scenario(
+                    client, scenario, n_users, tokens, args.concurrency, args.duration, args.warmup, args.seed
+                )
+                print(f"{scenario:<20} {results[scenario]['throughput_rps']:>9.1f} req/s  "
+                      f"p50 {results[scenario]['p50_ms']:.1f}ms  p95 {results[scenario]['p95_ms']:.1f}ms  "
+                      f"p99 {results[scenario]['p99_ms']:.1f}ms", file=sys.stderr)
+
+    return {
+        "meta": {
+            "git_commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "database": args.database_url.split("://")[0],
+            "scale": args.scale,
+            "concurrency": args.concurrency,
+            "duration_s": args.duration,
+            "llm_latency_ms": args.llm_latency_ms,
+        },
+        "results": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark WealthMate API hot paths in-process")
+    parser.add_argument("--database-url", default=os.getenv("BENCH_DATABASE_URL", "sqlite:///bench.db"))
+    parser.add_argument("--scale", type=float, default=1.0, help="must match the scale used to seed")
+    parser.add_argument("--seed-db", action="store_true", help="(re)seed the database before running")
+    parser.add_argument("--scenarios", nargs="+", default=SCENARIOS, choices=SCENARIOS)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per scenario")
+    parser.add_argument("--warmup", type=int, default=20, help="requests per scenario before measuring")
+    parser.add_argument("--llm-latency-ms", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="write JSON results here instead of stdout")
+    args = parser.parse_args()
+
+    os.environ["DATABASE_URL"] = args.database_url
+    os.environ.setdefault("MARKET_DATA_PROVIDER", "fixture")
+    os.environ.setdefault("MARKET_DATA_FIXTURE_SYNTHESIZE", "1")
+    os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+    # every simulated user shares one client address and a handful of tokens
+    os.environ.setdefault("RATE_LIMIT_ENABLED", "0")
+    # the app runs in this one process, like `server --workers 1`
+    os.environ.setdefault("USER_CACHE_LOCAL", "1")
+
+    if args.seed_db:
+        from benchmarks.seed import seed
+        seed(args.scale)
+
+    report = asyncio.run(run(args))
+    payload = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(payload + "\n")
+    else:
+        print(payload)
+
+
+if __name__ == "__main__":
+    main()
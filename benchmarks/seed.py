@@ -0,0 +1,148 @@
+import argparse
+import os
+import random
+import time
+from datetime import datetime, timedelta
+
+BASE_VOLUMES = {
+    "users": 10_000,
+    "budgets": 1_000_000,
+    "holdings": 100_000,
+    "chats": 500_000,
+}
+
+BENCH_PASSWORD = "benchmark-password"
+SYMBOL_COUNT = 500
+CHUNK_SIZE = 10_000
+
+EXPENSE_CATEGORIES = ["Rent", "Groceries", "Dining", "Transport", "Utilities",
+                      "Insurance", "Entertainment", "Healthcare", "Shopping", "Travel"]
+INCOME_CATEGORIES = ["Salary", "Freelance", "Dividends", "Interest"]
+CHAT_PROMPTS = [
+    "How much should I keep in an emergency fund?",
+    "Is it a good time to buy index funds?",
+    "How do I lower my monthly expenses?",
+    "Should I pay off debt or invest?",
+    "What is a reasonable savings rate for my income?",
+]
+
+
+def user_email(i: int) -> str:
+    return f"user{i}@bench.wealthmate.local"
+
+
+def bench_symbols() -> list:
+    symbols = []
+    for i in range(SYMBOL_COUNT):
+        name, n = "", i
+        for _ in range(3):
+            name = chr(ord("A") + n % 26) + name
+            n //= 26
+        symbols.append("B" + name)
+    return symbols
+
+
+def volumes(scale: float) -> dict:
+    return {k: max(1, int(v * scale)) for k, v in BASE_VOLUMES.items()}
+
+
+def _insert_chunks(conn, table, rows_iter, label: str):
+    from sqlalchemy import insert
+
+    started = time.perf_counter()
+    chunk, done = [], 0
+    for row in rows_iter:
+        chunk.append(row)
+        if len(chunk) >= CHUNK_SIZE:
+            conn.execute(insert(table), chunk)
+            done += len(chunk)
+            chunk = []
+    if chunk:
+        conn.execute(insert(table), chunk)
+        done += len(chunk)
+    elapsed = time.perf_counter() - started
+    print(f"seeded {done:>9,} {label:<9} in {elapsed:6.1f}s ({done / max(elapsed, 1e-9):,.0f} rows/s)")
+
+
+def seed(scale: float = 1.0, seed_value: int = 42, now: datetime = None):
+    from sqlalchemy import text
+    from backend.database import get_engine, Base
+    from backend.models import User, Portfolio, Stock, Budget, ChatHistory
+    from backend.services.auth import get_password_hash
+    from backend.services.partitions import create_schema
+
+    engine = get_engine()
+    counts = volumes(scale)
+    rng = random.Random(seed_value)
+    now = now or datetime(2025, 1, 31, 12, 0, 0)
+    symbols = bench_symbols()
+
+    Base.metadata.drop_all(bind=engine)
+    create_schema(engine, partitions_from=now - timedelta(days=730))
+
+    # Every user shares one hash; hashing 10k passwords would dominate seeding.
+    hashed_password = get_password_hash(BENCH_PASSWORD)
+    n_users = counts["users"]
+
+    with engine.begin() as conn:
+        _insert_chunks(conn, User.__table__, (
+            {"id": i, "email": user_email(i), "hashed_password": hashed_password,
+             "full_name": f"Bench User {i}", "created_at": now - timedelta(days=rng.randint(30, 900))}
+            for i in range(1, n_users + 1)
+        ), "users")
+
+        _insert_chunks(conn, Portfolio.__table__, (
+            {"id": i, "user_id": i, "name": "My Portfolio", "created_at": now - timedelta(days=30)}
+            for i in range(1, n_users + 1)
+        ), "portfolios")
+
+        _insert_chunks(conn, Stock.__table__, (
+            {"id": i, "portfolio_id": (i - 1) % n_users + 1, "symbol": rng.choice(symbols),
+             "shares": round(rng.uniform(1, 200), 2), "purchase_price": round(rng.uniform(10, 500), 2),
+             "purchase_date": now - timedelta(days=rng.randint(1, 720))}
+            for i in range(1, counts["holdings"] + 1)
+        ), "holdings")
+
+        def budget_rows():
+            for i in range(1, counts["budgets"] + 1):
+                is_income = rng.random() < 0.2
+                yield {
+                    "id": i,
+                    "user_id": rng.randint(1, n_users),
+                    "category": rng.choice(INCOME_CATEGORIES if is_income else EXPENSE_CATEGORIES),
+                    "amount": round(rng.uniform(1000, 6000) if is_income else rng.lognormvariate(3.5, 1.0), 2),
+                    "type": "income" if is_income else "expense",
+                    "date": now - timedelta(minutes=rng.randint(0, 730 * 24 * 60)),
+                }
+        _insert_chunks(conn, Budget.__table__, budget_rows(), "budgets")
+
+        _insert_chunks(conn, ChatHistory.__table__, (
+            {"id": i, "user_id": rng.randint(1, n_users), "message": rng.choice(CHAT_PROMPTS),
+             "response": "Keep three to six months of expenses in cash and invest the rest broadly. " * 4,
+             "created_at": now - timedelta(minutes=rng.randint(0, 365 * 24 * 60))}
+            for i in range(1, counts["chats"] + 1)
+        ), "chats")
+
+        if engine.dialect.name == "postgresql":
+            for table in ["users", "portfolios", "stocks", "budgets", "chat_history"]:
+                conn.execute(text(
+                    f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), (SELECT MAX(id) FROM {table}))"
+                ))
+
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Seed a WealthMate database with benchmark volumes")
+    parser.add_argument("--database-url", default=os.getenv("BENCH_DATABASE_URL", "sqlite:///bench.db"))
+    parser.add_argument("--scale", type=float, default=1.0,
+                        help="multiplier on 10k users / 1M budgets / 100k holdings / 500k chats")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    os.environ["DATABASE_URL"] = args.database_url
+    seed(args.scale, args.seed)
+
+
+if __name__ == "__main__":
+    main()
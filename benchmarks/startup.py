@@ -0,0 +1,88 @@
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+
+# Modules that must only load on first use, never at import of the app.
+DEFERRED_MODULES = ["yfinance", "pandas", "openai", "numpy", "psycopg2"]
+
+_IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+CHECK_SCRIPT = """
+import json, sys, time
+started = time.perf_counter()
+import backend.main
+elapsed = time.perf_counter() - started
+print(json.dumps({"import_s": elapsed, "loaded": sorted(m for m in %r if m in sys.modules)}))
+"""
+
+
+def measure(python: str, env: dict) -> dict:
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [python, "-X", "importtime", "-c", CHECK_SCRIPT % (DEFERRED_MODULES,)],
+        capture_output=True, text=True, env=env
+    )
+    wall = time.perf_counter() - started
+    if proc.returncode != 0:
+        raise RuntimeError(f"importing backend.main failed:\n{proc.stderr[-4000:]}")
+
+    top_level = {}
+    for line in proc.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match and len(match.group(3)) == 1:
+            top_level[match.group(4)] = int(match.group(2))
+
+    report = json.loads(proc.stdout.strip().splitlines()[-1])
+    return {
+        "wall_ms": round(wall * 1000, 1),
+        "import_ms": round(report["import_s"] * 1000, 1),
+        "backend_main_cumulative_ms": round(top_level.get("backend.main", 0) / 1000, 1),
+        "slowest_top_level": {
+            name: round(us / 1000, 1)
+            for name, us in sorted(top_level.items(), key=lambda kv: -kv[1])[:10]
+        },
+        "deferred_modules_loaded": report["loaded"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Guard the API cold-start import budget")
+    parser.add_argument("--budget-ms", type=float, default=float(os.getenv("STARTUP_BUDGET_MS", 1500)),
+                        help="fail if importing backend.main takes longer than this")
+    parser.add_argument("--runs", type=int, default=3, help="best of N runs is compared to the budget")
+    parser.add_argument("--output", help="write JSON results here instead of stdout")
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    # An unroutable database proves that importing the app never connects.
+    env["DATABASE_URL"] = "postgresql://startup-check@127.0.0.1:9/none"
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [os.getcwd(), env.get("PYTHONPATH")]))
+
+    runs = [measure(sys.executable, env) for _ in range(args.runs)]
+    best = min(runs, key=lambda r: r["import_ms"])
+    failures = []
+    if best["import_ms"] > args.budget_ms:
+        failures.append(f"import took {best['import_ms']}ms, budget is {args.budget_ms}ms")
+    if best["deferred_modules_loaded"]:
+        failures.append(f"heavy modules loaded at import: {', '.join(best['deferred_modules_loaded'])}")
+
+    report = {"budget_ms": args.budget_ms, "best": best, "runs": [r["import_ms"] for r in runs],
+              "passed": not failures, "failures": failures}
+    payload = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(payload + "\n")
+    else:
+        print(payload)
+
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ.setdefault("RECOMMENDATION_REFRESH_SECONDS", "0")
+os.environ.setdefault("RATE_LIMIT_ENABLED", "0")
+os.environ.setdefault("CHAT_WRITE_BEHIND", "0")
+
+from backend import database
+from backend.main import app
+from backend.services.market_data import set_provider
+from benchmarks.fakes import install_fakes
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    # A fresh SQLite database per test, with the schema the app creates
+    import backend.models  # noqa: F401
+    from backend.services.partitions import create_schema
+
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'test.db'}")
+    database.engine = None
+    engine = database.init_engine()
+    create_schema(engine)
+    yield engine
+    engine.dispose()
+    database.engine = None
+
+
+@pytest.fixture
+def client(engine):
+    # Fixture market data and a canned OpenAI client, as in the benchmarks
+    install_fakes()
+    with TestClient(app) as client:
+        yield client
+    set_provider(None)
+
+
+def login(client, email: str = "investor@example.com") -> dict:
+    credentials = {"email": email, "password": "correct-horse"}
+    client.post("/api/register", json=credentials)
+    token = client.post("/api/login", json=credentials).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
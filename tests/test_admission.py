@@ -0,0 +1,53 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from backend.services import admission as admission_module
+from backend.services import ai_service
+from backend.services.admission import admission
+from benchmarks.fakes import FakeOpenAI
+from tests.conftest import login
+
+
+def test_concurrent_chats_overlap(client, monkeypatch):
+    headers = login(client)
+    monkeypatch.setattr(ai_service, "client", FakeOpenAI(latency_ms=300))
+
+    def chat(i):
+        return client.post("/api/chat", json={"message": f"question {i}"}, headers=headers).status_code
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        statuses = list(pool.map(chat, range(6)))
+    elapsed = time.perf_counter() - started
+
+    assert statuses == [200] * 6
+    # one after another they would take 6 x 300 ms
+    assert elapsed < 0.9
+
+
+def test_rate_limited_response_keeps_cors_and_no_store(client, monkeypatch):
+    headers = login(client)
+    monkeypatch.setattr(admission_module, "RATE_LIMIT_ENABLED", True)
+    monkeypatch.setitem(admission.limits, "chat", (1.0, 0.001))
+    monkeypatch.setattr(admission, "_buckets", None)
+    origin = {"Origin": "http://localhost:3000"}
+
+    client.post("/api/chat", json={"message": "first"}, headers={**headers, **origin})
+    response = client.post("/api/chat", json={"message": "second"}, headers={**headers, **origin})
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"]
+    assert response.headers["access-control-allow-origin"] == origin["Origin"]
+    assert "no-store" in response.headers["cache-control"]
+
+
+def test_preflight_does_not_take_a_token(client, monkeypatch):
+    headers = login(client)
+    monkeypatch.setattr(admission_module, "RATE_LIMIT_ENABLED", True)
+    monkeypatch.setitem(admission.limits, "chat", (1.0, 0.001))
+    monkeypatch.setattr(admission, "_buckets", None)
+    preflight = {"Origin": "http://localhost:3000", "Access-Control-Request-Method": "POST"}
+
+    for _ in range(3):
+        assert client.options("/api/chat", headers=preflight).status_code == 200
+    assert client.post("/api/chat", json={"message": "hello"}, headers=headers).status_code == 200
@@ -0,0 +1,56 @@
+import asyncio
+import sys
+
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy import text
+
+from backend import server
+from backend.database import SessionLocal
+from backend.services import auth
+from tests.conftest import login
+
+
+def current_full_name(client, engine, headers) -> str:
+    # Another worker updates the profile directly, so this process never
+    # sees an invalidation.
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE users SET full_name = 'Before'"))
+    client.get("/api/portfolio/stocks", headers=headers)
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE users SET full_name = 'After'"))
+
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=headers["Authorization"][7:])
+    db = SessionLocal()
+    try:
+        return asyncio.run(auth.get_current_user(credentials, db)).full_name
+    finally:
+        db.close()
+
+
+def test_memory_cache_does_not_cache_users_across_workers(client, engine, monkeypatch):
+    monkeypatch.setattr(auth, "USER_CACHE_LOCAL", False)
+    headers = login(client)
+
+    assert not auth.user_cache.shared
+    assert current_full_name(client, engine, headers) == "After"
+
+
+def test_single_worker_caches_users_in_memory(client, engine, monkeypatch):
+    monkeypatch.setattr(auth, "USER_CACHE_LOCAL", True)
+    headers = login(client, "single@example.com")
+
+    assert current_full_name(client, engine, headers) == "Before"
+    auth.invalidate_cached_user("single@example.com")
+
+
+def test_server_enables_local_user_cache_for_one_worker(monkeypatch):
+    started = []
+    monkeypatch.setattr(server, "run_uvicorn", started.append)
+    monkeypatch.setattr(server, "run_gunicorn", started.append)
+
+    for workers, expected in (("4", None), ("1", "1")):
+        monkeypatch.delenv("USER_CACHE_LOCAL", raising=False)
+        monkeypatch.setattr(sys, "argv", ["server", "--workers", workers])
+        server.main()
+        assert server.os.environ.get("USER_CACHE_LOCAL") == expected
+    assert len(started) == 2
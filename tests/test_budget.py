@@ -0,0 +1,37 @@
+from datetime import datetime
+
+from tests.conftest import login
+
+
+def test_add_entry_with_timezone_aware_date(client):
+    headers = login(client)
+    cases = [
+        ("2024-04-01T00:00:00", datetime(2024, 4, 1)),
+        ("2024-05-01T00:00:00Z", datetime(2024, 5, 1)),
+        ("2024-05-01T02:00:00+02:00", datetime(2024, 5, 1)),
+    ]
+    for day, stored in cases:
+        response = client.post("/api/budget/add", json={"category": "rent", "amount": 1200.0, "type": "expense",
+                                                         "date": day}, headers=headers)
+        assert response.status_code == 200
+        assert datetime.fromisoformat(response.json()["date"]) == stored
+
+
+def test_spending_stats_follow_entries(client):
+    headers = login(client)
+    for day, amount in (("2024-01-05", 50.0), ("2024-01-12", 55.0), ("2024-01-19", 45.0)):
+        response = client.post("/api/budget/add", json={"category": "groceries", "amount": amount, "type": "expense",
+                                                         "date": f"{day}T12:00:00Z"}, headers=headers)
+        assert response.status_code == 200
+
+    from backend.database import SessionLocal
+    from backend.models.budget import SpendingStat
+
+    db = SessionLocal()
+    try:
+        stat = db.query(SpendingStat).filter_by(category="groceries").one()
+        assert stat.count == 3
+        assert abs(stat.mean - 50.0) < 1e-9
+        assert stat.last_date == datetime(2024, 1, 19, 12)
+    finally:
+        db.close()
@@ -0,0 +1,79 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import text
+
+from backend.database import SessionLocal
+from backend.models.chat import ChatHistory, ChatSummary
+from backend.services import ai_service
+from backend.services.chat_memory import (
+    CONTEXT_TURNS, SUMMARY_BATCH, UNSUMMARIZED_LIMIT, build_chat_context, fold_chat_summary
+)
+from benchmarks.fakes import FakeOpenAI
+from tests.conftest import login
+
+
+def seed_turns(engine, count: int):
+    start = datetime(2026, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO users (id, email, hashed_password) VALUES (1, 'a@example.com', 'x')"))
+        for i in range(count):
+            conn.execute(
+                text("INSERT INTO chat_history (user_id, message, response, created_at) VALUES (1, :m, :r, :at)"),
+                {"m": f"question {i}", "r": f"answer {i}", "at": start + timedelta(minutes=i)}
+            )
+
+
+def context_questions(history):
+    return [m["content"] for m in history if m["role"] == "user"]
+
+
+def test_turns_outside_the_window_stay_in_context_until_folded(engine, monkeypatch):
+    monkeypatch.setattr(ai_service, "client", FakeOpenAI())
+    count = CONTEXT_TURNS + SUMMARY_BATCH - 1
+    seed_turns(engine, count)
+
+    db = SessionLocal()
+    try:
+        fold_chat_summary(1, db)
+        summary, history = build_chat_context(db, 1)
+    finally:
+        db.close()
+
+    assert summary == ""
+    assert context_questions(history) == [f"question {i}" for i in range(count)]
+
+
+def test_fold_leaves_every_unsummarized_turn_in_context(engine, monkeypatch):
+    monkeypatch.setattr(ai_service, "client", FakeOpenAI())
+    count = 2 * UNSUMMARIZED_LIMIT
+    seed_turns(engine, count)
+
+    db = SessionLocal()
+    try:
+        fold_chat_summary(1, db)
+        summary, history = build_chat_context(db, 1)
+        folded = db.get(ChatSummary, 1).summarized_turns
+    finally:
+        db.close()
+
+    assert summary
+    assert count - folded < UNSUMMARIZED_LIMIT
+    assert context_questions(history) == [f"question {i}" for i in range(folded, count)]
+
+
+def test_failed_advice_is_not_recorded(client, monkeypatch):
+    headers = login(client)
+
+    def unavailable(*args, **kwargs):
+        raise RuntimeError("upstream down")
+
+    monkeypatch.setattr(ai_service.client.chat.completions, "create", unavailable)
+    response = client.post("/api/chat", json={"message": "Should I rebalance?"}, headers=headers)
+
+    assert response.status_code == 200
+    assert response.json()["response"] == ai_service.ADVICE_UNAVAILABLE
+    db = SessionLocal()
+    try:
+        assert db.query(ChatHistory).count() == 0
+    finally:
+        db.close()
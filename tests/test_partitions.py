@@ -0,0 +1,57 @@
+import gzip
+import json
+import os
+import subprocess
+import sys
+from datetime import date, datetime
+from pathlib import Path
+
+from sqlalchemy import text
+
+from backend.services.partitions import add_months, archive_expired, month_start
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def seed_chat(engine, *created):
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO users (id, email, hashed_password) VALUES (1, 'a@example.com', 'x')"))
+        for at in created:
+            conn.execute(text("INSERT INTO chat_history (user_id, message, response, created_at) "
+                              "VALUES (1, 'q', 'a', :at)"), {"at": at})
+
+
+def archived(path: Path) -> list:
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_archive_exports_exactly_the_deleted_months(engine, tmp_path):
+    seed_chat(engine, datetime(2026, 1, 5), datetime(2026, 1, 20), datetime(2026, 2, 5), datetime(2026, 6, 5))
+
+    removed = archive_expired(engine, retention={"chat_history": 6}, archive_dir=str(tmp_path),
+                              today=date(2026, 9, 10))
+
+    assert removed == {"chat_history": 3}
+    assert [r["created_at"] for r in archived(tmp_path / "chat_history" / "2026-01.jsonl.gz")] == [
+        "2026-01-05T00:00:00", "2026-01-20T00:00:00"]
+    assert len(archived(tmp_path / "chat_history" / "2026-02.jsonl.gz")) == 1
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT count(*) FROM chat_history")).scalar() == 1
+
+
+def test_archive_cli_loads_the_models(engine, tmp_path):
+    # Runs in a fresh interpreter, where nothing but the CLI module is imported
+    expired = add_months(month_start(datetime.utcnow()), -3)
+    seed_chat(engine, datetime(expired.year, expired.month, 2), datetime.utcnow())
+
+    env = dict(os.environ, DATABASE_URL=str(engine.url), CHAT_HISTORY_RETENTION_MONTHS="1",
+               BUDGET_RETENTION_MONTHS="1")
+    result = subprocess.run(
+        [sys.executable, "-m", "backend.services.partitions", "archive", "--archive-dir", str(tmp_path)],
+        cwd=ROOT, env=env, capture_output=True, text=True
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert "Archived 1 rows from chat_history" in result.stdout
+    assert len(archived(tmp_path / "chat_history" / f"{expired:%Y-%m}.jsonl.gz")) == 1
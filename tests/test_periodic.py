@@ -0,0 +1,32 @@
+import threading
+
+from backend.services.periodic import PeriodicTask
+
+
+def test_one_worker_runs_each_round():
+    calls = []
+    # Two API workers sharing the cache, each with its own task
+    workers = [PeriodicTask("test_round", lambda: calls.append(1), interval=3600) for _ in range(2)]
+
+    assert [worker.run_round() for worker in workers] == [True, False]
+    assert calls == [1]
+
+
+def test_failed_round_is_reported_not_raised():
+    def fail():
+        raise RuntimeError("upstream down")
+
+    assert PeriodicTask("test_failure", fail, interval=3600).run_round() is False
+
+
+def test_first_round_waits_unless_run_first():
+    ran = threading.Event()
+    task = PeriodicTask("test_waits", ran.set, interval=3600, run_first=False)
+    task.start()
+    assert not ran.wait(0.2)
+    task.stop()
+
+    task = PeriodicTask("test_runs_first", ran.set, interval=3600)
+    task.start()
+    assert ran.wait(2)
+    task.stop()
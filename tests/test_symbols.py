@@ -0,0 +1,44 @@
+import json
+from datetime import date
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.main import app
+from backend.services.market_data import FixtureProvider, set_provider, synthesize_fixture
+from backend.services.symbols import is_known_symbol, validate_symbol
+from tests.conftest import login
+
+
+@pytest.fixture
+def client(engine, tmp_path):
+    # Quotes exist for PLTR only; it is a listed ticker missing from the
+    # bundled symbols.csv
+    quotes = tmp_path / "quotes"
+    quotes.mkdir()
+    with open(quotes / "PLTR.json", "w") as f:
+        json.dump(synthesize_fixture("PLTR", date(2025, 1, 31), 30), f)
+    set_provider(FixtureProvider(fixture_dir=str(quotes)))
+    with TestClient(app) as client:
+        yield client
+    set_provider(None)
+
+
+def test_add_listed_ticker_missing_from_fixture(client):
+    assert not is_known_symbol("PLTR")
+    assert validate_symbol("pltr") == "PLTR"
+
+    headers = login(client)
+    response = client.post("/api/portfolio/add", json={"symbol": "pltr", "shares": 10, "purchase_price": 25.0},
+                           headers=headers)
+    assert response.status_code == 200
+
+    holdings = client.get("/api/portfolio/stocks", headers=headers).json()
+    assert [h["symbol"] for h in holdings] == ["PLTR"]
+
+
+def test_add_unknown_ticker_is_rejected(client):
+    headers = login(client)
+    response = client.post("/api/portfolio/add", json={"symbol": "QQZZX", "shares": 1, "purchase_price": 1.0},
+                           headers=headers)
+    assert response.status_code == 404
@@ -0,0 +1,49 @@
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import text
+
+from backend.services.valuation import run_valuation
+
+
+def seed_holdings(engine):
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO users (id, email, hashed_password) VALUES (1, 'a@example.com', 'x')"))
+        conn.execute(text("INSERT INTO portfolios (id, user_id) VALUES (1, 1)"))
+        conn.execute(text("INSERT INTO stocks (portfolio_id, symbol, shares, purchase_price) "
+                          "VALUES (1, 'AAPL', 2, 100), (1, 'msft', 1, 100), (1, 'XOM', 1, 50)"))
+
+
+def valuations(engine):
+    with engine.connect() as conn:
+        return conn.execute(text(
+            "SELECT total_value, total_cost, holdings, unpriced_holdings FROM portfolio_valuations"
+        )).all()
+
+
+def test_past_date_uses_stored_closes(engine):
+    seed_holdings(engine)
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO price_bars (symbol, date, close) VALUES "
+                          "('AAPL', '2026-09-01', 150), ('AAPL', '2026-09-04', 160), "
+                          "('MSFT', '2026-09-03', 300), ('XOM', '2026-08-01', 90)"))
+
+    summary = run_valuation(date(2026, 9, 5), workers=1, progress=None)
+
+    assert summary["priced_symbols"] == 2
+    # XOM's last close is older than VALUATION_MAX_CLOSE_AGE_DAYS
+    assert valuations(engine) == [(620.0, 300.0, 3, 1)]
+
+
+def test_past_date_without_closes_is_unpriced(engine):
+    seed_holdings(engine)
+
+    summary = run_valuation(date(2026, 9, 5), workers=1, progress=None)
+
+    assert summary["portfolios"] == 1
+    assert valuations(engine) == [(0.0, 0.0, 3, 3)]
+
+
+def test_future_date_is_rejected(engine):
+    with pytest.raises(ValueError):
+        run_valuation(date.today() + timedelta(days=2), workers=1, progress=None)